@@ -5,9 +5,24 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_API_KEY,
+    DATA_CONFIG,
+    DATA_KEYS,
+    DATA_LIVE,
+    DATA_TRACER,
+    DATA_UTTERANCES,
+    SIGNAL_OPTIONS_UPDATED,
+)
+from .history import history_store
+from .keys import ApiKeyPool
+from .live import LivePool
+from .tracing import Tracer
+from .utterances import LikelyUtterances
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,7 +43,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Gemini AI TTS/STT from a config entry."""
     try:
         hass.data.setdefault(DOMAIN, {})
-        hass.data[DOMAIN][entry.entry_id] = entry.data
+        keys = ApiKeyPool(hass, entry.data[CONF_API_KEY], entry.options)
+        keys.async_start()
+        hass.data[DOMAIN][entry.entry_id] = {
+            DATA_CONFIG: dict(entry.data),
+            DATA_KEYS: keys,
+            DATA_UTTERANCES: LikelyUtterances(),
+            DATA_TRACER: Tracer(hass, entry.options),
+            DATA_LIVE: LivePool(hass, keys, entry.options),
+        }
 
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
         
@@ -36,8 +59,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         from .services import async_setup_services
         await async_setup_services(hass)
         
-        # Reload entry when options are updated
-        entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+        # Apply option changes in place; only credential changes reload
+        entry.async_on_unload(entry.add_update_listener(async_update_entry))
         
         _LOGGER.info("Successfully set up Gemini AI TTS/STT integration")
         return True
@@ -51,7 +74,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     try:
         if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-            hass.data[DOMAIN].pop(entry.entry_id, None)
+            data = hass.data[DOMAIN].pop(entry.entry_id, None)
+            if data is not None:
+                await data[DATA_LIVE].async_close()
         
         _LOGGER.info("Successfully unloaded Gemini AI TTS/STT integration")
         return unload_ok
@@ -61,11 +86,29 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         return False
 
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry."""
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove stored data when a config entry is deleted."""
+    await history_store(hass, entry.entry_id).async_remove()
+
+
+async def async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Handle config entry updates."""
     try:
-        await async_unload_entry(hass, entry)
-        await async_setup_entry(hass, entry)
-        _LOGGER.info("Successfully reloaded Gemini AI TTS/STT integration")
+        if dict(entry.data) != hass.data[DOMAIN][entry.entry_id][DATA_CONFIG]:
+            # Credentials changed, so clients must be rebuilt from scratch
+            await hass.config_entries.async_reload(entry.entry_id)
+            _LOGGER.info("Successfully reloaded Gemini AI TTS/STT integration")
+            return
+            
+        hass.data[DOMAIN][entry.entry_id][DATA_KEYS].configure(entry.options)
+        hass.data[DOMAIN][entry.entry_id][DATA_KEYS].async_start()
+        hass.data[DOMAIN][entry.entry_id][DATA_TRACER].configure(entry.options)
+        hass.data[DOMAIN][entry.entry_id][DATA_LIVE].configure(entry.options)
+        
+        # Entities swap their settings in place and keep clients and caches
+        async_dispatcher_send(
+            hass, SIGNAL_OPTIONS_UPDATED.format(entry.entry_id), entry.options
+        )
+        _LOGGER.info("Applied updated Gemini AI TTS/STT options")
     except Exception as err:
-        _LOGGER.error("Error reloading Gemini AI TTS/STT integration: %s", err, exc_info=True)
+        _LOGGER.error("Error updating Gemini AI TTS/STT integration: %s", err, exc_info=True)
@@ -0,0 +1,145 @@
+"""Vectorized post-processing of 16-bit PCM audio produced by Gemini TTS."""
+from __future__ import annotations
+
+import numpy as np
+
+from .const import (
+    POSTPROCESS_LIMITER_CEILING,
+    POSTPROCESS_LIMITER_LOOKAHEAD,
+    POSTPROCESS_TRIM_PADDING,
+    POSTPROCESS_TRIM_THRESHOLD,
+)
+
+
+# K-weighting filter stages from ITU-R BS.1770 as (gain dB, Q, corner Hz)
+_K_SHELF = (3.99984385397, 0.7071752369554193, 1681.974450955533)
+_K_HIGHPASS = (0.5003270373253953, 38.13547087613982)
+
+
+def postprocess_pcm(pcm: bytes, sample_rate: int, target_lufs: float) -> bytes:
+    """Trim silence, normalize loudness and limit peaks of mono int16 PCM.
+
+    Runs entirely on NumPy arrays and is meant to be called in the executor.
+    """
+    samples = np.frombuffer(pcm[: len(pcm) // 2 * 2], dtype="<i2").astype(np.float32)
+    samples /= 32768.0
+    if not samples.size:
+        return pcm
+
+    samples = trim_silence(samples, sample_rate)
+    loudness = integrated_loudness(samples, sample_rate)
+    if np.isfinite(loudness):
+        samples *= np.float32(10 ** ((target_lufs - loudness) / 20))
+    samples = limit_peaks(samples, sample_rate)
+
+    return (np.clip(samples, -1.0, 32767 / 32768) * 32768).astype("<i2").tobytes()
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Cut leading and trailing audio quieter than the trim threshold."""
+    window = max(1, sample_rate // 100)
+    frames = samples[: samples.size // window * window].reshape(-1, window)
+    if not frames.size:
+        return samples
+
+    rms = np.sqrt(np.mean(frames**2, axis=1))
+    loud = np.flatnonzero(rms > 10 ** (POSTPROCESS_TRIM_THRESHOLD / 20))
+    if not loud.size:
+        return samples
+
+    padding = int(POSTPROCESS_TRIM_PADDING * sample_rate)
+    start = max(0, loud[0] * window - padding)
+    end = min(samples.size, (loud[-1] + 1) * window + padding)
+    return samples[start:end]
+
+
+def integrated_loudness(samples: np.ndarray, sample_rate: int) -> float:
+    """Return the gated integrated loudness in LUFS (ITU-R BS.1770).
+
+    K-weighting is applied in the frequency domain, which keeps the whole
+    measurement vectorized.
+    """
+    spectrum = np.fft.rfft(samples)
+    frequencies = np.fft.rfftfreq(samples.size, 1 / sample_rate)
+    weighted = np.fft.irfft(
+        spectrum * _k_weighting_response(frequencies, sample_rate), n=samples.size
+    )
+
+    # 400 ms blocks with 75 % overlap; short clips are one block
+    block = int(0.4 * sample_rate)
+    step = block // 4
+    if weighted.size < block:
+        powers = np.array([np.mean(weighted**2)])
+    else:
+        squared = np.concatenate(([0.0], np.cumsum(weighted**2)))
+        starts = np.arange(0, weighted.size - block + 1, step)
+        powers = (squared[starts + block] - squared[starts]) / block
+
+    with np.errstate(divide="ignore"):
+        block_loudness = -0.691 + 10 * np.log10(powers)
+    gated = powers[block_loudness > -70]
+    if not gated.size:
+        return float("-inf")
+    relative_gate = -0.691 + 10 * np.log10(np.mean(gated)) - 10
+    gated = powers[(block_loudness > -70) & (block_loudness > relative_gate)]
+    return float(-0.691 + 10 * np.log10(np.mean(gated)))
+
+
+def limit_peaks(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Apply a look-ahead peak limiter at the limiter ceiling."""
+    ceiling = 10 ** (POSTPROCESS_LIMITER_CEILING / 20)
+    peaks = np.abs(samples)
+    if peaks.max(initial=0.0) <= ceiling:
+        return samples
+
+    # Gain needed per sample, spread over the look-ahead window on both
+    # sides and smoothed so gain changes do not click
+    window = max(1, int(POSTPROCESS_LIMITER_LOOKAHEAD * sample_rate))
+    gain = np.minimum(1.0, ceiling / np.maximum(peaks, 1e-9))
+    padded = np.pad(gain, window, mode="edge")
+    gain = np.lib.stride_tricks.sliding_window_view(padded, 2 * window + 1).min(axis=1)
+    kernel = np.ones(window) / window
+    smoothed = np.convolve(np.pad(gain, window, mode="edge"), kernel, mode="same")
+    gain = np.minimum(gain, smoothed[window:-window])
+    return (samples * gain).astype(np.float32)
+
+
+def _k_weighting_response(frequencies: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Return the K-weighting magnitude response at the given frequencies.
+
+    Uses de Man's derivation of the BS.1770 filters from their analog
+    parameters, which reproduces the standard's 48 kHz coefficients and
+    keeps the curve at other sample rates.
+    """
+    z = np.exp(-1j * 2 * np.pi * frequencies / sample_rate)
+
+    gain_db, q, corner = _K_SHELF
+    k = np.tan(np.pi * corner / sample_rate)
+    high_gain = 10 ** (gain_db / 20)
+    band_gain = high_gain**0.4996667741545416
+    shelf = _biquad_response(
+        z,
+        (
+            high_gain + band_gain * k / q + k**2,
+            2 * (k**2 - high_gain),
+            high_gain - band_gain * k / q + k**2,
+        ),
+        (1 + k / q + k**2, 2 * (k**2 - 1), 1 - k / q + k**2),
+    )
+
+    q, corner = _K_HIGHPASS
+    k = np.tan(np.pi * corner / sample_rate)
+    # The numerator is not scaled with the denominator's leading term
+    a0 = 1 + k / q + k**2
+    highpass = _biquad_response(
+        z, (a0, -2 * a0, a0), (a0, 2 * (k**2 - 1), 1 - k / q + k**2)
+    )
+
+    return np.abs(shelf * highpass)
+
+
+def _biquad_response(
+    z: np.ndarray, b: tuple[float, float, float], a: tuple[float, float, float]
+) -> np.ndarray:
+    """Evaluate a biquad transfer function at z^-1 values."""
+    return (b[0] + b[1] * z + b[2] * z**2) / (a[0] + a[1] * z + a[2] * z**2)
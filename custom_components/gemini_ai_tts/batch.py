@@ -0,0 +1,141 @@
+"""Gemini Batch API jobs for bulk requests that do not need low latency."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from functools import partial
+
+from google import genai
+from google.genai import errors, types
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import BATCH_MAX_REQUESTS, BATCH_POLL_MAX, BATCH_POLL_MIN
+
+_LOGGER = logging.getLogger(__name__)
+
+_SUCCEEDED_STATES = {
+    types.JobState.JOB_STATE_SUCCEEDED,
+    types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+}
+_FAILED_STATES = {
+    types.JobState.JOB_STATE_FAILED,
+    types.JobState.JOB_STATE_CANCELLED,
+    types.JobState.JOB_STATE_EXPIRED,
+}
+_FINAL_STATES = _SUCCEEDED_STATES | _FAILED_STATES
+
+
+async def async_run_batch(
+    hass: HomeAssistant,
+    client: genai.Client,
+    model: str,
+    requests: list[types.InlinedRequest],
+    display_name: str,
+) -> list[types.GenerateContentResponse | str]:
+    """Run generate_content requests as Batch API jobs.
+
+    Returns one result per request, in order: the response, or the error
+    message of a request the job could not complete. Requests beyond
+    BATCH_MAX_REQUESTS are split into jobs that run side by side.
+    """
+    chunks = [
+        requests[start:start + BATCH_MAX_REQUESTS]
+        for start in range(0, len(requests), BATCH_MAX_REQUESTS)
+    ]
+    results = await asyncio.gather(
+        *(
+            _async_run_job(
+                hass,
+                client,
+                model,
+                chunk,
+                display_name if len(chunks) == 1 else f"{display_name} {number}/{len(chunks)}",
+            )
+            for number, chunk in enumerate(chunks, 1)
+        )
+    )
+    return [result for chunk_results in results for result in chunk_results]
+
+
+async def _async_run_job(
+    hass: HomeAssistant,
+    client: genai.Client,
+    model: str,
+    requests: list[types.InlinedRequest],
+    display_name: str,
+) -> list[types.GenerateContentResponse | str]:
+    """Submit one batch job, wait for it and return its results in order."""
+    # Responses carry the key back, so they map to requests in any order
+    source = [
+        request.model_copy(update={"metadata": {"key": str(index)}})
+        for index, request in enumerate(requests)
+    ]
+    job = await hass.async_add_executor_job(
+        partial(
+            client.batches.create,
+            model=model,
+            src=source,
+            config=types.CreateBatchJobConfig(display_name=display_name),
+        )
+    )
+    _LOGGER.info("Submitted Gemini batch %s with %d requests", job.name, len(requests))
+    try:
+        job = await _async_wait(hass, client, job)
+    except asyncio.CancelledError:
+        # Nobody collects the results any more
+        try:
+            await hass.async_add_executor_job(partial(client.batches.cancel, name=job.name))
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning("Could not cancel Gemini batch %s: %s", job.name, err)
+        raise
+
+    if job.state in _FAILED_STATES:
+        reason = job.error.message if job.error and job.error.message else job.state.value
+        raise HomeAssistantError(f"Gemini batch {job.name} did not complete: {reason}")
+
+    results: list[types.GenerateContentResponse | str] = [
+        "No response in batch results"
+    ] * len(requests)
+    inlined = job.dest.inlined_responses if job.dest and job.dest.inlined_responses else []
+    for position, item in enumerate(inlined):
+        index = int((item.metadata or {}).get("key", position))
+        if not 0 <= index < len(requests):
+            continue
+        if item.response is not None:
+            results[index] = item.response
+        elif item.error is not None:
+            results[index] = item.error.message or f"Error {item.error.code}"
+    _LOGGER.info(
+        "Gemini batch %s finished: %d of %d requests answered",
+        job.name,
+        sum(not isinstance(result, str) for result in results),
+        len(requests),
+    )
+    return results
+
+
+async def _async_wait(
+    hass: HomeAssistant, client: genai.Client, job: types.BatchJob
+) -> types.BatchJob:
+    """Poll a batch job with exponential backoff until it reaches a final state.
+
+    Jobs take minutes to hours, so the interval grows from BATCH_POLL_MIN to
+    BATCH_POLL_MAX. Server and network errors are retried at the next
+    interval; client errors such as a deleted job are raised.
+    """
+    delay = BATCH_POLL_MIN
+    while job.state not in _FINAL_STATES:
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, BATCH_POLL_MAX)
+        try:
+            job = await hass.async_add_executor_job(
+                partial(client.batches.get, name=job.name)
+            )
+        except errors.ClientError:
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Polling Gemini batch %s failed: %s", job.name, err)
+        else:
+            _LOGGER.debug("Gemini batch %s is %s", job.name, job.state)
+    return job
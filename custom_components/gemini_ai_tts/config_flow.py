@@ -22,19 +22,77 @@ from .const import (
     CONF_PACE,
     CONF_LANGUAGE,
     CONF_STREAMING,
+    CONF_SUMMARY_MODEL,
+    CONF_MODEL_FALLBACK,
+    CONF_TTS_LATENCY_SLO,
+    CONF_CONVERSATION_LATENCY_SLO,
     CONF_STT_PROJECT_ID,
     CONF_STT_CREDENTIALS_JSON,
     CONF_STT_LANGUAGE,
     CONF_STT_MODEL,
+    CONF_STT_ROUTING,
+    CONF_STT_SHORT_MODEL,
+    CONF_STT_SHORT_THRESHOLD,
+    CONF_STT_INTERIM_RESULTS,
+    CONF_STT_KEEPALIVE,
+    CONF_STT_WARMUP,
+    CONF_STT_BACKEND,
+    CONF_STT_GEMINI_MODEL,
+    CONF_STT_FLAC,
+    CONF_TTS_PRESYNTHESIS_COUNT,
+    CONF_CUSTOM_STYLES,
+    CONF_TTS_POSTPROCESS,
+    CONF_TTS_TARGET_LOUDNESS,
+    CONF_TRACING,
+    CONF_OTLP_ENDPOINT,
+    CONF_LOCAL_INTENTS,
+    CONF_FUNCTION_CALLING,
+    CONF_STATE_CONTEXT,
+    CONF_STATE_CONTEXT_ENTITIES,
+    CONF_LIVE_MODE,
+    CONF_LIVE_MODEL,
+    CONF_LIVE_URL,
+    CONF_BATCH_URL,
+    CONF_EXTRA_API_KEYS,
+    CONF_KEY_REQUESTS_PER_MINUTE,
     DEFAULT_MODEL_TTS,
     DEFAULT_MODEL_CONVERSATION,
+    DEFAULT_MODEL_SUMMARY,
+    DEFAULT_MODEL_FALLBACK,
+    DEFAULT_TTS_LATENCY_SLO,
+    DEFAULT_CONVERSATION_LATENCY_SLO,
     DEFAULT_VOICE,
     DEFAULT_STYLE,
     DEFAULT_LANGUAGE,
     DEFAULT_STREAMING,
     DEFAULT_STT_LANGUAGE,
     DEFAULT_STT_MODEL,
+    DEFAULT_STT_ROUTING,
+    DEFAULT_STT_SHORT_MODEL,
+    DEFAULT_STT_SHORT_THRESHOLD,
+    DEFAULT_STT_INTERIM_RESULTS,
+    DEFAULT_STT_KEEPALIVE,
+    DEFAULT_STT_WARMUP,
+    DEFAULT_STT_GEMINI_MODEL,
+    DEFAULT_STT_FLAC,
+    DEFAULT_TTS_PRESYNTHESIS_COUNT,
+    DEFAULT_TTS_POSTPROCESS,
+    DEFAULT_TTS_TARGET_LOUDNESS,
+    DEFAULT_TRACING,
+    DEFAULT_OTLP_ENDPOINT,
+    DEFAULT_LOCAL_INTENTS,
+    DEFAULT_FUNCTION_CALLING,
+    DEFAULT_STATE_CONTEXT,
+    DEFAULT_STATE_CONTEXT_ENTITIES,
+    DEFAULT_LIVE_MODE,
+    DEFAULT_MODEL_LIVE,
+    DEFAULT_LIVE_URL,
+    DEFAULT_BATCH_URL,
+    DEFAULT_EXTRA_API_KEYS,
+    DEFAULT_KEY_REQUESTS_PER_MINUTE,
     MODELS,
+    CONVERSATION_MODELS,
+    LIVE_MODELS,
     VOICES,
     SPEECH_STYLES,
     EMOTIONS,
@@ -42,10 +100,25 @@ from .const import (
     SUPPORTED_LANGUAGES,
     STT_SUPPORTED_LANGUAGES,
     STT_MODELS,
+    STT_BACKENDS,
+    STT_BACKEND_CLOUD,
+    STT_BACKEND_GEMINI,
+    STT_GEMINI_MODELS,
 )
+from .keys import parse_api_keys
 
 _LOGGER = logging.getLogger(__name__)
 
+# Text options the frontend leaves out when cleared. They are shown as
+# suggested values rather than defaults, and a missing one means empty.
+_GLOBAL_TEXT_OPTIONS = (
+    CONF_OTLP_ENDPOINT,
+    CONF_LIVE_URL,
+    CONF_BATCH_URL,
+    CONF_EXTRA_API_KEYS,
+)
+_TTS_TEXT_OPTIONS = (CONF_CUSTOM_STYLES,)
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_API_KEY): str,
@@ -187,11 +260,22 @@ class OptionsFlow(config_entries.OptionsFlow):
             try:
                 # Safely validate and filter input data
                 validated_input = {}
-                allowed_keys = {CONF_LANGUAGE, CONF_STREAMING}
+                allowed_keys = {
+                    CONF_LANGUAGE, CONF_STREAMING, CONF_MODEL_FALLBACK,
+                    CONF_TRACING, CONF_OTLP_ENDPOINT,
+                    CONF_LIVE_MODE, CONF_LIVE_MODEL, CONF_LIVE_URL, CONF_BATCH_URL,
+                    CONF_EXTRA_API_KEYS, CONF_KEY_REQUESTS_PER_MINUTE,
+                }
                 
                 for key, value in user_input.items():
                     if key in allowed_keys and value is not None:
                         validated_input[key] = value
+                for key in _GLOBAL_TEXT_OPTIONS:
+                    validated_input.setdefault(key, "")
+                
+                extra_keys = parse_api_keys(validated_input.get(CONF_EXTRA_API_KEYS, ""))
+                if any(len(key) < 10 for key in extra_keys):
+                    raise InvalidAPIKey("Invalid additional API key format")
                 
                 # Safely merge with existing options
                 current_options = dict(self.config_entry.options) if self.config_entry.options else {}
@@ -202,6 +286,8 @@ class OptionsFlow(config_entries.OptionsFlow):
                 
                 return self.async_create_entry(title="", data=clean_options)
                 
+            except InvalidAPIKey:
+                errors["base"] = "invalid_api_key"
             except Exception as err:
                 _LOGGER.error("Error saving global settings: %s", err, exc_info=True)
                 errors["base"] = "unknown_error"
@@ -224,6 +310,71 @@ class OptionsFlow(config_entries.OptionsFlow):
                         CONF_STREAMING,
                         default=self.config_entry.options.get(CONF_STREAMING, DEFAULT_STREAMING),
                     ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_MODEL_FALLBACK,
+                        default=self.config_entry.options.get(CONF_MODEL_FALLBACK, DEFAULT_MODEL_FALLBACK),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_TRACING,
+                        default=self.config_entry.options.get(CONF_TRACING, DEFAULT_TRACING),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_OTLP_ENDPOINT,
+                        description={
+                            "suggested_value": self.config_entry.options.get(CONF_OTLP_ENDPOINT, DEFAULT_OTLP_ENDPOINT)
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(type=selector.TextSelectorType.URL)
+                    ),
+                    vol.Optional(
+                        CONF_LIVE_MODE,
+                        default=self.config_entry.options.get(CONF_LIVE_MODE, DEFAULT_LIVE_MODE),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_LIVE_MODEL,
+                        default=self.config_entry.options.get(CONF_LIVE_MODEL, DEFAULT_MODEL_LIVE),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(value=k, label=v)
+                                for k, v in LIVE_MODELS.items()
+                            ]
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_LIVE_URL,
+                        description={
+                            "suggested_value": self.config_entry.options.get(CONF_LIVE_URL, DEFAULT_LIVE_URL)
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(type=selector.TextSelectorType.URL)
+                    ),
+                    vol.Optional(
+                        CONF_BATCH_URL,
+                        description={
+                            "suggested_value": self.config_entry.options.get(CONF_BATCH_URL, DEFAULT_BATCH_URL)
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(type=selector.TextSelectorType.URL)
+                    ),
+                    vol.Optional(
+                        CONF_EXTRA_API_KEYS,
+                        description={
+                            "suggested_value": self.config_entry.options.get(CONF_EXTRA_API_KEYS, DEFAULT_EXTRA_API_KEYS)
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(multiline=True)
+                    ),
+                    vol.Optional(
+                        CONF_KEY_REQUESTS_PER_MINUTE,
+                        default=self.config_entry.options.get(
+                            CONF_KEY_REQUESTS_PER_MINUTE, DEFAULT_KEY_REQUESTS_PER_MINUTE
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0, max=10000, step=1, mode=selector.NumberSelectorMode.BOX
+                        )
+                    ),
                 }
             )
 
@@ -251,7 +402,10 @@ class OptionsFlow(config_entries.OptionsFlow):
                 # Safely validate and filter input data
                 validated_input = {}
                 allowed_keys = {"conversation_model", "conversation_max_tokens", 
-                              "conversation_temperature", "conversation_context_length"}
+                              "conversation_temperature", "conversation_context_length",
+                              CONF_SUMMARY_MODEL, CONF_CONVERSATION_LATENCY_SLO,
+                              CONF_LOCAL_INTENTS, CONF_FUNCTION_CALLING,
+                              CONF_STATE_CONTEXT, CONF_STATE_CONTEXT_ENTITIES}
                 
                 for key, value in user_input.items():
                     if key in allowed_keys and value is not None:
@@ -323,6 +477,62 @@ class OptionsFlow(config_entries.OptionsFlow):
                             mode=selector.NumberSelectorMode.BOX,
                         )
                     ),
+                    vol.Optional(
+                        CONF_SUMMARY_MODEL,
+                        default=self.config_entry.options.get(CONF_SUMMARY_MODEL, DEFAULT_MODEL_SUMMARY),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(value=k, label=v) 
+                                for k, v in CONVERSATION_MODELS.items()
+                            ]
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_CONVERSATION_LATENCY_SLO,
+                        default=self.config_entry.options.get(
+                            CONF_CONVERSATION_LATENCY_SLO, DEFAULT_CONVERSATION_LATENCY_SLO
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=30,
+                            step=0.5,
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_LOCAL_INTENTS,
+                        default=self.config_entry.options.get(
+                            CONF_LOCAL_INTENTS, DEFAULT_LOCAL_INTENTS
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_FUNCTION_CALLING,
+                        default=self.config_entry.options.get(
+                            CONF_FUNCTION_CALLING, DEFAULT_FUNCTION_CALLING
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_STATE_CONTEXT,
+                        default=self.config_entry.options.get(
+                            CONF_STATE_CONTEXT, DEFAULT_STATE_CONTEXT
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_STATE_CONTEXT_ENTITIES,
+                        default=self.config_entry.options.get(
+                            CONF_STATE_CONTEXT_ENTITIES, DEFAULT_STATE_CONTEXT_ENTITIES
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=5,
+                            max=500,
+                            step=5,
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
                 }
             )
 
@@ -349,11 +559,17 @@ class OptionsFlow(config_entries.OptionsFlow):
             try:
                 # Safely validate and filter input data
                 validated_input = {}
-                allowed_keys = {"tts_model", CONF_VOICE, CONF_STYLE, CONF_EMOTION, CONF_PACE, "tts_quality"}
+                allowed_keys = {
+                    "tts_model", CONF_VOICE, CONF_STYLE, CONF_EMOTION, CONF_PACE, "tts_quality",
+                    CONF_TTS_PRESYNTHESIS_COUNT, CONF_TTS_LATENCY_SLO, CONF_CUSTOM_STYLES,
+                    CONF_TTS_POSTPROCESS, CONF_TTS_TARGET_LOUDNESS,
+                }
                 
                 for key, value in user_input.items():
                     if key in allowed_keys and value is not None:
                         validated_input[key] = value
+                for key in _TTS_TEXT_OPTIONS:
+                    validated_input.setdefault(key, "")
                 
                 # Safely merge with existing options
                 current_options = dict(self.config_entry.options) if self.config_entry.options else {}
@@ -417,6 +633,14 @@ class OptionsFlow(config_entries.OptionsFlow):
                     ): selector.SelectSelector(
                         selector.SelectSelectorConfig(options=PACE_OPTIONS)
                     ),
+                    vol.Optional(
+                        CONF_CUSTOM_STYLES,
+                        description={
+                            "suggested_value": self.config_entry.options.get(CONF_CUSTOM_STYLES, "")
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(multiline=True)
+                    ),
                     vol.Optional(
                         "tts_quality",
                         default=self.config_entry.options.get("tts_quality", "standard"),
@@ -428,6 +652,51 @@ class OptionsFlow(config_entries.OptionsFlow):
                             ]
                         )
                     ),
+                    vol.Optional(
+                        CONF_TTS_POSTPROCESS,
+                        default=self.config_entry.options.get(
+                            CONF_TTS_POSTPROCESS, DEFAULT_TTS_POSTPROCESS
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_TTS_TARGET_LOUDNESS,
+                        default=self.config_entry.options.get(
+                            CONF_TTS_TARGET_LOUDNESS, DEFAULT_TTS_TARGET_LOUDNESS
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=-30,
+                            max=-10,
+                            step=1,
+                            unit_of_measurement="LUFS",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_TTS_LATENCY_SLO,
+                        default=self.config_entry.options.get(CONF_TTS_LATENCY_SLO, DEFAULT_TTS_LATENCY_SLO),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=30,
+                            step=0.5,
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_TTS_PRESYNTHESIS_COUNT,
+                        default=self.config_entry.options.get(
+                            CONF_TTS_PRESYNTHESIS_COUNT, DEFAULT_TTS_PRESYNTHESIS_COUNT
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=50,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
                 }
             )
 
@@ -457,7 +726,10 @@ class OptionsFlow(config_entries.OptionsFlow):
                 allowed_keys = {
                     CONF_STT_LANGUAGE, CONF_STT_MODEL, "stt_enhanced_models",
                     "stt_profanity_filter", "stt_enable_word_confidence",
-                    "stt_enable_automatic_punctuation", "stt_sample_rate"
+                    "stt_enable_automatic_punctuation", "stt_sample_rate",
+                    CONF_STT_ROUTING, CONF_STT_SHORT_MODEL, CONF_STT_SHORT_THRESHOLD,
+                    CONF_STT_INTERIM_RESULTS, CONF_STT_KEEPALIVE, CONF_STT_WARMUP,
+                    CONF_STT_BACKEND, CONF_STT_GEMINI_MODEL, CONF_STT_FLAC,
                 }
                 
                 for key, value in user_input.items():
@@ -478,8 +750,35 @@ class OptionsFlow(config_entries.OptionsFlow):
                 errors["base"] = "unknown_error"
 
         try:
+            default_backend = (
+                STT_BACKEND_CLOUD
+                if self.config_entry.data.get(CONF_STT_CREDENTIALS_JSON)
+                else STT_BACKEND_GEMINI
+            )
             stt_schema = vol.Schema(
                 {
+                    vol.Optional(
+                        CONF_STT_BACKEND,
+                        default=self.config_entry.options.get(CONF_STT_BACKEND, default_backend),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(value=k, label=v)
+                                for k, v in STT_BACKENDS.items()
+                            ]
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_STT_GEMINI_MODEL,
+                        default=self.config_entry.options.get(CONF_STT_GEMINI_MODEL, DEFAULT_STT_GEMINI_MODEL),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(value=k, label=v)
+                                for k, v in STT_GEMINI_MODELS.items()
+                            ]
+                        )
+                    ),
                     vol.Optional(
                         CONF_STT_LANGUAGE,
                         default=self.config_entry.options.get(CONF_STT_LANGUAGE, DEFAULT_STT_LANGUAGE),
@@ -502,6 +801,33 @@ class OptionsFlow(config_entries.OptionsFlow):
                             ]
                         )
                     ),
+                    vol.Optional(
+                        CONF_STT_ROUTING,
+                        default=self.config_entry.options.get(CONF_STT_ROUTING, DEFAULT_STT_ROUTING),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_STT_SHORT_MODEL,
+                        default=self.config_entry.options.get(CONF_STT_SHORT_MODEL, DEFAULT_STT_SHORT_MODEL),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(value=k, label=v) 
+                                for k, v in STT_MODELS.items()
+                            ]
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_STT_SHORT_THRESHOLD,
+                        default=self.config_entry.options.get(CONF_STT_SHORT_THRESHOLD, DEFAULT_STT_SHORT_THRESHOLD),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=30,
+                            step=0.5,
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
                     vol.Optional(
                         "stt_enhanced_models",
                         default=self.config_entry.options.get("stt_enhanced_models", True),
@@ -533,6 +859,22 @@ class OptionsFlow(config_entries.OptionsFlow):
                             ]
                         )
                     ),
+                    vol.Optional(
+                        CONF_STT_INTERIM_RESULTS,
+                        default=self.config_entry.options.get(CONF_STT_INTERIM_RESULTS, DEFAULT_STT_INTERIM_RESULTS),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_STT_KEEPALIVE,
+                        default=self.config_entry.options.get(CONF_STT_KEEPALIVE, DEFAULT_STT_KEEPALIVE),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_STT_WARMUP,
+                        default=self.config_entry.options.get(CONF_STT_WARMUP, DEFAULT_STT_WARMUP),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_STT_FLAC,
+                        default=self.config_entry.options.get(CONF_STT_FLAC, DEFAULT_STT_FLAC),
+                    ): selector.BooleanSelector(),
                 }
             )
 
@@ -3,6 +3,21 @@ from __future__ import annotations
 
 DOMAIN = "gemini_ai_tts"
 
+# Keys for per-entry runtime data in hass.data[DOMAIN][entry_id]
+DATA_CONFIG = "config"
+DATA_UTTERANCES = "utterances"
+DATA_TTS_ENTITY = "tts_entity"
+DATA_TRACER = "tracer"
+DATA_LIVE = "live"
+DATA_KEYS = "keys"
+
+# Dispatcher signals
+SIGNAL_OPTIONS_UPDATED = f"{DOMAIN}_options_updated_{{}}"
+
+# Events
+EVENT_STT_RESULT = f"{DOMAIN}_stt_result"
+EVENT_BATCH_FINISHED = f"{DOMAIN}_batch_finished"
+
 # Configuration keys
 CONF_API_KEY = "api_key"
 CONF_MODEL = "model"
@@ -16,16 +31,72 @@ CONF_STT_PROJECT_ID = "stt_project_id"
 CONF_STT_CREDENTIALS_JSON = "stt_credentials_json"
 CONF_STT_LANGUAGE = "stt_language"
 CONF_STT_MODEL = "stt_model"
+CONF_TTS_PRESYNTHESIS_COUNT = "tts_presynthesis_count"
+CONF_CUSTOM_STYLES = "tts_custom_styles"
+CONF_SUMMARY_MODEL = "conversation_summary_model"
+CONF_MODEL_FALLBACK = "model_fallback"
+CONF_TTS_LATENCY_SLO = "tts_latency_slo"
+CONF_CONVERSATION_LATENCY_SLO = "conversation_latency_slo"
+CONF_STT_ROUTING = "stt_model_routing"
+CONF_STT_SHORT_MODEL = "stt_short_model"
+CONF_STT_SHORT_THRESHOLD = "stt_short_threshold"
+CONF_STT_INTERIM_RESULTS = "stt_interim_results"
+CONF_STT_KEEPALIVE = "stt_keepalive"
+CONF_STT_WARMUP = "stt_warmup"
+CONF_STT_BACKEND = "stt_backend"
+CONF_STT_GEMINI_MODEL = "stt_gemini_model"
+CONF_STT_FLAC = "stt_flac_upload"
+CONF_TTS_POSTPROCESS = "tts_postprocess"
+CONF_TTS_TARGET_LOUDNESS = "tts_target_loudness"
+CONF_TRACING = "tracing"
+CONF_OTLP_ENDPOINT = "otlp_endpoint"
+CONF_LOCAL_INTENTS = "conversation_local_intents"
+CONF_FUNCTION_CALLING = "conversation_function_calling"
+CONF_STATE_CONTEXT = "conversation_state_context"
+CONF_STATE_CONTEXT_ENTITIES = "conversation_state_context_entities"
+CONF_LIVE_MODE = "live_mode"
+CONF_LIVE_MODEL = "live_model"
+CONF_LIVE_URL = "live_url"
+CONF_BATCH_URL = "batch_url"
+CONF_EXTRA_API_KEYS = "extra_api_keys"
+CONF_KEY_REQUESTS_PER_MINUTE = "api_key_requests_per_minute"
 
 # Default values
 DEFAULT_MODEL_TTS = "gemini-2.5-flash-preview-tts"
 DEFAULT_MODEL_CONVERSATION = "gemini-2.5-pro-preview-06-05"
+DEFAULT_MODEL_SUMMARY = "gemini-2.0-flash"
+DEFAULT_MODEL_FALLBACK = True
+DEFAULT_TTS_LATENCY_SLO = 20.0
+DEFAULT_CONVERSATION_LATENCY_SLO = 15.0
 DEFAULT_VOICE = "Puck"
 DEFAULT_STYLE = "natural"
 DEFAULT_LANGUAGE = "auto"
 DEFAULT_STREAMING = True
 DEFAULT_STT_LANGUAGE = "en-US"
 DEFAULT_STT_MODEL = "latest_long"
+DEFAULT_TTS_PRESYNTHESIS_COUNT = 10
+DEFAULT_STT_ROUTING = True
+DEFAULT_STT_SHORT_MODEL = "latest_short"
+DEFAULT_STT_SHORT_THRESHOLD = 5.0
+DEFAULT_STT_INTERIM_RESULTS = False
+DEFAULT_STT_KEEPALIVE = True
+DEFAULT_STT_WARMUP = False
+DEFAULT_STT_GEMINI_MODEL = "gemini-2.5-flash"
+DEFAULT_STT_FLAC = False
+DEFAULT_TTS_POSTPROCESS = False
+DEFAULT_TTS_TARGET_LOUDNESS = -16.0
+DEFAULT_TRACING = True
+DEFAULT_OTLP_ENDPOINT = ""
+DEFAULT_LOCAL_INTENTS = True
+DEFAULT_FUNCTION_CALLING = True
+DEFAULT_STATE_CONTEXT = True
+DEFAULT_STATE_CONTEXT_ENTITIES = 40
+DEFAULT_LIVE_MODE = False
+DEFAULT_MODEL_LIVE = "gemini-2.5-flash-native-audio-preview-09-2025"
+DEFAULT_LIVE_URL = ""
+DEFAULT_BATCH_URL = ""
+DEFAULT_EXTRA_API_KEYS = ""
+DEFAULT_KEY_REQUESTS_PER_MINUTE = 0
 
 # Available models - separated by category
 CONVERSATION_MODELS = {
@@ -39,6 +110,12 @@ TTS_MODELS = {
     "gemini-2.5-pro-preview-tts": "Gemini 2.5 Pro TTS (High Quality)",
 }
 
+LIVE_MODELS = {
+    "gemini-2.5-flash-native-audio-preview-09-2025": "Gemini 2.5 Flash Native Audio (Live)",
+    "gemini-live-2.5-flash-preview": "Gemini 2.5 Flash Live (Half Cascade)",
+    "gemini-2.0-flash-live-001": "Gemini 2.0 Flash Live",
+}
+
 # Combined models for backward compatibility
 MODELS = {**CONVERSATION_MODELS, **TTS_MODELS}
 
@@ -113,6 +190,41 @@ PACE_OPTIONS = [
     "very_fast"
 ]
 
+# Prompt directives for each style, emotion and pace (empty means no directive)
+STYLE_DIRECTIVES = {
+    "natural": "",
+    "cheerful": "in a cheerful way",
+    "excited": "in an excited way",
+    "calm": "in a calm way",
+    "professional": "in a professional tone",
+    "friendly": "in a friendly manner",
+    "mysterious": "mysteriously",
+    "dramatic": "dramatically",
+    "whisper": "in a whisper",
+    "confident": "confidently",
+}
+
+EMOTION_DIRECTIVES = {
+    "neutral": "",
+    "happy": "cheerfully",
+    "sad": "with sadness",
+    "angry": "with anger",
+    "surprised": "with surprise",
+    "disgusted": "with disgust",
+    "fearful": "with fear",
+    "excited": "with excitement",
+    "calm": "calmly",
+    "serious": "seriously",
+}
+
+PACE_DIRECTIVES = {
+    "very_slow": "very slowly",
+    "slow": "slowly",
+    "normal": "",
+    "fast": "quickly",
+    "very_fast": "very quickly",
+}
+
 # Supported languages
 SUPPORTED_LANGUAGES = {
     "ar-EG": "Arabic (Egyptian)",
@@ -234,6 +346,20 @@ STT_MODELS = {
     "default": "Default (General purpose)",
 }
 
+# STT backends; without Cloud Speech credentials Gemini is always used
+STT_BACKEND_CLOUD = "cloud"
+STT_BACKEND_GEMINI = "gemini"
+STT_BACKENDS = {
+    STT_BACKEND_CLOUD: "Google Cloud Speech-to-Text",
+    STT_BACKEND_GEMINI: "Gemini Audio Understanding (API key only)",
+}
+
+STT_GEMINI_MODELS = {
+    "gemini-2.5-flash": "Gemini 2.5 Flash (Accurate)",
+    "gemini-2.5-flash-lite": "Gemini 2.5 Flash Lite (Fastest)",
+    "gemini-2.0-flash": "Gemini 2.0 Flash",
+}
+
 # Audio settings
 AUDIO_SAMPLE_RATE = 24000
 AUDIO_CHANNELS = 1
@@ -244,3 +370,112 @@ AUDIO_FORMAT = "wav"
 API_TIMEOUT = 30
 MAX_TEXT_LENGTH = 8000
 CONTEXT_WINDOW = 32000
+
+# API key pool (seconds); a rate-limited key cools down for the server's
+# retry delay, or for a doubling cooldown between the minimum and maximum
+KEY_COOLDOWN_MIN = 5
+KEY_COOLDOWN_MAX = 300
+KEY_MAX_WAIT = 10
+
+# Circuit breakers of the model fallback chains
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN = 60
+
+# Conversation history persistence
+HISTORY_STORAGE_VERSION = 1
+HISTORY_SAVE_DELAY = 10
+HISTORY_MAX_MESSAGES = 40
+HISTORY_MAX_SESSIONS = 50
+HISTORY_MAX_AGE = 7 * 24 * 3600
+
+# Rolling summary of older conversation turns
+SUMMARY_BATCH_MESSAGES = 6
+SUMMARY_MAX_TOKENS = 400
+
+# TTS audio cache and pre-synthesis of likely replies
+TTS_CACHE_SIZE = 50
+TTS_PRESYNTHESIS_INTERVAL = 300
+TTS_PRESYNTHESIS_IDLE_TIME = 60
+UTTERANCE_SKETCH_SIZE = 200
+UTTERANCE_MAX_LENGTH = 200
+
+# TTS audio post-processing (dBFS and seconds)
+POSTPROCESS_TRIM_THRESHOLD = -50.0
+POSTPROCESS_TRIM_PADDING = 0.05
+POSTPROCESS_LIMITER_CEILING = -1.0
+POSTPROCESS_LIMITER_LOOKAHEAD = 0.005
+
+# Bulk announcement export
+EXPORT_DEFAULT_DIR = "gemini_announcements"
+EXPORT_FORMATS = {"mp3": "libmp3lame", "ogg": "libopus", "flac": "flac"}
+EXPORT_BITRATE = "64k"
+EXPORT_DEFAULT_WORKERS = 4
+EXPORT_MAX_WORKERS = 16
+EXPORT_DEFAULT_REQUESTS_PER_MINUTE = 30
+EXPORT_MANIFEST = "manifest.json"
+EXPORT_MANIFEST_SAVE_EVERY = 10
+
+# Gemini Batch API jobs (seconds unless noted); polling backs off from the
+# minimum to the maximum interval, and larger batches are split into jobs
+BATCH_POLL_MIN = 10
+BATCH_POLL_MAX = 300
+BATCH_MAX_REQUESTS = 500
+
+# Latency tracing
+TRACE_BUFFER_SIZE = 50
+TRACE_LINK_WINDOW = 30
+TRACE_EXPORT_TIMEOUT = 5
+
+# Device control through Gemini function calling
+TOOL_CALL_TIMEOUT = 10
+TOOL_MAX_ROUNDS = 3
+
+# Gemini Live sessions (seconds unless noted)
+LIVE_ENDPOINT = (
+    "wss://generativelanguage.googleapis.com/ws/"
+    "google.ai.generativelanguage.v1beta.GenerativeService.BidiGenerateContent"
+)
+LIVE_MAX_SESSIONS = 4
+LIVE_CONNECT_TIMEOUT = 10
+LIVE_TURN_TIMEOUT = 30
+LIVE_HEARTBEAT = 30
+LIVE_PENDING_REPLIES = 8
+# Quiet time after which the input transcription of a turn counts as complete
+LIVE_TRANSCRIPT_SETTLE = 0.3
+
+# Entity retrieval for the prompt (BM25 parameters)
+RETRIEVAL_BM25_K1 = 1.2
+RETRIEVAL_BM25_B = 0.75
+
+# Cloud Speech channel settings (seconds)
+STT_KEEPALIVE_INTERVAL = 60
+STT_KEEPALIVE_TIMEOUT = 20
+STT_CHANNEL_CHECK_INTERVAL = 30
+STT_CHANNEL_CONNECT_TIMEOUT = 10
+STT_WARMUP_IDLE_TIMEOUT = 600
+
+# STT model routing
+STT_ROUTING_EWMA_ALPHA = 0.2
+STT_ROUTING_EXPLORE_EVERY = 20
+
+# Long audio STT: PCM beyond the inline limit is split at quiet points and
+# recognized in parallel; long Opus audio uses long_running_recognize
+STT_MAX_INLINE_SECONDS = 55
+STT_MAX_INLINE_BYTES = 9_500_000
+STT_CHUNK_SECONDS = 50
+STT_SPLIT_SEARCH_SECONDS = 10
+STT_SPLIT_WINDOW_MS = 20
+STT_LONG_AUDIO_PARALLELISM = 4
+STT_OPUS_LONG_AUDIO_BYTES = 240_000
+STT_LONG_RUNNING_TIMEOUT = 600
+
+# Streaming STT request size (bytes of audio per request message)
+STT_STREAMING_CHUNK_BYTES = 16000
+
+# Lossless FLAC compression of PCM STT uploads (samples per block)
+FLAC_BLOCK_SIZE = 4096
+FLAC_MAX_PARTITION_ORDER = 6
+
+# Gemini STT backend; inline audio must fit one request
+STT_GEMINI_MAX_BYTES = 20 * 1024 * 1024
+STT_GEMINI_MAX_TOKENS = 1024
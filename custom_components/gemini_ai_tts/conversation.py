@@ -1,34 +1,78 @@
 """Conversation agent for Gemini AI."""
 from __future__ import annotations
 
-import asyncio
 import logging
+import time
 from typing import Any
 
 from google import genai
 from google.genai import types
 from homeassistant.components.conversation import (
     ATTR_AGENT_ID,
+    DOMAIN as CONVERSATION_DOMAIN,
     ConversationEntity,
     ConversationInput,
     ConversationResult,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers import intent
+from homeassistant.helpers import intent, llm
 from homeassistant.util import ulid
 
 from .const import (
     DOMAIN,
-    CONF_API_KEY,
+    SIGNAL_OPTIONS_UPDATED,
+    DATA_UTTERANCES,
+    DATA_TRACER,
+    DATA_LIVE,
+    DATA_KEYS,
+    CONF_SUMMARY_MODEL,
+    CONF_MODEL_FALLBACK,
+    CONF_CONVERSATION_LATENCY_SLO,
+    CONF_LOCAL_INTENTS,
+    CONF_FUNCTION_CALLING,
+    CONF_STATE_CONTEXT,
+    CONF_STATE_CONTEXT_ENTITIES,
     DEFAULT_MODEL_CONVERSATION,
+    DEFAULT_MODEL_FALLBACK,
+    DEFAULT_CONVERSATION_LATENCY_SLO,
+    DEFAULT_MODEL_SUMMARY,
+    DEFAULT_LOCAL_INTENTS,
+    DEFAULT_FUNCTION_CALLING,
+    DEFAULT_STATE_CONTEXT,
+    DEFAULT_STATE_CONTEXT_ENTITIES,
     API_TIMEOUT,
     CONTEXT_WINDOW,
+    CONVERSATION_MODELS,
+    SUMMARY_BATCH_MESSAGES,
+    SUMMARY_MAX_TOKENS,
+    TOOL_MAX_ROUNDS,
 )
+from .fallback import ModelAttempt, ModelFallbackChain, fallback_models
+from .history import ConversationHistory
+from .intents import PathStats, async_match_local_intent
+from .keys import ApiKeyPool
+from .live import LivePool, LiveReply
+from .state_digest import HomeStateDigest
+from .tools import async_call_tools, function_declarations
+from .tracing import Tracer
+from .utterances import LikelyUtterances
 
 _LOGGER = logging.getLogger(__name__)
 
+# Device control guidance used in place of the Assist API prompt when the
+# state digest already describes the exposed entities
+_DEVICE_CONTROL_PROMPT = (
+    "When controlling Home Assistant always call the intent tools. "
+    "Use HassTurnOn to lock and HassTurnOff to unlock a lock. "
+    "When controlling a device, prefer passing just its name and its domain "
+    "(what comes before the dot in its entity id). "
+    "When controlling an area, prefer passing just area name and domain."
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -36,11 +80,25 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Gemini AI Conversation platform via config entry."""
-    api_key = config_entry.data[CONF_API_KEY]
+    keys = hass.data[DOMAIN][config_entry.entry_id][DATA_KEYS]
     options = config_entry.options
+    utterances = hass.data[DOMAIN][config_entry.entry_id][DATA_UTTERANCES]
+    tracer = hass.data[DOMAIN][config_entry.entry_id][DATA_TRACER]
+    live = hass.data[DOMAIN][config_entry.entry_id][DATA_LIVE]
+
+    history = ConversationHistory(hass, config_entry.entry_id)
 
-    conversation_entity = GeminiConversationEntity(hass, api_key, options)
+    conversation_entity = GeminiConversationEntity(
+        hass, keys, options, utterances, history, tracer, live
+    )
     async_add_entities([conversation_entity])
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_OPTIONS_UPDATED.format(config_entry.entry_id),
+            conversation_entity.async_update_options,
+        )
+    )
 
 
 class GeminiConversationEntity(ConversationEntity):
@@ -49,25 +107,92 @@ class GeminiConversationEntity(ConversationEntity):
     def __init__(
         self, 
         hass: HomeAssistant, 
-        api_key: str, 
-        options: dict[str, Any]
+        keys: ApiKeyPool,
+        options: dict[str, Any],
+        utterances: LikelyUtterances,
+        history: ConversationHistory,
+        tracer: Tracer,
+        live: LivePool,
     ) -> None:
         """Initialize the conversation entity."""
         self._hass = hass
-        self._api_key = api_key
         self._options = options
+        self._tracer = tracer
+        
+        # Replies Gemini Live already gave while the user was being transcribed
+        self._live = live
+        
+        # Replies are recorded so the TTS entity can pre-render common ones
+        self._utterances = utterances
         
-        # Create the client using the new SDK
-        self._client = genai.Client(api_key=api_key)
+        # Requests are spread over the configured API keys
+        self._keys = keys
         
-        # Get model from options or use default
+        # Get model from options or use default, with faster models as fallback
         self._model_name = options.get("conversation_model", DEFAULT_MODEL_CONVERSATION)
+        self._model_chain = ModelFallbackChain(
+            "Conversation", *self._model_chain_settings()
+        )
         
         self._attr_name = "Gemini AI Conversation"
         self._attr_unique_id = f"{DOMAIN}_conversation"
         
-        # Conversation history
-        self._conversation_history: list[dict[str, str]] = []
+        # Conversation history per conversation_id, persisted across reloads
+        self._history = history
+        
+        # Conversations whose older turns are being summarized in the background
+        self._summarizing: set[str] = set()
+        
+        # Hit rate and latency of local intent matching, Gemini Live and Gemini
+        self._path_stats = {
+            "local": PathStats(),
+            "live": PathStats(),
+            "gemini": PathStats(),
+        }
+        
+        # States of exposed entities, kept current from state_changed events
+        self._state_digest = HomeStateDigest(hass)
+
+    async def async_added_to_hass(self) -> None:
+        """Start following exposed entity states when the entity is added."""
+        await super().async_added_to_hass()
+        self._state_digest.async_start()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Persist pending history before the entity goes away."""
+        self._state_digest.async_stop()
+        await self._history.async_flush()
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def async_update_options(self, options: dict[str, Any]) -> None:
+        """Apply updated options in place, keeping the client and history."""
+        self._options = options
+        self._model_name = options.get("conversation_model", DEFAULT_MODEL_CONVERSATION)
+        self._model_chain.configure(*self._model_chain_settings())
+
+    def _model_chain_settings(self) -> tuple[list[str], float]:
+        """Return the model fallback order and latency SLO from the options."""
+        return (
+            fallback_models(
+                self._model_name,
+                CONVERSATION_MODELS,
+                self._options.get(CONF_MODEL_FALLBACK, DEFAULT_MODEL_FALLBACK),
+            ),
+            float(
+                self._options.get(
+                    CONF_CONVERSATION_LATENCY_SLO, DEFAULT_CONVERSATION_LATENCY_SLO
+                )
+            ),
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return model fallback and answer path metrics."""
+        return {
+            "model_fallback": self._model_chain.as_dict(),
+            "paths": {name: stats.as_dict() for name, stats in self._path_stats.items()},
+        }
 
     @property
     def supported_languages(self) -> list[str] | str:
@@ -100,107 +225,435 @@ class GeminiConversationEntity(ConversationEntity):
 
     async def async_process(self, user_input: ConversationInput) -> ConversationResult:
         """Process a conversation turn."""
+        conversation_id = user_input.conversation_id or ulid.ulid()
+        
+        with self._tracer.stage("conversation", conversation_id):
+            return await self._async_process_turn(user_input, conversation_id)
+
+    async def _async_process_turn(
+        self, user_input: ConversationInput, conversation_id: str
+    ) -> ConversationResult:
+        """Answer one user message within a conversation."""
+        # Plain device commands are matched locally in milliseconds
+        if self._options.get(CONF_LOCAL_INTENTS, DEFAULT_LOCAL_INTENTS):
+            if result := await self._async_process_locally(user_input, conversation_id):
+                if self._live.enabled and (
+                    live_reply := self._live.pop_heard(user_input.text)
+                ):
+                    # Its answer would contradict the action just taken
+                    await self._live.async_discard(live_reply)
+                return result
+        
+        # Gemini Live may already be answering what it transcribed
+        live_reply = self._live.pop_heard(user_input.text) if self._live.enabled else None
+        if live_reply is not None:
+            if result := await self._async_process_live(
+                user_input, conversation_id, live_reply
+            ):
+                return result
+        
         try:
-            response_text = await self._generate_response(user_input.text)
+            with self._tracer.span("conversation.history"):
+                history = await self._history.async_get(conversation_id)
+                summary = await self._history.async_get_summary(conversation_id)
+            api = await self._async_get_llm_api(user_input)
+            start = time.monotonic()
+            try:
+                response_text = await self._generate_response(
+                    user_input.text, history, summary, api
+                )
+            except Exception:
+                self._path_stats["gemini"].record(time.monotonic() - start, False)
+                raise
+            self._path_stats["gemini"].record(time.monotonic() - start, True)
             
-            # Add to conversation history
-            self._conversation_history.append({
-                "role": "user",
-                "content": user_input.text
-            })
-            self._conversation_history.append({
-                "role": "assistant", 
-                "content": response_text
-            })
+            # Add to conversation history (capped per conversation)
+            await self._history.async_append(
+                conversation_id,
+                [
+                    {"role": "user", "content": user_input.text},
+                    {"role": "assistant", "content": response_text},
+                ],
+            )
+            self._async_schedule_summary(conversation_id)
             
-            # Keep history manageable (last 20 exchanges)
-            if len(self._conversation_history) > 40:
-                self._conversation_history = self._conversation_history[-40:]
+            self._utterances.record(response_text)
             
             intent_response = intent.IntentResponse(language=user_input.language)
             intent_response.async_set_speech(response_text)
             
             return ConversationResult(
                 response=intent_response,
-                conversation_id=user_input.conversation_id or ulid.ulid(),
+                conversation_id=conversation_id,
             )
             
         except Exception as err:
             _LOGGER.error("Error processing conversation: %s", err)
             
+            error_text = f"Sorry, I encountered an error: {err}"
+            self._utterances.record(error_text)
+            
             intent_response = intent.IntentResponse(language=user_input.language)
             intent_response.async_set_error(
                 intent.IntentResponseErrorCode.UNKNOWN,
-                f"Sorry, I encountered an error: {err}",
+                error_text,
             )
             
             return ConversationResult(
                 response=intent_response,
-                conversation_id=user_input.conversation_id,
+                conversation_id=conversation_id,
+            )
+
+    async def _async_process_locally(
+        self, user_input: ConversationInput, conversation_id: str
+    ) -> ConversationResult | None:
+        """Answer with Home Assistant's sentence matcher, or return None."""
+        start = time.monotonic()
+        with self._tracer.span("conversation.local_intent") as span:
+            result = await async_match_local_intent(
+                self._hass, user_input, conversation_id
+            )
+            span.set(hit=result is not None)
+        self._path_stats["local"].record(time.monotonic() - start, result is not None)
+        if result is None:
+            return None
+        
+        # Keep the exchange so Gemini sees it on later turns
+        speech = result.response.speech.get("plain", {}).get("speech", "")
+        await self._history.async_append(
+            conversation_id,
+            [
+                {"role": "user", "content": user_input.text},
+                {"role": "assistant", "content": speech},
+            ],
+        )
+        if speech:
+            self._utterances.record(speech)
+        
+        return ConversationResult(
+            response=result.response,
+            conversation_id=conversation_id,
+        )
+
+    async def _async_process_live(
+        self,
+        user_input: ConversationInput,
+        conversation_id: str,
+        reply: LiveReply,
+    ) -> ConversationResult | None:
+        """Answer with the reply Gemini Live gave, or return None."""
+        start = time.monotonic()
+        with self._tracer.span("conversation.live") as span:
+            speech = await self._live.async_reply_text(reply)
+            span.set(hit=bool(speech), interrupted=reply.interrupted)
+        self._path_stats["live"].record(time.monotonic() - start, bool(speech))
+        if not speech:
+            return None
+        
+        await self._history.async_append(
+            conversation_id,
+            [
+                {"role": "user", "content": user_input.text},
+                {"role": "assistant", "content": speech},
+            ],
+        )
+        self._async_schedule_summary(conversation_id)
+        
+        intent_response = intent.IntentResponse(language=user_input.language)
+        intent_response.async_set_speech(speech)
+        return ConversationResult(
+            response=intent_response,
+            conversation_id=conversation_id,
+        )
+
+    async def _async_get_llm_api(
+        self, user_input: ConversationInput
+    ) -> llm.APIInstance | None:
+        """Return Home Assistant's Assist API for device control, if enabled."""
+        if not self._options.get(CONF_FUNCTION_CALLING, DEFAULT_FUNCTION_CALLING):
+            return None
+        try:
+            return await llm.async_get_api(
+                self._hass,
+                llm.LLM_API_ASSIST,
+                llm.LLMContext(
+                    platform=DOMAIN,
+                    context=user_input.context,
+                    user_prompt=user_input.text,
+                    language=user_input.language,
+                    assistant=CONVERSATION_DOMAIN,
+                    device_id=user_input.device_id,
+                ),
             )
+        except HomeAssistantError as err:
+            _LOGGER.warning("Device control unavailable: %s", err)
+            return None
+
+    async def _generate_response(
+        self,
+        user_message: str,
+        history: list[dict[str, str]],
+        summary: str = "",
+        api: llm.APIInstance | None = None,
+    ) -> str:
+        """Generate a response using Gemini AI.
 
-    async def _generate_response(self, user_message: str) -> str:
-        """Generate a response using Gemini AI."""
+        With an LLM API, exposed intents are offered as functions. All calls
+        of one model turn run concurrently and their results go back to the
+        model together, for up to TOOL_MAX_ROUNDS rounds.
+        """
         try:
             max_tokens = self._options.get("conversation_max_tokens", 1000)
             temperature = self._options.get("conversation_temperature", 0.7)
-            context_length = self._options.get("conversation_context_length", 10)
-            
-            # Build conversation context
-            messages = []
-            
-            # System message for Home Assistant context
-            system_message = (
-                "You are a helpful AI assistant integrated with Home Assistant. "
-                "You can help users control their smart home devices, answer questions, "
-                "and provide assistance with various tasks. Be conversational, helpful, "
-                "and concise in your responses. If asked about specific Home Assistant "
-                "entities or devices, provide relevant information based on the context."
-            )
-            
-            messages.append(system_message)
-            
-            # Add conversation history (limited by context_length)
-            history_limit = context_length * 2  # Each exchange has user + assistant
-            for msg in self._conversation_history[-history_limit:]:
-                if msg["role"] == "user":
-                    messages.append(f"User: {msg['content']}")
-                else:
-                    messages.append(f"Assistant: {msg['content']}")
-            
-            # Add current user message
-            messages.append(f"User: {user_message}")
-            
-            # Combine into a single prompt
-            prompt = "\n".join(messages)
-            
-            # Ensure we don't exceed context window
-            if len(prompt) > CONTEXT_WINDOW:
-                # Truncate older conversation history
-                prompt = system_message + "\n" + f"User: {user_message}"
+            with self._tracer.span("conversation.prompt") as span:
+                home_state = ""
+                api_prompt = api.api_prompt if api else ""
+                if self._options.get(CONF_STATE_CONTEXT, DEFAULT_STATE_CONTEXT):
+                    # Only the entities that best match this and the previous
+                    # request, so the prompt stays flat as the home grows
+                    query = " ".join(
+                        [
+                            message["content"]
+                            for message in history[-2:]
+                            if message["role"] == "user"
+                        ]
+                        + [user_message]
+                    )
+                    snapshot = self._state_digest.async_snapshot(
+                        query,
+                        int(
+                            self._options.get(
+                                CONF_STATE_CONTEXT_ENTITIES,
+                                DEFAULT_STATE_CONTEXT_ENTITIES,
+                            )
+                        ),
+                    )
+                    span.set(
+                        state_version=snapshot.version,
+                        state_hash=snapshot.digest,
+                        state_entities=snapshot.entities,
+                        state_exposed=snapshot.exposed,
+                    )
+                    home_state = snapshot.text
+                    if snapshot.entities < snapshot.exposed:
+                        home_state += (
+                            f"\n({snapshot.exposed - snapshot.entities} other exposed "
+                            "devices are not listed; they can still be controlled by name.)"
+                        )
+                    if api:
+                        # The digest replaces the API's per-turn entity overview
+                        api_prompt = _DEVICE_CONTROL_PROMPT
+                prompt = self._build_prompt(
+                    user_message, history, summary, api_prompt, home_state
+                )
             
             # Create generation config using the new SDK
             config = types.GenerateContentConfig(
                 max_output_tokens=max_tokens,
                 temperature=temperature,
             )
+            if api and api.tools:
+                config.tools = [
+                    types.Tool(function_declarations=function_declarations(api))
+                ]
+            contents = [types.Content(role="user", parts=[types.Part.from_text(text=prompt)])]
             
-            # Generate response using the new client
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self._client.models.generate_content(
-                    model=self._model_name,
-                    contents=prompt,
-                    config=config,
-                ),
-            )
+            # Generate response using the new client, falling back to another
+            # conversation model if the configured one is slow or failing and
+            # to another API key if one is rate limited
+            for tool_round in range(TOOL_MAX_ROUNDS + 1):
+                if tool_round == TOOL_MAX_ROUNDS and config.tools:
+                    # Out of rounds; make the model answer in words
+                    config.tool_config = types.ToolConfig(
+                        function_calling_config=types.FunctionCallingConfig(mode="NONE")
+                    )
+                response, _ = await self._model_chain.async_call(
+                    lambda attempt: self._keys.async_call(
+                        lambda client: self._async_generate(
+                            client, attempt, contents, config
+                        )
+                    )
+                )
+                if not api or not (calls := response.function_calls):
+                    break
+                contents.append(response.candidates[0].content)
+                contents.append(
+                    types.Content(
+                        role="user",
+                        parts=await async_call_tools(api, calls, self._tracer),
+                    )
+                )
             
-            return response.text.strip()
+            return (response.text or "").strip()
             
         except Exception as err:
             _LOGGER.error("Error generating AI response: %s", err)
             raise
 
-    def clear_conversation_history(self) -> None:
-        """Clear the conversation history."""
-        self._conversation_history.clear()
+    async def _async_generate(
+        self,
+        client: genai.Client,
+        attempt: ModelAttempt,
+        contents: list[types.Content],
+        config: types.GenerateContentConfig,
+    ) -> types.GenerateContentResponse:
+        """Send one request, cancelling it if the model misses its SLO."""
+        with self._tracer.span("conversation.generate", model=attempt.model):
+            async with attempt.timed():
+                return await client.aio.models.generate_content(
+                    model=attempt.model, contents=contents, config=config
+                )
+
+    def _build_prompt(
+        self,
+        user_message: str,
+        history: list[dict[str, str]],
+        summary: str,
+        api_prompt: str = "",
+        home_state: str = "",
+    ) -> str:
+        """Build the prompt from the system message, summary and recent turns."""
+        context_length = int(self._options.get("conversation_context_length", 10))
+        
+        # Build conversation context
+        messages = []
+        
+        # System message for Home Assistant context
+        system_message = (
+            "You are a helpful AI assistant integrated with Home Assistant. "
+            "You can help users control their smart home devices, answer questions, "
+            "and provide assistance with various tasks. Be conversational, helpful, "
+            "and concise in your responses. If asked about specific Home Assistant "
+            "entities or devices, provide relevant information based on the context."
+        )
+        
+        messages.append(system_message)
+        
+        # How to use the exposed devices, when device control is enabled
+        if api_prompt:
+            messages.append(api_prompt)
+        
+        # Current states of the exposed entities
+        state_message = ""
+        if home_state:
+            state_message = f"Current state of the exposed devices:\n{home_state}"
+            messages.append(state_message)
+        
+        # Older turns are represented by their running summary
+        summary_message = ""
+        if summary:
+            summary_message = f"Summary of the earlier conversation: {summary}"
+            messages.append(summary_message)
+        
+        # Add conversation history (limited by context_length)
+        history_limit = context_length * 2  # Each exchange has user + assistant
+        for msg in history[-history_limit:]:
+            if msg["role"] == "user":
+                messages.append(f"User: {msg['content']}")
+            else:
+                messages.append(f"Assistant: {msg['content']}")
+        
+        # Add current user message
+        messages.append(f"User: {user_message}")
+        
+        # Combine into a single prompt
+        prompt = "\n".join(messages)
+        
+        # Ensure we don't exceed context window
+        if len(prompt) > CONTEXT_WINDOW:
+            # Truncate older conversation history, keeping its summary
+            prompt = "\n".join(
+                filter(
+                    None,
+                    (
+                        system_message,
+                        api_prompt,
+                        state_message,
+                        summary_message,
+                        f"User: {user_message}",
+                    ),
+                )
+            )
+        if len(prompt) > CONTEXT_WINDOW:
+            # Still too large; leave the device context out
+            prompt = "\n".join(
+                filter(None, (system_message, summary_message, f"User: {user_message}"))
+            )
+        
+        return prompt
+
+    def _verbatim_message_count(self, history: list[dict[str, str]]) -> int:
+        """Return how many recent messages are kept word for word."""
+        keep = int(self._options.get("conversation_context_length", 10)) * 2
+        while keep > 2 and sum(
+            len(message["content"]) for message in history[-keep:]
+        ) > CONTEXT_WINDOW // 2:
+            keep -= 2
+        return keep
+
+    @callback
+    def _async_schedule_summary(self, conversation_id: str) -> None:
+        """Summarize older turns of a conversation off the request path."""
+        if conversation_id in self._summarizing:
+            return
+        self._summarizing.add(conversation_id)
+        self._hass.async_create_background_task(
+            self._async_summarize(conversation_id),
+            f"{DOMAIN} conversation summary",
+        )
+
+    async def _async_summarize(self, conversation_id: str) -> None:
+        """Fold older turns into the conversation's running summary."""
+        try:
+            history = await self._history.async_get(conversation_id)
+            older = history[:-self._verbatim_message_count(history)]
+            
+            # Batch several exchanges per call unless the history is too large
+            history_size = sum(len(message["content"]) for message in history)
+            if not older or (
+                len(older) < SUMMARY_BATCH_MESSAGES
+                and history_size <= CONTEXT_WINDOW // 2
+            ):
+                return
+                
+            summary = await self._history.async_get_summary(conversation_id)
+            turns = "\n".join(
+                f"{'User' if message['role'] == 'user' else 'Assistant'}: {message['content']}"
+                for message in older
+            )
+            prompt = (
+                "Update the running summary of a conversation between a user and "
+                "a Home Assistant voice assistant. Keep names, devices, rooms, "
+                "preferences and open questions. Reply with the summary only.\n\n"
+                f"Current summary: {summary or '(none)'}\n\n"
+                f"New turns:\n{turns}"
+            )
+            
+            model = self._options.get(CONF_SUMMARY_MODEL, DEFAULT_MODEL_SUMMARY)
+            response = await self._keys.async_call(
+                lambda client: self._hass.async_add_executor_job(
+                    lambda: client.models.generate_content(
+                        model=model,
+                        contents=prompt,
+                        config=types.GenerateContentConfig(
+                            max_output_tokens=SUMMARY_MAX_TOKENS,
+                            temperature=0.2,
+                        ),
+                    )
+                )
+            )
+            
+            await self._history.async_apply_summary(
+                conversation_id, older, response.text.strip()
+            )
+            _LOGGER.debug(
+                "Summarized %d messages of conversation %s", len(older), conversation_id
+            )
+        except Exception as err:
+            _LOGGER.warning("Error summarizing conversation history: %s", err)
+        finally:
+            self._summarizing.discard(conversation_id)
+
+    def clear_conversation_history(self, conversation_id: str | None = None) -> None:
+        """Clear the history of one conversation, or of all conversations."""
+        self._hass.async_create_task(self._history.async_clear(conversation_id))
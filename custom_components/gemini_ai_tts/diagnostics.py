@@ -0,0 +1,33 @@
+"""Diagnostics support for Gemini AI TTS/STT."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_API_KEY,
+    CONF_EXTRA_API_KEYS,
+    CONF_STT_CREDENTIALS_JSON,
+    DATA_KEYS,
+    DATA_TRACER,
+    DOMAIN,
+)
+
+TO_REDACT = {CONF_API_KEY, CONF_EXTRA_API_KEYS, CONF_STT_CREDENTIALS_JSON}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry, including recent latency traces."""
+    tracer = hass.data[DOMAIN][entry.entry_id][DATA_TRACER]
+    return {
+        "data": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": async_redact_data(dict(entry.options), TO_REDACT),
+        "api_keys": hass.data[DOMAIN][entry.entry_id][DATA_KEYS].as_dict(),
+        "tracing": tracer.as_dict(),
+        "traces": tracer.as_list(),
+    }
@@ -0,0 +1,336 @@
+"""Bulk export of announcement packs rendered with Gemini TTS."""
+from __future__ import annotations
+
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util, slugify
+from homeassistant.util.yaml import load_yaml
+from pydub import AudioSegment
+
+from .const import (
+    CONF_EMOTION,
+    CONF_PACE,
+    CONF_STYLE,
+    CONF_VOICE,
+    EMOTIONS,
+    EXPORT_BITRATE,
+    EXPORT_FORMATS,
+    EXPORT_MANIFEST,
+    EXPORT_MANIFEST_SAVE_EVERY,
+    MAX_TEXT_LENGTH,
+    PACE_OPTIONS,
+    VOICES,
+)
+
+if TYPE_CHECKING:
+    from .tts import GeminiTTSEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+ROW_SCHEMA = vol.Schema(
+    {
+        vol.Required("id"): cv.string,
+        vol.Required("message"): vol.All(cv.string, vol.Length(max=MAX_TEXT_LENGTH)),
+        vol.Optional(CONF_VOICE): vol.In(list(VOICES)),
+        vol.Optional(CONF_STYLE): cv.string,
+        vol.Optional(CONF_EMOTION): vol.In(EMOTIONS),
+        vol.Optional(CONF_PACE): vol.In(PACE_OPTIONS),
+    },
+    extra=vol.REMOVE_EXTRA,
+)
+
+_ROW_OPTIONS = (CONF_VOICE, CONF_STYLE, CONF_EMOTION, CONF_PACE)
+
+
+def load_rows(path: str) -> list[dict[str, Any]]:
+    """Read and validate announcement rows from a CSV or YAML file (blocking)."""
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as csv_file:
+            raw_rows: Any = list(csv.DictReader(csv_file))
+    elif path.endswith((".yaml", ".yml")):
+        raw_rows = load_yaml(path)
+    else:
+        raise HomeAssistantError(f"Announcements must be a .csv or .yaml file: {path}")
+
+    if not isinstance(raw_rows, list):
+        raise HomeAssistantError(f"{path} does not contain a list of announcements")
+
+    rows: list[dict[str, Any]] = []
+    files: set[str] = set()
+    for index, raw_row in enumerate(raw_rows, 1):
+        if not isinstance(raw_row, dict):
+            raise HomeAssistantError(f"Row {index} of {path} is not a mapping")
+        # Blank CSV cells fall back to the entity defaults
+        cleaned = {
+            str(key).strip().lower(): value.strip() if isinstance(value, str) else value
+            for key, value in raw_row.items()
+            if key and value not in (None, "")
+        }
+        try:
+            row = ROW_SCHEMA(cleaned)
+        except vol.Invalid as err:
+            raise HomeAssistantError(f"Row {index} of {path} is invalid: {err}") from err
+        if not (name := slugify(row["id"])) or name in files:
+            raise HomeAssistantError(f"Row {index} of {path} has a missing or duplicate id")
+        files.add(name)
+        rows.append(row)
+    return rows
+
+
+def _row_options(row: dict[str, Any]) -> dict[str, Any]:
+    """Return the synthesis options a row sets."""
+    return {key: row[key] for key in _ROW_OPTIONS if key in row}
+
+
+def _fingerprint(synthesis_key: str, audio_format: str) -> str:
+    """Return a digest of everything that determines a row's file."""
+    return hashlib.sha256(
+        "\x1f".join((synthesis_key, audio_format)).encode()
+    ).hexdigest()[:16]
+
+
+def _write_compressed(wav_data: bytes, path: Path, audio_format: str) -> tuple[float, int]:
+    """Compress WAV audio into path atomically and return (seconds, bytes)."""
+    segment = AudioSegment.from_file(io.BytesIO(wav_data), format="wav")
+    partial = path.with_name(f"{path.name}.part")
+    segment.export(
+        partial,
+        format=audio_format,
+        codec=EXPORT_FORMATS[audio_format],
+        bitrate=None if audio_format == "flac" else EXPORT_BITRATE,
+    ).close()
+    os.replace(partial, path)
+    return segment.duration_seconds, path.stat().st_size
+
+
+class AnnouncementExport:
+    """Render announcement rows into compressed files plus a manifest.
+
+    Rows are synthesized by a bounded pool of workers whose request starts are
+    spaced to stay under the requested rate. Files are written atomically and
+    recorded in the manifest with a fingerprint of their inputs, so a rerun
+    after an interruption skips every row that is already up to date.
+
+    With use_batch, all pending rows go to Gemini as Batch API jobs instead,
+    which cost less and leave the interactive quota alone but may take hours.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entity: GeminiTTSEntity,
+        rows: list[dict[str, Any]],
+        output_dir: Path,
+        audio_format: str,
+        workers: int,
+        requests_per_minute: int,
+        use_batch: bool = False,
+    ) -> None:
+        """Initialize the export."""
+        self._hass = hass
+        self._entity = entity
+        self._rows = rows
+        self._output_dir = output_dir
+        self._audio_format = audio_format
+        self._workers = workers
+        self._interval = 60 / requests_per_minute
+        self._use_batch = use_batch
+        self._next_slot = 0.0
+        self._throttle_lock = asyncio.Lock()
+        self._save_lock = asyncio.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._exported = 0
+        self._audio_seconds = 0.0
+        self._errors: dict[str, str] = {}
+        # Resolved now, so entity defaults such as the voice, style and
+        # post-processing are part of every row's fingerprint
+        self._fingerprints = {
+            row["id"]: _fingerprint(
+                entity.synthesis_key(row["message"], _row_options(row)), audio_format
+            )
+            for row in rows
+        }
+
+    @property
+    def _manifest_path(self) -> Path:
+        """Return the manifest location."""
+        return self._output_dir / EXPORT_MANIFEST
+
+    async def async_run(self) -> dict[str, Any]:
+        """Export all rows that are not up to date and return run statistics."""
+        start = time.monotonic()
+        pending = await self._hass.async_add_executor_job(self._prepare)
+        skipped = len(self._rows) - len(pending)
+        _LOGGER.info(
+            "Exporting %d announcements to %s (%d already up to date)",
+            len(pending),
+            self._output_dir,
+            skipped,
+        )
+
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        for row in pending:
+            queue.put_nowait(row)
+        try:
+            if self._use_batch and pending:
+                await self._async_render_batch(pending)
+            else:
+                await asyncio.gather(
+                    *(
+                        self._async_worker(queue)
+                        for _ in range(min(self._workers, len(pending)))
+                    )
+                )
+        finally:
+            # Also runs on cancellation, so a resumed run skips finished rows
+            await self._async_save_manifest()
+
+        elapsed = time.monotonic() - start
+        result = {
+            "output_dir": str(self._output_dir),
+            "manifest": str(self._manifest_path),
+            "rows": len(self._rows),
+            "exported": self._exported,
+            "skipped": skipped,
+            "failed": len(self._errors),
+            "errors": self._errors,
+            "elapsed": round(elapsed, 2),
+            "rows_per_minute": round(self._exported / elapsed * 60, 2) if elapsed else 0,
+            "audio_seconds": round(self._audio_seconds, 2),
+            "realtime_factor": round(self._audio_seconds / elapsed, 2) if elapsed else 0,
+        }
+        _LOGGER.info(
+            "Exported %d announcements in %.1fs (%.1f rows/min, %.1fx real time), "
+            "%d skipped, %d failed",
+            self._exported,
+            elapsed,
+            result["rows_per_minute"],
+            result["realtime_factor"],
+            skipped,
+            len(self._errors),
+        )
+        return result
+
+    def _prepare(self) -> list[dict[str, Any]]:
+        """Load the manifest and return the rows still to render (blocking)."""
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            manifest = json.loads(self._manifest_path.read_text(encoding="utf-8"))
+            self._entries = manifest.get("entries", {})
+        except FileNotFoundError:
+            self._entries = {}
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Ignoring unreadable manifest %s: %s", self._manifest_path, err)
+            self._entries = {}
+
+        pending = []
+        for row in self._rows:
+            entry = self._entries.get(row["id"])
+            if (
+                entry is None
+                or entry.get("fingerprint") != self._fingerprints[row["id"]]
+                or not (self._output_dir / entry["file"]).is_file()
+            ):
+                pending.append(row)
+        return pending
+
+    async def _async_throttle(self) -> None:
+        """Wait for the next request slot."""
+        async with self._throttle_lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _async_worker(self, queue: asyncio.Queue[dict[str, Any]]) -> None:
+        """Render rows from the queue until it is empty."""
+        while not queue.empty():
+            row = queue.get_nowait()
+            await self._async_throttle()
+            try:
+                wav_data = await self._entity.async_synthesize(
+                    row["message"], _row_options(row)
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                self._record_error(row, err)
+                continue
+            await self._async_store(row, wav_data)
+
+    async def _async_render_batch(self, rows: list[dict[str, Any]]) -> None:
+        """Render rows through Gemini Batch API jobs."""
+        # Export audio would evict every cached reply
+        results = await self._entity.async_synthesize_batch(
+            [(row["message"], _row_options(row)) for row in rows],
+            cache=False,
+        )
+        for row, result in zip(rows, results):
+            if isinstance(result, str):
+                self._record_error(row, HomeAssistantError(result))
+            else:
+                await self._async_store(row, result)
+
+    def _record_error(self, row: dict[str, Any], err: Exception) -> None:
+        """Remember why a row could not be exported."""
+        _LOGGER.warning("Failed to export announcement %s: %s", row["id"], err)
+        self._errors[row["id"]] = str(err) or type(err).__name__
+
+    async def _async_store(self, row: dict[str, Any], wav_data: bytes) -> None:
+        """Compress a row's audio into its file and add it to the manifest."""
+        file_name = f"{slugify(row['id'])}.{self._audio_format}"
+        try:
+            duration, size = await self._hass.async_add_executor_job(
+                _write_compressed,
+                wav_data,
+                self._output_dir / file_name,
+                self._audio_format,
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            self._record_error(row, err)
+            return
+
+        self._entries[row["id"]] = {
+            "file": file_name,
+            "fingerprint": self._fingerprints[row["id"]],
+            **{key: row[key] for key in ("message", *_ROW_OPTIONS) if key in row},
+            "duration": round(duration, 3),
+            "bytes": size,
+        }
+        self._exported += 1
+        self._audio_seconds += duration
+        if self._exported % EXPORT_MANIFEST_SAVE_EVERY == 0:
+            await self._async_save_manifest()
+
+    async def _async_save_manifest(self) -> None:
+        """Write the manifest atomically."""
+        data = json.dumps(
+            {
+                "version": 1,
+                "audio_format": self._audio_format,
+                "updated": dt_util.utcnow().isoformat(),
+                "entries": self._entries,
+            },
+            indent=2,
+            ensure_ascii=False,
+        )
+        async with self._save_lock:
+            await self._hass.async_add_executor_job(self._write_manifest, data)
+
+    def _write_manifest(self, data: str) -> None:
+        """Write manifest data through a temporary file (blocking)."""
+        partial = self._manifest_path.with_name(f"{EXPORT_MANIFEST}.part")
+        partial.write_text(data, encoding="utf-8")
+        os.replace(partial, self._manifest_path)
@@ -0,0 +1,247 @@
+"""Model fallback chain with per-model circuit breakers."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from google.genai import errors
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import API_TIMEOUT, BREAKER_COOLDOWN, BREAKER_FAILURE_THRESHOLD
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class CircuitBreaker:
+    """Track failures of one model and stop sending it traffic while unhealthy.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive timeouts or server errors the
+    breaker opens for BREAKER_COOLDOWN seconds. Afterwards a single trial
+    request is let through; success closes the breaker again.
+    """
+
+    failures: int = 0
+    opened_at: float | None = None
+    trial_in_flight: bool = False
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < BREAKER_COOLDOWN:
+            return "open"
+        return "half_open"
+
+    @property
+    def available(self) -> bool:
+        """Return whether a request could be let through right now."""
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self.trial_in_flight)
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent to the model now."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """End a request that said nothing about the model's health."""
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure and open the breaker past the threshold."""
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= BREAKER_FAILURE_THRESHOLD:
+            self.opened_at = time.monotonic()
+
+
+@dataclass
+class ModelStats:
+    """Request counters for one model in a fallback chain."""
+
+    requests: int = 0
+    failures: int = 0
+    slow: int = 0
+    last_latency: float | None = None
+
+
+@dataclass
+class ModelAttempt:
+    """One model's try at a request sent through a fallback chain."""
+
+    model: str
+    timeout: float
+    latency: float | None = None
+
+    @asynccontextmanager
+    async def timed(self) -> AsyncIterator[None]:
+        """Time the model request and cut it off at the attempt's timeout.
+
+        Requests enter this once they hold an API key, so waiting for a rate
+        limited key neither counts against the SLO nor abandons the model.
+        """
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(self.timeout):
+                yield
+        finally:
+            self.latency = time.monotonic() - start
+
+
+def _is_model_failure(err: Exception) -> bool:
+    """Return whether an error says the model itself is slow or unhealthy."""
+    return isinstance(err, (TimeoutError, errors.ServerError))
+
+
+def _is_request_failure(err: Exception) -> bool:
+    """Return whether an error would recur with any other model.
+
+    Rejected requests (4xx other than an unknown model) and API keys that
+    are all rate limited are not the model's fault, and trying the next
+    model would only wait on the same keys.
+    """
+    if isinstance(err, errors.ClientError):
+        return err.code != 404
+    return isinstance(err, HomeAssistantError)
+
+
+class ModelFallbackChain:
+    """Send requests to the first healthy model of an ordered list.
+
+    Every model but the last gets the latency SLO as its timeout, so a slow
+    or failing primary hands the request to the next model. Only timeouts
+    and server errors count against a model's circuit breaker; models whose
+    breaker is open are skipped until their cooldown has passed.
+    """
+
+    def __init__(self, name: str, models: list[str], slo: float) -> None:
+        """Initialize the chain."""
+        self._name = name
+        self._models = models
+        self._slo = slo
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._stats: dict[str, ModelStats] = {}
+        self._fallbacks = 0
+        self._active_model = models[0]
+
+    def configure(self, models: list[str], slo: float) -> None:
+        """Update the models and SLO, keeping breaker state and statistics."""
+        self._models = models
+        self._slo = slo
+
+    async def async_call(
+        self, request: Callable[[ModelAttempt], Awaitable[_T]]
+    ) -> tuple[_T, str]:
+        """Run request(attempt) against the chain.
+
+        Returns the first success and the model that produced it. The request
+        must send its model call inside attempt.timed(), which applies the
+        SLO from then on.
+        """
+        candidates = [
+            model
+            for model in self._models
+            if self._breakers.setdefault(model, CircuitBreaker()).available
+        ]
+        forced = not candidates
+        if forced:
+            # Everything is tripped; the primary is still the best bet
+            candidates = self._models[:1]
+
+        last_error: Exception | None = None
+        for index, model in enumerate(candidates):
+            is_last = index == len(candidates) - 1
+            breaker = self._breakers[model]
+            if not breaker.allow_request() and not forced:
+                continue
+            stats = self._stats.setdefault(model, ModelStats())
+            stats.requests += 1
+            attempt = ModelAttempt(model, API_TIMEOUT if is_last else self._slo)
+            try:
+                result = await request(attempt)
+            except asyncio.CancelledError:
+                breaker.release_trial()
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                stats.failures += 1
+                if _is_model_failure(err):
+                    breaker.record_failure()
+                else:
+                    breaker.release_trial()
+                    if _is_request_failure(err):
+                        raise
+                last_error = err
+                if not is_last:
+                    _LOGGER.warning(
+                        "%s model %s failed or exceeded %.1fs SLO (%s), falling back",
+                        self._name,
+                        model,
+                        self._slo,
+                        str(err) or type(err).__name__,
+                    )
+                continue
+
+            stats.last_latency = attempt.latency
+            if attempt.latency is not None and attempt.latency > self._slo:
+                stats.slow += 1
+            breaker.record_success()
+
+            if model != self._active_model:
+                _LOGGER.info("%s now served by model %s", self._name, model)
+                self._active_model = model
+            if model != self._models[0]:
+                self._fallbacks += 1
+            return result, model
+
+        if last_error is None:
+            raise RuntimeError(f"No {self._name} model available")
+        raise last_error
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return chain metrics for state attributes."""
+        return {
+            "active_model": self._active_model,
+            "fallbacks": self._fallbacks,
+            "latency_slo": self._slo,
+            "models": {
+                model: {
+                    "breaker": self._breakers.get(model, CircuitBreaker()).state,
+                    "requests": stats.requests,
+                    "failures": stats.failures,
+                    "slow": stats.slow,
+                    "last_latency": (
+                        round(stats.last_latency, 3)
+                        if stats.last_latency is not None
+                        else None
+                    ),
+                }
+                for model, stats in self._stats.items()
+            },
+        }
+
+
+def fallback_models(primary: str, models: dict[str, str], enabled: bool) -> list[str]:
+    """Return the primary model followed by the other models of its category."""
+    if not enabled:
+        return [primary]
+    return [primary, *(model for model in models if model != primary)]
@@ -0,0 +1,318 @@
+"""Vectorized FLAC encoder for 16-bit PCM speech uploads."""
+from __future__ import annotations
+
+import struct
+
+import numpy as np
+
+from .const import FLAC_BLOCK_SIZE, FLAC_MAX_PARTITION_ORDER
+
+# Rice parameter 15 is the escape code, so 14 is the largest usable one
+_MAX_RICE_PARAMETER = 14
+_MAX_FIXED_ORDER = 4
+
+# Frame header codes; other block sizes follow the header, other sample
+# rates are read from STREAMINFO
+_BLOCK_SIZE_CODES = {256 << shift: 8 + shift for shift in range(8)}
+_SAMPLE_RATE_CODES = {
+    8000: 0b0100,
+    16000: 0b0101,
+    22050: 0b0110,
+    24000: 0b0111,
+    44100: 0b1001,
+    48000: 0b1010,
+}
+
+
+def _crc_table(polynomial: int, width: int) -> np.ndarray:
+    """Return the byte-wise lookup table of a non-reflected CRC."""
+    top = 1 << (width - 1)
+    mask = (1 << width) - 1
+    table = []
+    for byte in range(256):
+        crc = byte << (width - 8)
+        for _ in range(8):
+            crc = ((crc << 1) ^ polynomial if crc & top else crc << 1) & mask
+        table.append(crc)
+    return np.array(table, dtype=np.uint32)
+
+
+_CRC8 = _crc_table(0x07, 8)
+_CRC16 = _crc_table(0x8005, 16)
+# CRC-16 of every two-byte word, to advance the CRC a word at a time
+_WORDS = np.arange(1 << 16, dtype=np.uint32)
+_CRC16_WORDS = ((_CRC16[_WORDS >> 8] << 8) & 0xFFFF) ^ _CRC16[
+    (_CRC16[_WORDS >> 8] >> 8) ^ (_WORDS & 0xFF)
+]
+
+
+def encode_flac(pcm: bytes, sample_rate: int, channels: int) -> bytes:
+    """Losslessly compress interleaved 16-bit PCM to a FLAC stream.
+
+    Each block is coded with the fixed polynomial predictor of order 0-4 that
+    leaves the smallest residual, and the residual is Rice coded with the
+    partition order and parameters of fewest bits. Predictor and parameter
+    search, bit packing and CRCs run on NumPy arrays for all blocks at once;
+    meant to be called in the executor.
+    """
+    frame_size = 2 * channels
+    samples = np.frombuffer(
+        pcm[: len(pcm) // frame_size * frame_size], dtype="<i2"
+    ).reshape(-1, channels)
+    count = samples.shape[0]
+    if not count:
+        raise ValueError("No audio to encode")
+
+    # One row per block and channel, in frame order; the last block may be shorter
+    full = count // FLAC_BLOCK_SIZE * FLAC_BLOCK_SIZE
+    groups = []
+    if full:
+        groups.append(
+            samples[:full]
+            .reshape(-1, FLAC_BLOCK_SIZE, channels)
+            .transpose(0, 2, 1)
+            .reshape(-1, FLAC_BLOCK_SIZE)
+        )
+    if count > full:
+        groups.append(samples[full:].T)
+
+    values: list[np.ndarray] = []
+    lengths: list[np.ndarray] = []
+    frame_ends: list[int] = []
+    position = 0
+    for rows in groups:
+        subframes = _encode_subframes(rows.astype(np.int32))
+        for start in range(0, len(subframes), channels):
+            header = _frame_header(len(frame_ends), rows.shape[1], sample_rate, channels)
+            frame_values = [np.frombuffer(header, dtype=np.uint8).astype(np.uint32)]
+            frame_lengths = [np.full(len(header), 8, dtype=np.int32)]
+            for subframe_values, subframe_lengths in subframes[start:start + channels]:
+                frame_values.append(subframe_values)
+                frame_lengths.append(subframe_lengths)
+
+            # Pad to a byte boundary and leave room for the CRC-16
+            bits = sum(int(part.sum(dtype=np.int64)) for part in frame_lengths)
+            frame_values.append(np.zeros(2, dtype=np.uint32))
+            frame_lengths.append(np.array([-bits % 8, 16], dtype=np.int32))
+            position += (bits + -bits % 8) // 8 + 2
+            frame_ends.append(position)
+            values.extend(frame_values)
+            lengths.extend(frame_lengths)
+
+    frames = _pack_bits(np.concatenate(values), np.concatenate(lengths))
+    _write_frame_crcs(frames, np.array(frame_ends))
+    return _stream_header(sample_rate, channels, count) + frames.tobytes()
+
+
+def _encode_subframes(rows: np.ndarray) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Return the bit fields (values, lengths) of a subframe for each row."""
+    block_count, size = rows.shape
+
+    # Keep the fixed predictor residual with the smallest magnitude
+    max_order = min(_MAX_FIXED_ORDER, size - 1)
+    residual = rows.copy()
+    orders = np.zeros(block_count, dtype=np.int64)
+    best = np.abs(rows[:, max_order:]).sum(axis=1, dtype=np.int64)
+    for order in range(1, max_order + 1):
+        candidate = np.zeros_like(rows)
+        candidate[:, order:] = np.diff(rows, n=order, axis=1)
+        cost = np.abs(candidate[:, max_order:]).sum(axis=1, dtype=np.int64)
+        better = cost < best
+        residual[better] = candidate[better]
+        orders[better] = order
+        best = np.minimum(best, cost)
+    folded = np.where(residual >= 0, residual * 2, -residual * 2 - 1)
+
+    # Finest partitioning allowed: equal partitions longer than the warm-up
+    finest = 0
+    while (
+        finest < FLAC_MAX_PARTITION_ORDER
+        and size % (2 << finest) == 0
+        and size >> (finest + 1) > _MAX_FIXED_ORDER
+    ):
+        finest += 1
+    counts = np.full((block_count, 1 << finest), size >> finest, dtype=np.int64)
+    counts[:, 0] -= orders
+    # Warm-up samples carry no residual
+    folded[np.arange(size) < orders[:, np.newaxis]] = 0
+    parameters = np.arange(_MAX_RICE_PARAMETER + 1)
+    quotients = np.stack(
+        [
+            (folded >> parameter)
+            .reshape(block_count, 1 << finest, -1)
+            .sum(axis=2, dtype=np.int64)
+            for parameter in parameters
+        ]
+    )
+
+    # Price every partition order by merging the finest partitions pairwise
+    totals = []
+    choices = []
+    for partition_order in range(finest + 1):
+        merged = 1 << (finest - partition_order)
+        bits = quotients.reshape(len(parameters), block_count, -1, merged).sum(
+            axis=3
+        ) + counts.reshape(block_count, -1, merged).sum(axis=2) * (
+            parameters[:, np.newaxis, np.newaxis] + 1
+        )
+        choices.append(bits.argmin(axis=0))
+        totals.append(bits.min(axis=0).sum(axis=1) + 4 * (1 << partition_order))
+    partition_orders = np.argmin(totals, axis=0)
+
+    subframes = []
+    for row in range(block_count):
+        samples = rows[row]
+        order = int(orders[row])
+        partition_order = int(partition_orders[row])
+        if (samples == samples[0]).all():
+            subframes.append(_constant_subframe(samples))
+        elif 6 + 16 * order + totals[partition_order][row] < 16 * size:
+            subframes.append(
+                _fixed_subframe(
+                    samples,
+                    order,
+                    folded[row],
+                    partition_order,
+                    choices[partition_order][row],
+                )
+            )
+        else:
+            subframes.append(_verbatim_subframe(samples))
+    return subframes
+
+
+def _constant_subframe(samples: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return a subframe holding one repeated sample."""
+    return (
+        np.array([0b000000 << 1, samples[0] & 0xFFFF], dtype=np.uint32),
+        np.array([8, 16], dtype=np.int32),
+    )
+
+
+def _verbatim_subframe(samples: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return a subframe of uncompressed samples, for noise that does not compress."""
+    return (
+        np.concatenate(([0b000001 << 1], samples & 0xFFFF)).astype(np.uint32),
+        np.concatenate(([8], np.full(samples.size, 16))).astype(np.int32),
+    )
+
+
+def _fixed_subframe(
+    samples: np.ndarray,
+    order: int,
+    folded: np.ndarray,
+    partition_order: int,
+    parameters: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return a fixed predictor subframe with a Rice coded residual."""
+    partition_size = samples.size >> partition_order
+    parameter = np.repeat(parameters, partition_size)[order:].astype(np.uint32)
+    residual = folded[order:].astype(np.uint32)
+
+    # Rice code: quotient in unary (zeros then a one), remainder in binary
+    values = (1 << parameter) | (residual & ((1 << parameter) - 1))
+    lengths = (residual >> parameter) + 1 + parameter
+
+    # Each partition starts with its parameter
+    starts = np.arange(1 << partition_order) * partition_size - order
+    starts[0] = 0
+    values = np.insert(values, starts, parameters)
+    lengths = np.insert(lengths, starts, 4)
+
+    return (
+        np.concatenate(
+            (
+                [(0b001000 | order) << 1],
+                samples[:order] & 0xFFFF,
+                [partition_order],
+                values,
+            )
+        ).astype(np.uint32),
+        np.concatenate(([8], np.full(order, 16), [6], lengths)).astype(np.int32),
+    )
+
+
+def _frame_header(number: int, size: int, sample_rate: int, channels: int) -> bytes:
+    """Return a frame header with its CRC-8."""
+    size_code = _BLOCK_SIZE_CODES.get(size, 0b0111)
+    header = bytes(
+        (
+            0xFF,
+            0xF8,
+            size_code << 4 | _SAMPLE_RATE_CODES.get(sample_rate, 0),
+            # Independent channels, 16 bits per sample
+            (channels - 1) << 4 | 0b100 << 1,
+        )
+    ) + _coded_number(number)
+    if size_code == 0b0111:
+        header += struct.pack(">H", size - 1)
+    crc = 0
+    for byte in header:
+        crc = int(_CRC8[crc ^ byte])
+    return header + bytes((crc,))
+
+
+def _coded_number(number: int) -> bytes:
+    """Return a frame number in FLAC's UTF-8 like coding."""
+    if number < 0x80:
+        return bytes((number,))
+    count = 2
+    while number >= 1 << (5 * count + 1):
+        count += 1
+    tail = [0x80 | (number >> 6 * index) & 0x3F for index in reversed(range(count - 1))]
+    return bytes(((0xFF00 >> count) & 0xFF | number >> 6 * (count - 1), *tail))
+
+
+def _pack_bits(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Pack fields, each its value right-aligned in its length, into bytes.
+
+    A value has at most 16 bits, so it lands in the 32-bit word holding the
+    field's last bit and the word before. Fields never share bits, so each
+    word is the sum of the parts that land in it.
+    """
+    last = np.cumsum(lengths, dtype=np.int64) - 1
+    words = last // 32
+    shift = (31 - last % 32).astype(np.uint64)
+    values = values.astype(np.uint64)
+    packed = np.bincount(
+        words, weights=(values << shift) & 0xFFFFFFFF, minlength=int(words[-1]) + 1
+    )
+    packed += np.bincount(
+        np.maximum(words - 1, 0), weights=values >> (32 - shift), minlength=packed.size
+    )
+    return np.frombuffer(packed.astype(">u4").tobytes(), dtype=np.uint8)[
+        : (int(last[-1]) + 1) // 8
+    ].copy()
+
+
+def _write_frame_crcs(frames: np.ndarray, ends: np.ndarray) -> None:
+    """Fill in the CRC-16 closing every frame, for all frames at once."""
+    starts = np.concatenate(([0], ends[:-1]))
+    sizes = ends - 2 - starts
+
+    # Right-align the frames in rows of whole words; leading zero bytes
+    # do not change a CRC that starts at zero
+    width = int(sizes.max()) + int(sizes.max()) % 2
+    columns = np.arange(width) - (width - sizes)[:, np.newaxis]
+    inside = columns >= 0
+    data = np.zeros((len(ends), width), dtype=np.uint32)
+    data[inside] = frames[(starts[:, np.newaxis] + columns)[inside]]
+
+    crc = np.zeros(len(ends), dtype=np.uint32)
+    for column in range(0, width, 2):
+        crc = _CRC16_WORDS[crc ^ (data[:, column] << 8 | data[:, column + 1])]
+    frames[ends - 2] = crc >> 8
+    frames[ends - 1] = crc & 0xFF
+
+
+def _stream_header(sample_rate: int, channels: int, count: int) -> bytes:
+    """Return the stream marker and its STREAMINFO block."""
+    block_size = max(16, min(count, FLAC_BLOCK_SIZE))
+    info = (
+        struct.pack(">HH", block_size, block_size)
+        # Frame sizes and MD5 signature are left unknown
+        + bytes(6)
+        + (sample_rate << 44 | (channels - 1) << 41 | 15 << 36 | count).to_bytes(8, "big")
+        + bytes(16)
+    )
+    return b"fLaC" + bytes((0x80,)) + len(info).to_bytes(3, "big") + info
@@ -0,0 +1,121 @@
+"""Persistent conversation history for the Gemini AI conversation agent."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    HISTORY_MAX_AGE,
+    HISTORY_MAX_MESSAGES,
+    HISTORY_MAX_SESSIONS,
+    HISTORY_SAVE_DELAY,
+    HISTORY_STORAGE_VERSION,
+)
+
+
+def history_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the storage backing the history of a config entry."""
+    return Store(hass, HISTORY_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.history")
+
+
+class ConversationHistory:
+    """Conversation history per conversation_id, persisted across restarts.
+
+    The history is read from disk the first time a conversation needs it.
+    Writes are coalesced with a delayed save, and every save drops expired
+    sessions and caps the number of sessions and messages per session.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the history."""
+        self._store = history_store(hass, entry_id)
+        self._sessions: dict[str, dict[str, Any]] | None = None
+        self._load_lock = asyncio.Lock()
+
+    async def _async_load(self) -> dict[str, dict[str, Any]]:
+        """Load sessions from disk once."""
+        async with self._load_lock:
+            if self._sessions is None:
+                data = await self._store.async_load()
+                self._sessions = (data or {}).get("sessions", {})
+        return self._sessions
+
+    async def async_get(self, conversation_id: str) -> list[dict[str, str]]:
+        """Return the messages of a conversation, oldest first."""
+        sessions = await self._async_load()
+        if session := sessions.get(conversation_id):
+            return list(session["messages"])
+        return []
+
+    async def async_get_summary(self, conversation_id: str) -> str:
+        """Return the running summary of turns no longer kept verbatim."""
+        sessions = await self._async_load()
+        if session := sessions.get(conversation_id):
+            return session.get("summary", "")
+        return ""
+
+    async def async_apply_summary(
+        self,
+        conversation_id: str,
+        summarized: list[dict[str, str]],
+        summary: str,
+    ) -> None:
+        """Replace summarized messages with the new running summary."""
+        sessions = await self._async_load()
+        if not (session := sessions.get(conversation_id)):
+            return
+        # Messages may have been appended or capped while the summary was made
+        summarized_ids = {id(message) for message in summarized}
+        session["messages"] = [
+            message
+            for message in session["messages"]
+            if id(message) not in summarized_ids
+        ]
+        session["summary"] = summary
+        self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+    async def async_append(
+        self, conversation_id: str, messages: list[dict[str, str]]
+    ) -> None:
+        """Append messages to a conversation and schedule a save."""
+        sessions = await self._async_load()
+        session = sessions.setdefault(conversation_id, {"messages": []})
+        session["messages"].extend(messages)
+        del session["messages"][:-HISTORY_MAX_MESSAGES]
+        session["updated"] = time.time()
+        self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+    async def async_clear(self, conversation_id: str | None = None) -> None:
+        """Forget one conversation, or all of them."""
+        if conversation_id is None:
+            self._sessions = {}
+        else:
+            (await self._async_load()).pop(conversation_id, None)
+        self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Write pending changes now, e.g. before the entity is torn down."""
+        if self._sessions is not None:
+            await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Compact the sessions and return the data to write."""
+        sessions = self._sessions or {}
+        cutoff = time.time() - HISTORY_MAX_AGE
+        recent = sorted(
+            (
+                (conversation_id, session)
+                for conversation_id, session in sessions.items()
+                if session.get("updated", 0) >= cutoff
+            ),
+            key=lambda item: item[1].get("updated", 0),
+            reverse=True,
+        )
+        self._sessions = dict(recent[:HISTORY_MAX_SESSIONS])
+        return {"sessions": self._sessions}
@@ -0,0 +1,87 @@
+"""Local intent fast path for the Gemini conversation agent."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components import conversation
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import intent
+
+_LOGGER = logging.getLogger(__name__)
+
+# Local answers that mean "not understood" rather than "handled"
+_FALL_THROUGH_ERRORS = {
+    intent.IntentResponseErrorCode.NO_INTENT_MATCH,
+    intent.IntentResponseErrorCode.NO_VALID_TARGETS,
+}
+
+
+@dataclass
+class PathStats:
+    """Hit rate and latency of one way of answering a conversation turn."""
+
+    requests: int = 0
+    hits: int = 0
+    total_latency: float = 0.0
+    last_latency: float | None = None
+
+    def record(self, elapsed: float, hit: bool) -> None:
+        """Record one attempt."""
+        self.requests += 1
+        self.hits += hit
+        self.total_latency += elapsed
+        self.last_latency = elapsed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for state attributes."""
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.requests, 3) if self.requests else None,
+            "average_latency_ms": (
+                round(self.total_latency / self.requests * 1000, 1)
+                if self.requests
+                else None
+            ),
+            "last_latency_ms": (
+                round(self.last_latency * 1000, 1)
+                if self.last_latency is not None
+                else None
+            ),
+        }
+
+
+async def async_match_local_intent(
+    hass: HomeAssistant,
+    user_input: conversation.ConversationInput,
+    conversation_id: str,
+) -> conversation.ConversationResult | None:
+    """Handle a turn with Home Assistant's built-in sentence matcher.
+
+    Returns None when the sentence did not match a local intent, or matched
+    one without a valid target, so the turn should go to Gemini instead.
+    """
+    try:
+        result = await conversation.async_converse(
+            hass,
+            user_input.text,
+            conversation_id,
+            user_input.context,
+            user_input.language,
+            agent_id=conversation.HOME_ASSISTANT_AGENT,
+            # The satellite's area resolves commands like "turn on the lights"
+            device_id=user_input.device_id,
+        )
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Local intent matching failed: %s", err)
+        return None
+
+    response = result.response
+    if (
+        response.response_type == intent.IntentResponseType.ERROR
+        and response.error_code in _FALL_THROUGH_ERRORS
+    ):
+        return None
+    return result
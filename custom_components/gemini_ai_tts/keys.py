@@ -0,0 +1,282 @@
+"""Pool of Gemini API keys with least-loaded dispatch."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from google import genai
+from google.genai import errors
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import (
+    CONF_EXTRA_API_KEYS,
+    CONF_KEY_REQUESTS_PER_MINUTE,
+    DEFAULT_EXTRA_API_KEYS,
+    DEFAULT_KEY_REQUESTS_PER_MINUTE,
+    KEY_COOLDOWN_MAX,
+    KEY_COOLDOWN_MIN,
+    KEY_MAX_WAIT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+_RETRY_DELAY = re.compile(r"^(\d+(?:\.\d+)?)s$")
+
+
+def parse_api_keys(text: str) -> list[str]:
+    """Return the API keys in text separated by commas, spaces or newlines."""
+    return [key for key in re.split(r"[\s,]+", text) if key]
+
+
+def _retry_delay(err: errors.APIError) -> float | None:
+    """Return the retry delay a rate limit error asks for, if any."""
+    if not isinstance(err.details, dict):
+        return None
+    for detail in err.details.get("error", {}).get("details", []):
+        if isinstance(detail, dict) and detail.get("@type", "").endswith("RetryInfo"):
+            if match := _RETRY_DELAY.match(str(detail.get("retryDelay", ""))):
+                return float(match.group(1))
+    return None
+
+
+@dataclass
+class TokenBucket:
+    """Client-side request budget of one key; a rate of zero is unlimited."""
+
+    per_minute: float
+    tokens: float = 0.0
+    updated: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Start with a full minute of budget."""
+        self.tokens = self.per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last update."""
+        self.tokens = min(
+            self.per_minute, self.tokens + (now - self.updated) * self.per_minute / 60
+        )
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Return the seconds until a token is available."""
+        if not self.per_minute:
+            return 0.0
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) * 60 / self.per_minute)
+
+    def take(self) -> None:
+        """Spend one token."""
+        if self.per_minute:
+            self.tokens -= 1
+
+    def drain(self) -> None:
+        """Spend the remaining budget after the server reported a rate limit."""
+        if self.per_minute:
+            self.tokens = min(self.tokens, 0.0)
+
+
+@dataclass
+class KeyStats:
+    """Request counters for one API key."""
+
+    requests: int = 0
+    failures: int = 0
+    rate_limited: int = 0
+    last_latency: float | None = None
+
+
+class ApiKey:
+    """One API key with its client, budget and cooldown."""
+
+    def __init__(self, key: str, per_minute: float) -> None:
+        """Initialize the key."""
+        self.key = key
+        self.label = f"...{key[-4:]}"
+        self.bucket = TokenBucket(per_minute)
+        self.stats = KeyStats()
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self.strikes = 0
+        self.client_ready: asyncio.Future[genai.Client] | None = None
+
+    def available_in(self, now: float) -> float:
+        """Return the seconds until the key may be used again."""
+        return max(self.cooldown_until - now, self.bucket.wait_time(now))
+
+
+class ApiKeyPool:
+    """Spread Gemini requests over several API keys.
+
+    Each request goes to the healthy key with the fewest requests in flight.
+    Keys are optionally held to a requests-per-minute budget. A rate limit
+    response (429) drains the key's budget and cools it down for the
+    server's retry delay, or for a cooldown that doubles with every
+    consecutive 429, and the request is retried on the next key. Keys from
+    separate projects have separate quotas, so throughput grows with them.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, api_key: str, options: dict[str, Any]
+    ) -> None:
+        """Initialize the pool."""
+        self._hass = hass
+        self._api_key = api_key
+        self._keys: list[ApiKey] = []
+        self.configure(options)
+
+    @callback
+    def configure(self, options: dict[str, Any]) -> None:
+        """Apply the key list and budget, keeping clients and state of kept keys."""
+        per_minute = float(
+            options.get(CONF_KEY_REQUESTS_PER_MINUTE, DEFAULT_KEY_REQUESTS_PER_MINUTE)
+        )
+        current = {key.key: key for key in self._keys}
+        self._keys = []
+        extra_keys = parse_api_keys(
+            options.get(CONF_EXTRA_API_KEYS, DEFAULT_EXTRA_API_KEYS)
+        )
+        for key in dict.fromkeys([self._api_key, *extra_keys]):
+            api_key = current.get(key) or ApiKey(key, per_minute)
+            if api_key.bucket.per_minute != per_minute:
+                api_key.bucket = TokenBucket(per_minute)
+            self._keys.append(api_key)
+
+    @callback
+    def async_start(self) -> None:
+        """Start creating the clients of every key in the executor."""
+        for key in self._keys:
+            self._async_start_client_setup(key)
+
+    def _async_start_client_setup(self, key: ApiKey) -> asyncio.Future[genai.Client]:
+        """Create the client of a key in the executor and return its readiness future."""
+        if key.client_ready is None:
+            key.client_ready = self._hass.async_add_executor_job(
+                lambda: genai.Client(api_key=key.key)
+            )
+        return key.client_ready
+
+    async def _async_get_client(self, key: ApiKey) -> genai.Client:
+        """Return the client of a key, waiting until it is ready."""
+        ready = self._async_start_client_setup(key)
+        try:
+            return await asyncio.shield(ready)
+        except Exception:
+            # Let the next request retry client creation
+            if key.client_ready is ready:
+                key.client_ready = None
+            raise
+
+    def _least_loaded(self) -> ApiKey:
+        """Return the key with the least work, preferring keys not cooling down."""
+        now = time.monotonic()
+        return min(
+            self._keys,
+            key=lambda key: (key.cooldown_until > now, key.in_flight, key.stats.requests),
+        )
+
+    def least_loaded(self) -> str:
+        """Return the key a long-lived connection should use."""
+        return self._least_loaded().key
+
+    async def async_client(self) -> genai.Client:
+        """Return the client of the least-loaded key, e.g. for batch jobs."""
+        return await self._async_get_client(self._least_loaded())
+
+    async def async_call(self, request: Callable[[genai.Client], Awaitable[_T]]) -> _T:
+        """Run request(client) on the least-loaded key, moving on after a 429."""
+        tried: set[str] = set()
+        rate_limit: errors.ClientError | None = None
+        while True:
+            try:
+                key = await self._async_acquire(tried)
+            except HomeAssistantError:
+                if rate_limit is not None:
+                    raise rate_limit from None
+                raise
+            tried.add(key.key)
+            key.in_flight += 1
+            key.stats.requests += 1
+            start = time.monotonic()
+            try:
+                result = await request(await self._async_get_client(key))
+            except errors.ClientError as err:
+                if err.code != 429:
+                    key.stats.failures += 1
+                    raise
+                self._cool_down(key, err)
+                rate_limit = err
+                continue
+            except Exception:
+                key.stats.failures += 1
+                raise
+            finally:
+                key.in_flight -= 1
+
+            key.strikes = 0
+            key.stats.last_latency = time.monotonic() - start
+            return result
+
+    async def _async_acquire(self, tried: set[str]) -> ApiKey:
+        """Wait for the least-loaded key that is not cooling down and has budget."""
+        while True:
+            now = time.monotonic()
+            candidates = [key for key in self._keys if key.key not in tried]
+            if not candidates:
+                raise HomeAssistantError("No Gemini API key left to try")
+            if ready := [key for key in candidates if key.available_in(now) == 0]:
+                key = min(
+                    ready,
+                    key=lambda key: (key.in_flight, -key.bucket.tokens, key.stats.requests),
+                )
+                key.bucket.take()
+                return key
+
+            delay = min(key.available_in(now) for key in candidates)
+            if delay > KEY_MAX_WAIT:
+                raise HomeAssistantError(
+                    f"All Gemini API keys are rate limited for another {delay:.0f}s"
+                )
+            await asyncio.sleep(delay)
+
+    def _cool_down(self, key: ApiKey, err: errors.APIError) -> None:
+        """Rest a key that hit a rate limit."""
+        cooldown = _retry_delay(err)
+        if cooldown is None:
+            cooldown = min(KEY_COOLDOWN_MIN * 2**key.strikes, KEY_COOLDOWN_MAX)
+        key.strikes += 1
+        key.stats.rate_limited += 1
+        key.cooldown_until = time.monotonic() + cooldown
+        key.bucket.drain()
+        _LOGGER.warning(
+            "Gemini API key %s is rate limited, resting it for %.0fs", key.label, cooldown
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return per-key metrics for state attributes and diagnostics."""
+        now = time.monotonic()
+        return {
+            key.label: {
+                "requests": key.stats.requests,
+                "in_flight": key.in_flight,
+                "failures": key.stats.failures,
+                "rate_limited": key.stats.rate_limited,
+                "cooldown": round(max(0.0, key.cooldown_until - now), 1),
+                "budget": round(key.bucket.tokens, 1) if key.bucket.per_minute else None,
+                "last_latency": (
+                    round(key.stats.last_latency, 3)
+                    if key.stats.last_latency is not None
+                    else None
+                ),
+            }
+            for key in self._keys
+        }
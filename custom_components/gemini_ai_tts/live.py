@@ -0,0 +1,443 @@
+"""Gemini Live sessions that answer a whole voice turn in one exchange."""
+from __future__ import annotations
+
+import asyncio
+import base64
+import contextlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import aiohttp
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    CONF_LIVE_MODE,
+    CONF_LIVE_MODEL,
+    CONF_LIVE_URL,
+    CONF_VOICE,
+    DEFAULT_LIVE_MODE,
+    DEFAULT_MODEL_LIVE,
+    DEFAULT_VOICE,
+    DOMAIN,
+    LIVE_CONNECT_TIMEOUT,
+    LIVE_ENDPOINT,
+    LIVE_HEARTBEAT,
+    LIVE_MAX_SESSIONS,
+    LIVE_PENDING_REPLIES,
+    LIVE_TRANSCRIPT_SETTLE,
+    LIVE_TURN_TIMEOUT,
+)
+from .keys import ApiKeyPool
+
+_LOGGER = logging.getLogger(__name__)
+
+_SYSTEM_PROMPT = (
+    "You are a helpful voice assistant integrated with Home Assistant. "
+    "Answer in one or two short spoken sentences. You cannot control devices "
+    "yourself; if asked to, say that Home Assistant could not find that device."
+)
+
+
+def _normalize(text: str) -> str:
+    """Return the key a transcript or reply is handed over by."""
+    return " ".join(text.casefold().split())
+
+
+def _remember(store: OrderedDict[str, Any], key: str, value: Any) -> None:
+    """Keep a handed-over item, dropping the oldest ones nobody picked up."""
+    store[key] = value
+    store.move_to_end(key)
+    while len(store) > LIVE_PENDING_REPLIES:
+        store.popitem(last=False)
+
+
+@dataclass
+class LiveReply:
+    """What a Live session heard and answered in one turn."""
+
+    transcript: str = ""
+    text: str = ""
+    audio: bytearray = field(default_factory=bytearray)
+    interrupted: bool = False
+    transcribed_at: float = 0.0
+    answering: asyncio.Event = field(default_factory=asyncio.Event)
+    generated: asyncio.Event = field(default_factory=asyncio.Event)
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    _received: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def has_output(self) -> bool:
+        """Return whether the model has started answering."""
+        return bool(self.audio or self.text)
+
+    def add_audio(self, chunk: bytes) -> None:
+        """Append audio received from the model."""
+        self.audio += chunk
+        self._received.set()
+
+    def finish_generation(self) -> None:
+        """Mark that the model sent all of the reply."""
+        self.generated.set()
+        self._received.set()
+
+    def finish(self, interrupted: bool = False) -> None:
+        """Mark the reply complete."""
+        if self.done.is_set():
+            return
+        self.interrupted = interrupted
+        self.answering.set()
+        self.done.set()
+        self.finish_generation()
+
+    async def async_audio(self) -> AsyncIterator[bytes]:
+        """Yield the reply's PCM audio as it arrives.
+
+        Stops as soon as the reply is interrupted, so audio of a reply that
+        was barged in on is not played any further.
+        """
+        sent = 0
+        while not self.interrupted:
+            if sent < len(self.audio):
+                chunk = bytes(self.audio[sent:])
+                sent += len(chunk)
+                yield chunk
+            elif self.generated.is_set():
+                return
+            else:
+                self._received.clear()
+                await self._received.wait()
+
+
+class LiveSession:
+    """One Gemini Live websocket using client-side activity detection.
+
+    Home Assistant's pipeline already decides when the user stopped talking,
+    so every turn is framed with activityStart/activityEnd. Starting a turn
+    while the previous reply is still playing is a barge-in: the server
+    stops generating and the rest of the old reply is discarded.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, url: str, api_key: str, setup: dict[str, Any]
+    ) -> None:
+        """Initialize the session."""
+        self._hass = hass
+        self._url = url
+        self._api_key = api_key
+        self.setup = setup
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._ready = asyncio.Event()
+        self._reply: LiveReply | None = None
+        self._discarding = False
+        self._retired = False
+        self.last_used = 0.0
+
+    @property
+    def usable(self) -> bool:
+        """Return whether new turns can use this session."""
+        return self._ws is not None and not self._ws.closed and not self._retired
+
+    @property
+    def busy(self) -> bool:
+        """Return whether a reply is still being received."""
+        return self._reply is not None and not self._reply.done.is_set()
+
+    @property
+    def answering(self) -> bool:
+        """Return whether a reply is being played.
+
+        The server holds turnComplete back until the reply would have
+        finished playing in real time.
+        """
+        return self.busy and self._reply.answering.is_set()
+
+    def owns(self, reply: LiveReply) -> bool:
+        """Return whether the reply is this session's current one."""
+        return self._reply is reply
+
+    @callback
+    def retire(self) -> None:
+        """Stop handing out this session; it closes once idle."""
+        self._retired = True
+
+    async def async_connect(self) -> None:
+        """Open the websocket and wait for the setup to complete."""
+        session = async_get_clientsession(self._hass)
+        try:
+            async with asyncio.timeout(LIVE_CONNECT_TIMEOUT):
+                self._ws = await session.ws_connect(
+                    self._url,
+                    headers={"x-goog-api-key": self._api_key},
+                    heartbeat=LIVE_HEARTBEAT,
+                    max_msg_size=0,
+                )
+                await self._ws.send_json({"setup": self.setup})
+                self._hass.async_create_background_task(
+                    self._async_read(self._ws), f"{DOMAIN} live session"
+                )
+                await self._ready.wait()
+        except (aiohttp.ClientError, TimeoutError) as err:
+            await self.async_close()
+            raise HomeAssistantError(f"Could not open Gemini Live session: {err}") from err
+        if not self.usable:
+            raise HomeAssistantError("Gemini Live session closed during setup")
+
+    @callback
+    def start_turn(self) -> LiveReply:
+        """Claim the session for a new turn, barging in on an unfinished one."""
+        if self._reply is not None and not self._reply.done.is_set():
+            self._reply.finish(interrupted=True)
+            self._discarding = True
+        self._reply = LiveReply()
+        self.last_used = time.monotonic()
+        return self._reply
+
+    async def async_stream(
+        self, stream: AsyncIterable[bytes], sample_rate: int
+    ) -> None:
+        """Send one turn of 16-bit mono PCM audio."""
+        mime_type = f"audio/pcm;rate={sample_rate}"
+        await self._async_send({"activityStart": {}})
+        async for chunk in stream:
+            if chunk:
+                await self._async_send(
+                    {"audio": {"data": base64.b64encode(chunk).decode(), "mimeType": mime_type}}
+                )
+        await self._async_send({"activityEnd": {}})
+
+    async def _async_send(self, realtime_input: dict[str, Any]) -> None:
+        """Send realtime input over the websocket."""
+        if self._ws is None or self._ws.closed:
+            raise HomeAssistantError("Gemini Live session closed")
+        await self._ws.send_json({"realtimeInput": realtime_input})
+
+    async def _async_read(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        """Route server messages to the current reply until the socket closes."""
+        try:
+            async for message in ws:
+                if message.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                    self._handle(json.loads(message.data))
+                elif message.type == aiohttp.WSMsgType.ERROR:
+                    break
+        except (ValueError, aiohttp.ClientError) as err:
+            _LOGGER.warning("Gemini Live session failed: %s", err)
+        finally:
+            _LOGGER.debug("Gemini Live session closed (%s)", ws.close_code)
+            self._retired = True
+            self._ready.set()
+            if self._reply is not None:
+                self._reply.finish(interrupted=True)
+
+    def _handle(self, message: dict[str, Any]) -> None:
+        """Apply one server message."""
+        if "setupComplete" in message:
+            self._ready.set()
+        if "goAway" in message:
+            # The server is about to end the session; let the turn finish
+            self._retired = True
+        content = message.get("serverContent")
+        if not content or (reply := self._reply) is None:
+            return
+
+        if transcription := content.get("inputTranscription"):
+            reply.transcript += transcription.get("text", "")
+            reply.transcribed_at = time.monotonic()
+        if self._discarding:
+            # Rest of the reply that was barged in on
+            if content.get("interrupted") or content.get("turnComplete"):
+                self._discarding = False
+            return
+
+        for part in content.get("modelTurn", {}).get("parts", []):
+            inline_data = part.get("inlineData") or {}
+            if inline_data.get("mimeType", "").startswith("audio/pcm"):
+                reply.add_audio(base64.b64decode(inline_data["data"]))
+        if transcription := content.get("outputTranscription"):
+            reply.text += transcription.get("text", "")
+        if reply.has_output and not reply.answering.is_set():
+            reply.transcribed_at = time.monotonic()
+            reply.answering.set()
+
+        if content.get("generationComplete"):
+            reply.finish_generation()
+        if content.get("interrupted"):
+            reply.finish(interrupted=True)
+        elif content.get("turnComplete") and reply.has_output:
+            # A turnComplete before any output belongs to an interrupted turn
+            reply.finish()
+
+    async def async_close(self) -> None:
+        """Close the websocket."""
+        self._retired = True
+        if self._ws is not None:
+            await self._ws.close()
+
+
+class LivePool:
+    """Gemini Live sessions shared by the STT, conversation and TTS entities.
+
+    Home Assistant's STT platform does not say which satellite is talking, so
+    sessions are pooled rather than pinned. A turn that starts while a reply
+    is still playing barges in on the session playing the latest one;
+    otherwise it takes an idle session, or opens one up to LIVE_MAX_SESSIONS.
+    A reply is handed from STT to the conversation agent by its transcript
+    and from there to TTS by its text, so the pipeline's three stages share
+    one streaming exchange.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, keys: ApiKeyPool, options: dict[str, Any]
+    ) -> None:
+        """Initialize the pool."""
+        self._hass = hass
+        self._keys = keys
+        self._sessions: list[LiveSession] = []
+        self._lock = asyncio.Lock()
+        self._heard: OrderedDict[str, LiveReply] = OrderedDict()
+        self._spoken: OrderedDict[str, LiveReply] = OrderedDict()
+        self.configure(options)
+
+    @callback
+    def configure(self, options: dict[str, Any]) -> None:
+        """Apply options; sessions with an old setup are retired."""
+        self.enabled = bool(options.get(CONF_LIVE_MODE, DEFAULT_LIVE_MODE))
+        self._url = options.get(CONF_LIVE_URL) or LIVE_ENDPOINT
+        self._setup = {
+            "model": f"models/{options.get(CONF_LIVE_MODEL, DEFAULT_MODEL_LIVE)}",
+            "generationConfig": {
+                "responseModalities": ["AUDIO"],
+                "speechConfig": {
+                    "voiceConfig": {
+                        "prebuiltVoiceConfig": {
+                            "voiceName": options.get(CONF_VOICE, DEFAULT_VOICE)
+                        }
+                    }
+                },
+            },
+            "systemInstruction": {"parts": [{"text": _SYSTEM_PROMPT}]},
+            "realtimeInputConfig": {"automaticActivityDetection": {"disabled": True}},
+            "inputAudioTranscription": {},
+            "outputAudioTranscription": {},
+        }
+        for session in self._sessions:
+            if not self.enabled or session.setup != self._setup:
+                session.retire()
+
+    @property
+    def sessions(self) -> int:
+        """Return the number of open sessions."""
+        return len(self._sessions)
+
+    async def async_turn(
+        self, stream: AsyncIterable[bytes], sample_rate: int
+    ) -> LiveReply:
+        """Stream one turn and return once Gemini has heard all of it.
+
+        Gemini starts answering before the input transcription is complete,
+        so the turn returns once no transcription arrived for
+        LIVE_TRANSCRIPT_SETTLE seconds after the answer started, or once the
+        reply is done. A cut-short transcript would miss the hand-over and
+        the turn would be answered a second time.
+        """
+        async with self._lock:
+            session = await self._async_acquire()
+            reply = session.start_turn()
+        try:
+            await session.async_stream(stream, sample_rate)
+            async with asyncio.timeout(LIVE_TURN_TIMEOUT):
+                await reply.answering.wait()
+                while not reply.done.is_set():
+                    settle = reply.transcribed_at + LIVE_TRANSCRIPT_SETTLE - time.monotonic()
+                    if settle <= 0:
+                        break
+                    with contextlib.suppress(TimeoutError):
+                        async with asyncio.timeout(settle):
+                            await reply.done.wait()
+        except (aiohttp.ClientError, ConnectionError, TimeoutError) as err:
+            reply.finish(interrupted=True)
+            await session.async_close()
+            raise HomeAssistantError(f"Gemini Live turn failed: {err}") from err
+
+        if reply.transcript.strip():
+            _remember(self._heard, _normalize(reply.transcript), reply)
+        return reply
+
+    async def _async_acquire(self) -> LiveSession:
+        """Return the session for a new turn, opening one if needed."""
+        for session in [s for s in self._sessions if not s.usable and not s.busy]:
+            self._sessions.remove(session)
+            await session.async_close()
+
+        usable = [session for session in self._sessions if session.usable]
+        if answering := [session for session in usable if session.answering]:
+            # The user is talking over the reply that started playing last
+            return max(answering, key=lambda session: session.last_used)
+        if idle := [session for session in usable if not session.busy]:
+            # The most recently used session has the freshest context
+            return max(idle, key=lambda session: session.last_used)
+        if len(self._sessions) < LIVE_MAX_SESSIONS:
+            session = LiveSession(
+                self._hass, self._url, self._keys.least_loaded(), self._setup
+            )
+            await session.async_connect()
+            self._sessions.append(session)
+            return session
+        raise HomeAssistantError("All Gemini Live sessions are busy")
+
+    @callback
+    def pop_heard(self, transcript: str) -> LiveReply | None:
+        """Return the reply to a transcript produced by a Live turn."""
+        return self._heard.pop(_normalize(transcript), None)
+
+    async def async_discard(self, reply: LiveReply) -> None:
+        """Stop a reply that will not be used, so its generation is not billed on.
+
+        Without a new turn there is no message that stops generation, so the
+        session answering it is closed; the next turn opens a fresh one.
+        """
+        if reply.done.is_set():
+            return
+        reply.finish(interrupted=True)
+        for session in self._sessions:
+            if session.owns(reply):
+                self._sessions.remove(session)
+                await session.async_close()
+                break
+
+    async def async_reply_text(self, reply: LiveReply) -> str:
+        """Wait for a reply's text, or return "" if it was not generated.
+
+        The text is complete once the model has generated the reply, which
+        is well before turnComplete, so TTS can start while it still plays.
+        """
+        try:
+            async with asyncio.timeout(LIVE_TURN_TIMEOUT):
+                await reply.generated.wait()
+        except TimeoutError:
+            return ""
+        text = reply.text.strip()
+        if reply.interrupted or not text or not reply.audio:
+            return ""
+        _remember(self._spoken, _normalize(text), reply)
+        return text
+
+    @callback
+    def pop_audio(self, message: str) -> LiveReply | None:
+        """Return the Live reply that speaks a message, unless interrupted."""
+        reply = self._spoken.pop(_normalize(message), None)
+        if reply is None or reply.interrupted:
+            return None
+        return reply
+
+    async def async_close(self) -> None:
+        """Close every session."""
+        sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            await session.async_close()
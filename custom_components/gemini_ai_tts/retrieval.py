@@ -0,0 +1,94 @@
+"""Lexical retrieval of exposed entities relevant to an utterance."""
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter
+
+from .const import RETRIEVAL_BM25_B, RETRIEVAL_BM25_K1
+
+_WORD = re.compile(r"\w+")
+
+
+def trigrams(text: str) -> list[str]:
+    """Return the padded character trigrams of every word in a text.
+
+    Trigrams make "lights" match "Light" and survive small spelling
+    differences without a language-specific stemmer.
+    """
+    terms = []
+    for word in _WORD.findall(text.casefold()):
+        padded = f"#{word}#"
+        terms.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return terms
+
+
+class EntityIndex:
+    """BM25 inverted index over short entity descriptions.
+
+    Documents are added, replaced and removed one at a time, so keeping the
+    index in sync with the registry costs work proportional to the changed
+    entity only. A search only visits the postings of the query's terms.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._postings: dict[str, dict[str, int]] = {}
+        self._documents: dict[str, Counter[str]] = {}
+        self._lengths: dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        """Return the number of indexed entities."""
+        return len(self._documents)
+
+    def clear(self) -> None:
+        """Remove every document."""
+        self._postings.clear()
+        self._documents.clear()
+        self._lengths.clear()
+        self._total_length = 0
+
+    def set(self, entity_id: str, text: str) -> None:
+        """Index or re-index the description of an entity."""
+        self.remove(entity_id)
+        terms = Counter(trigrams(text))
+        self._documents[entity_id] = terms
+        self._lengths[entity_id] = sum(terms.values())
+        self._total_length += self._lengths[entity_id]
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[entity_id] = count
+
+    def remove(self, entity_id: str) -> None:
+        """Remove an entity from the index."""
+        if (terms := self._documents.pop(entity_id, None)) is None:
+            return
+        self._total_length -= self._lengths.pop(entity_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[entity_id]
+            if not postings:
+                del self._postings[term]
+
+    def search(self, query: str, limit: int) -> list[str]:
+        """Return up to limit entity IDs ranked by BM25 score."""
+        if not self._documents:
+            return []
+        count = len(self._documents)
+        average_length = self._total_length / count
+        scores: dict[str, float] = {}
+        for term in set(trigrams(query)):
+            if not (postings := self._postings.get(term)):
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for entity_id, frequency in postings.items():
+                norm = RETRIEVAL_BM25_K1 * (
+                    1
+                    - RETRIEVAL_BM25_B
+                    + RETRIEVAL_BM25_B * self._lengths[entity_id] / average_length
+                )
+                scores[entity_id] = scores.get(entity_id, 0.0) + idf * (
+                    frequency * (RETRIEVAL_BM25_K1 + 1) / (frequency + norm)
+                )
+        return heapq.nlargest(limit, scores, key=scores.__getitem__)
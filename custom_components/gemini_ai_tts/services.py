@@ -2,36 +2,58 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
 
 from .const import (
     DOMAIN,
+    DATA_TTS_ENTITY,
+    EVENT_BATCH_FINISHED,
     CONF_VOICE,
     CONF_STYLE,
     CONF_EMOTION,
     CONF_PACE,
     VOICES,
-    SPEECH_STYLES,
     EMOTIONS,
     PACE_OPTIONS,
+    MAX_TEXT_LENGTH,
+    EXPORT_DEFAULT_DIR,
+    EXPORT_FORMATS,
+    EXPORT_DEFAULT_WORKERS,
+    EXPORT_MAX_WORKERS,
+    EXPORT_DEFAULT_REQUESTS_PER_MINUTE,
 )
+from .export import AnnouncementExport, load_rows
+
+if TYPE_CHECKING:
+    from .tts import GeminiTTSEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 SERVICE_SPEAK_WITH_STYLE = "speak_with_style"
 SERVICE_CLEAR_CONVERSATION = "clear_conversation"
 SERVICE_SET_DEFAULT_VOICE = "set_default_voice"
+SERVICE_EXPORT_ANNOUNCEMENTS = "export_announcements"
+SERVICE_BATCH_SYNTHESIZE = "batch_synthesize"
 
 SPEAK_WITH_STYLE_SCHEMA = vol.Schema(
     {
         vol.Required("message"): cv.string,
         vol.Required("entity_id"): cv.entity_id,
         vol.Optional(CONF_VOICE): vol.In(list(VOICES.keys())),
-        vol.Optional(CONF_STYLE): vol.In(SPEECH_STYLES),
+        # Custom styles from the TTS options are accepted too
+        vol.Optional(CONF_STYLE): cv.string,
         vol.Optional(CONF_EMOTION): vol.In(EMOTIONS),
         vol.Optional(CONF_PACE): vol.In(PACE_OPTIONS),
         vol.Optional("speakers"): vol.All(cv.ensure_list, [cv.string]),
@@ -51,6 +73,37 @@ SET_DEFAULT_VOICE_SCHEMA = vol.Schema(
     }
 )
 
+EXPORT_ANNOUNCEMENTS_SCHEMA = vol.Schema(
+    {
+        vol.Required("entity_id"): cv.entity_id,
+        vol.Required("source"): cv.string,
+        vol.Optional("output_dir", default=EXPORT_DEFAULT_DIR): cv.string,
+        vol.Optional("audio_format", default="mp3"): vol.In(list(EXPORT_FORMATS)),
+        vol.Optional("max_workers", default=EXPORT_DEFAULT_WORKERS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=EXPORT_MAX_WORKERS)
+        ),
+        vol.Optional(
+            "requests_per_minute", default=EXPORT_DEFAULT_REQUESTS_PER_MINUTE
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=600)),
+        vol.Optional("use_batch", default=False): cv.boolean,
+    }
+)
+
+BATCH_SYNTHESIZE_SCHEMA = vol.Schema(
+    {
+        vol.Required("entity_id"): cv.entity_id,
+        vol.Required("messages"): vol.All(
+            cv.ensure_list,
+            [vol.All(cv.string, vol.Length(min=1, max=MAX_TEXT_LENGTH))],
+            vol.Length(min=1),
+        ),
+        vol.Optional(CONF_VOICE): vol.In(list(VOICES.keys())),
+        vol.Optional(CONF_STYLE): cv.string,
+        vol.Optional(CONF_EMOTION): vol.In(EMOTIONS),
+        vol.Optional(CONF_PACE): vol.In(PACE_OPTIONS),
+    }
+)
+
 
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up services for Gemini AI TTS/STT."""
@@ -127,6 +180,120 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         # This would typically update the entity's configuration
         # Implementation depends on how you want to persist voice changes
 
+    def get_tts_entity(entity_id: str) -> GeminiTTSEntity:
+        """Return the Gemini TTS entity with an entity ID."""
+        entity = next(
+            (
+                entry_data[DATA_TTS_ENTITY]
+                for entry_data in hass.data.get(DOMAIN, {}).values()
+                if DATA_TTS_ENTITY in entry_data
+                and entry_data[DATA_TTS_ENTITY].entity_id == entity_id
+            ),
+            None,
+        )
+        if entity is None:
+            raise HomeAssistantError(f"{entity_id} is not a Gemini AI TTS entity")
+        return entity
+
+    async def handle_export_announcements(call: ServiceCall) -> ServiceResponse:
+        """Handle export announcements service call."""
+        entity = get_tts_entity(call.data["entity_id"])
+
+        source = hass.config.path(call.data["source"])
+        if not hass.config.is_allowed_path(source):
+            raise HomeAssistantError(f"Reading {source} is not allowed")
+
+        # Packs always land below the local media folder
+        media_root = Path(hass.config.media_dirs.get("local", hass.config.path("media")))
+        output_dir = (media_root / call.data["output_dir"]).resolve()
+        if not output_dir.is_relative_to(media_root.resolve()):
+            raise HomeAssistantError(f"{output_dir} is outside the media folder")
+
+        try:
+            rows = await hass.async_add_executor_job(load_rows, source)
+        except OSError as err:
+            raise HomeAssistantError(f"Cannot read {source}: {err}") from err
+
+        export = AnnouncementExport(
+            hass,
+            entity,
+            rows,
+            output_dir,
+            call.data["audio_format"],
+            call.data["max_workers"],
+            call.data["requests_per_minute"],
+            call.data["use_batch"],
+        )
+        if not call.data["use_batch"] or call.return_response:
+            return await export.async_run()
+
+        async def async_run_in_background() -> None:
+            event_data: dict[str, Any] = {
+                "entity_id": entity.entity_id,
+                "output_dir": str(output_dir),
+            }
+            try:
+                event_data.update(await export.async_run())
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.error("Batch export of announcements failed: %s", err)
+                event_data["error"] = str(err)
+            hass.bus.async_fire(EVENT_BATCH_FINISHED, event_data)
+
+        # Batch jobs can take hours; don't hold up the calling script
+        hass.async_create_background_task(
+            async_run_in_background(), f"{DOMAIN} batch export"
+        )
+        return None
+
+    async def handle_batch_synthesize(call: ServiceCall) -> ServiceResponse:
+        """Handle batch synthesize service call."""
+        entity = get_tts_entity(call.data["entity_id"])
+        options = {
+            key: call.data[key]
+            for key in (CONF_VOICE, CONF_STYLE, CONF_EMOTION, CONF_PACE)
+            if key in call.data
+        }
+        messages = call.data["messages"]
+
+        async def async_run() -> dict[str, Any]:
+            start = time.monotonic()
+            results = await entity.async_synthesize_batch(
+                [(message, options) for message in messages]
+            )
+            failed = sum(isinstance(result, str) for result in results)
+            summary = {
+                "entity_id": entity.entity_id,
+                "messages": len(messages),
+                "ready": len(messages) - failed,
+                "failed": failed,
+                "errors": {
+                    message: result
+                    for message, result in zip(messages, results)
+                    if isinstance(result, str)
+                },
+                "elapsed": round(time.monotonic() - start, 2),
+            }
+            hass.bus.async_fire(EVENT_BATCH_FINISHED, summary)
+            return summary
+
+        async def async_run_in_background() -> None:
+            try:
+                await async_run()
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.error("Batch synthesis failed: %s", err)
+                hass.bus.async_fire(
+                    EVENT_BATCH_FINISHED,
+                    {"entity_id": entity.entity_id, "messages": len(messages), "error": str(err)},
+                )
+
+        if call.return_response:
+            return await async_run()
+        # Batch jobs can take hours; don't hold up the calling script
+        hass.async_create_background_task(
+            async_run_in_background(), f"{DOMAIN} batch synthesize"
+        )
+        return None
+
     # Register services
     hass.services.async_register(
         DOMAIN,
@@ -149,6 +316,22 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         schema=SET_DEFAULT_VOICE_SCHEMA,
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_ANNOUNCEMENTS,
+        handle_export_announcements,
+        schema=EXPORT_ANNOUNCEMENTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BATCH_SYNTHESIZE,
+        handle_batch_synthesize,
+        schema=BATCH_SYNTHESIZE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
 
 def _format_multi_speaker_message(message: str, speakers: list[str]) -> str:
     """Format message for multi-speaker TTS."""
@@ -0,0 +1,223 @@
+"""Incrementally maintained digest of exposed entity states for prompts."""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+
+from homeassistant.components.conversation import DOMAIN as CONVERSATION_DOMAIN
+from homeassistant.components.homeassistant.exposed_entities import (
+    async_listen_entity_updates,
+    async_should_expose,
+)
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    State,
+    callback,
+    split_entity_id,
+)
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+
+from .retrieval import EntityIndex
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    """Rendered digest of exposed entity states at one version."""
+
+    version: int
+    digest: str
+    text: str
+    entities: int
+    exposed: int
+
+
+def _line_hash(line: str) -> int:
+    """Return a process-independent 64-bit hash of a digest line."""
+    return int.from_bytes(hashlib.blake2b(line.encode(), digest_size=8).digest(), "big")
+
+
+class HomeStateDigest:
+    """One compact line per exposed entity, updated from state_changed events.
+
+    Lines are bucketed by domain and each bucket's text is cached, so a
+    snapshot only re-renders the domains that changed since the last one. The
+    digest hash is an XOR of line hashes: it is updated in O(1) per change and
+    depends only on content, so equal homes hash equally across restarts and
+    the hash can key prompt caches.
+
+    Names, aliases, areas and domains are also kept in a retrieval index so
+    a snapshot can be narrowed to the entities relevant to an utterance.
+    Entity registry changes update single entities; exposure, device and
+    area changes trigger a lazy full rebuild.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the digest."""
+        self._hass = hass
+        self._domains: dict[str, dict[str, str]] = {}
+        self._domain_text: dict[str, str] = {}
+        self._descriptions: dict[str, str] = {}
+        self._index = EntityIndex()
+        self._hash = 0
+        self._version = 0
+        self._stale = True
+        self._snapshot: StateSnapshot | None = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Start following state, exposure and registry changes."""
+
+        @callback
+        def mark_stale(*_: object) -> None:
+            self._stale = True
+
+        self._unsubs = [
+            self._hass.bus.async_listen(EVENT_STATE_CHANGED, self._async_state_changed),
+            async_listen_entity_updates(self._hass, CONVERSATION_DOMAIN, mark_stale),
+            self._hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_updated
+            ),
+            self._hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, mark_stale),
+            self._hass.bus.async_listen(ar.EVENT_AREA_REGISTRY_UPDATED, mark_stale),
+        ]
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following changes."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def async_snapshot(
+        self, query: str | None = None, limit: int | None = None
+    ) -> StateSnapshot:
+        """Return the current digest, rendering only what changed.
+
+        With a query and a limit smaller than the number of exposed entities,
+        only the limit entities that best match the query are included.
+        """
+        if self._stale:
+            self._rebuild()
+        exposed = len(self._index)
+        if query is not None and limit is not None and limit < exposed:
+            lines = sorted(
+                self._domains[split_entity_id(entity_id)[0]][entity_id]
+                for entity_id in self._index.search(query, limit)
+            )
+            digest = 0
+            for line in lines:
+                digest ^= _line_hash(line)
+            return StateSnapshot(
+                version=self._version,
+                digest=f"{digest:016x}",
+                text="\n".join(lines),
+                entities=len(lines),
+                exposed=exposed,
+            )
+        if self._snapshot is None or self._snapshot.version != self._version:
+            for domain, lines in self._domains.items():
+                if domain not in self._domain_text:
+                    self._domain_text[domain] = "\n".join(sorted(lines.values()))
+            self._snapshot = StateSnapshot(
+                version=self._version,
+                digest=f"{self._hash:016x}",
+                text="\n".join(
+                    self._domain_text[domain] for domain in sorted(self._domains)
+                ),
+                entities=exposed,
+                exposed=exposed,
+            )
+        return self._snapshot
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Update the line of a changed entity."""
+        if not self._stale:
+            self._update(event.data["entity_id"], event.data["new_state"])
+
+    @callback
+    def _async_registry_updated(self, event: Event) -> None:
+        """Refresh an entity whose name, aliases or area may have changed."""
+        if self._stale:
+            return
+        if old_entity_id := event.data.get("old_entity_id"):
+            self._update(old_entity_id, None)
+        entity_id = event.data["entity_id"]
+        self._update(entity_id, self._hass.states.get(entity_id))
+
+    def _rebuild(self) -> None:
+        """Render and index every exposed entity from scratch."""
+        self._domains.clear()
+        self._domain_text.clear()
+        self._descriptions.clear()
+        self._index.clear()
+        self._hash = 0
+        for state in self._hass.states.async_all():
+            self._update(state.entity_id, state)
+        self._stale = False
+        self._version += 1
+
+    def _update(self, entity_id: str, state: State | None) -> None:
+        """Bring the line and index entry of one entity up to date."""
+        if state is None or not async_should_expose(
+            self._hass, CONVERSATION_DOMAIN, entity_id
+        ):
+            self._set(entity_id, None)
+            if self._descriptions.pop(entity_id, None) is not None:
+                self._index.remove(entity_id)
+            return
+
+        area, aliases = self._registry_info(entity_id)
+        unit = state.attributes.get("unit_of_measurement")
+        value = f"{state.state} {unit}" if unit else state.state
+        self._set(
+            entity_id,
+            f"{entity_id} '{state.name}'{f' [{area}]' if area else ''}: {value}",
+        )
+        description = " ".join(
+            filter(None, (split_entity_id(entity_id)[0], state.name, area, *aliases))
+        )
+        if self._descriptions.get(entity_id) != description:
+            self._descriptions[entity_id] = description
+            self._index.set(entity_id, description)
+
+    def _set(self, entity_id: str, line: str | None) -> None:
+        """Replace the line of an entity; None removes it."""
+        domain = split_entity_id(entity_id)[0]
+        lines = self._domains.get(domain, {})
+        old_line = lines.get(entity_id)
+        if old_line == line:
+            # Attribute-only updates leave the digest untouched
+            return
+
+        if old_line is not None:
+            self._hash ^= _line_hash(old_line)
+        if line is None:
+            del lines[entity_id]
+            if not lines:
+                self._domains.pop(domain, None)
+        else:
+            self._hash ^= _line_hash(line)
+            self._domains.setdefault(domain, lines)[entity_id] = line
+        self._domain_text.pop(domain, None)
+        self._version += 1
+
+    def _registry_info(self, entity_id: str) -> tuple[str | None, list[str]]:
+        """Return the area name and aliases of an entity."""
+        entry = er.async_get(self._hass).async_get(entity_id)
+        if entry is None:
+            return None, []
+        area_id = entry.area_id
+        if area_id is None and entry.device_id:
+            device = dr.async_get(self._hass).async_get(entry.device_id)
+            area_id = device.area_id if device else None
+        area = ar.async_get(self._hass).async_get_area(area_id) if area_id else None
+        return (area.name if area else None), sorted(entry.aliases)
@@ -7,9 +7,15 @@ import json
 import logging
 import os
 import tempfile
+import time
+import wave
+from dataclasses import dataclass
 from typing import Any, AsyncGenerator
 
+import grpc
+import numpy as np
 from google.cloud import speech
+from google.genai import types
 from google.oauth2 import service_account
 from homeassistant.components.stt import (
     AudioBitRates,
@@ -23,24 +29,94 @@ from homeassistant.components.stt import (
     SpeechToTextEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     DOMAIN,
-    CONF_API_KEY,
+    SIGNAL_OPTIONS_UPDATED,
+    EVENT_STT_RESULT,
+    DATA_TRACER,
+    DATA_LIVE,
+    DATA_KEYS,
     CONF_STT_PROJECT_ID,
     CONF_STT_CREDENTIALS_JSON,
     CONF_STT_LANGUAGE,
     CONF_STT_MODEL,
+    CONF_STT_ROUTING,
+    CONF_STT_SHORT_MODEL,
+    CONF_STT_SHORT_THRESHOLD,
+    CONF_STT_INTERIM_RESULTS,
+    CONF_STT_KEEPALIVE,
+    CONF_STT_WARMUP,
+    CONF_STT_BACKEND,
+    CONF_STT_GEMINI_MODEL,
+    CONF_STT_FLAC,
     DEFAULT_STT_LANGUAGE,
     DEFAULT_STT_MODEL,
+    DEFAULT_STT_ROUTING,
+    DEFAULT_STT_SHORT_MODEL,
+    DEFAULT_STT_SHORT_THRESHOLD,
+    DEFAULT_STT_INTERIM_RESULTS,
+    DEFAULT_STT_KEEPALIVE,
+    DEFAULT_STT_WARMUP,
+    DEFAULT_STT_GEMINI_MODEL,
+    DEFAULT_STT_FLAC,
     API_TIMEOUT,
+    STT_KEEPALIVE_INTERVAL,
+    STT_KEEPALIVE_TIMEOUT,
+    STT_CHANNEL_CHECK_INTERVAL,
+    STT_CHANNEL_CONNECT_TIMEOUT,
+    STT_WARMUP_IDLE_TIMEOUT,
+    STT_MAX_INLINE_SECONDS,
+    STT_MAX_INLINE_BYTES,
+    STT_CHUNK_SECONDS,
+    STT_SPLIT_SEARCH_SECONDS,
+    STT_SPLIT_WINDOW_MS,
+    STT_LONG_AUDIO_PARALLELISM,
+    STT_OPUS_LONG_AUDIO_BYTES,
+    STT_LONG_RUNNING_TIMEOUT,
+    STT_STREAMING_CHUNK_BYTES,
+    STT_BACKEND_CLOUD,
+    STT_BACKEND_GEMINI,
+    STT_GEMINI_MAX_BYTES,
+    STT_GEMINI_MAX_TOKENS,
 )
+from .flac import encode_flac
+from .keys import ApiKeyPool
+from .live import LivePool
+from .stt_router import SttModelRouter
+from .tracing import Tracer
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class UploadStats:
+    """Audio upload counters, showing what FLAC compression saves."""
+
+    requests: int = 0
+    audio_bytes: int = 0
+    upload_bytes: int = 0
+    encode_time: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for state attributes."""
+        return {
+            "requests": self.requests,
+            "audio_bytes": self.audio_bytes,
+            "upload_bytes": self.upload_bytes,
+            "compression": (
+                round(self.upload_bytes / self.audio_bytes, 3)
+                if self.audio_bytes
+                else None
+            ),
+            "encode_time": round(self.encode_time, 3),
+        }
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -50,73 +126,295 @@ async def async_setup_entry(
     config_data = config_entry.data
     options = config_entry.options
 
-    # Check if STT is configured
-    project_id = config_data.get(CONF_STT_PROJECT_ID)
-    credentials_json = config_data.get(CONF_STT_CREDENTIALS_JSON)
-    
-    if not project_id or not credentials_json:
-        _LOGGER.warning(
-            "STT not configured. Please provide Google Cloud project ID and credentials."
-        )
-        return
+    live = hass.data[DOMAIN][config_entry.entry_id][DATA_LIVE]
+
+    # Without Cloud Speech credentials, speech is recognized by Gemini
+    if not config_data.get(CONF_STT_PROJECT_ID) or not config_data.get(
+        CONF_STT_CREDENTIALS_JSON
+    ):
+        _LOGGER.info("Google Cloud Speech not configured, using Gemini for STT")
 
     try:
-        stt_entity = GeminiSTTEntity(hass, config_data, options)
+        stt_entity = GeminiSTTEntity(
+            hass,
+            config_data,
+            options,
+            hass.data[DOMAIN][config_entry.entry_id][DATA_TRACER],
+            live,
+            hass.data[DOMAIN][config_entry.entry_id][DATA_KEYS],
+        )
         async_add_entities([stt_entity])
+        config_entry.async_on_unload(
+            async_dispatcher_connect(
+                hass,
+                SIGNAL_OPTIONS_UPDATED.format(config_entry.entry_id),
+                stt_entity.async_update_options,
+            )
+        )
     except Exception as err:
         _LOGGER.error("Failed to set up STT entity: %s", err)
 
 
 class GeminiSTTEntity(SpeechToTextEntity):
-    """Gemini AI Speech-to-Text entity using Google Cloud Speech-to-Text."""
+    """Gemini AI Speech-to-Text entity using Google Cloud Speech-to-Text or Gemini."""
 
     def __init__(
         self, 
         hass: HomeAssistant, 
         config_data: dict[str, Any],
-        options: dict[str, Any]
+        options: dict[str, Any],
+        tracer: Tracer,
+        live: LivePool,
+        keys: ApiKeyPool,
     ) -> None:
         """Initialize the STT entity."""
         self._hass = hass
         self._config_data = config_data
         self._options = options
+        self._tracer = tracer
+        
+        # Answers whole voice turns in one exchange when live mode is on
+        self._live = live
         
         self._attr_name = "Gemini AI STT"
         self._attr_unique_id = f"{DOMAIN}_stt"
         
-        # Initialize Google Cloud Speech client
-        self._client = None
-        self._setup_client()
+        # The Google Cloud Speech client runs on the event loop, so concurrent
+        # recognitions do not wait for executor threads. It is created once the
+        # entity is added, with credentials parsed in the executor.
+        self._client_ready: asyncio.Future[speech.SpeechAsyncClient | None] | None = None
+        
+        # API keys for the Gemini audio understanding backend
+        self._keys = keys
+        
+        # Background task keeping the gRPC channel connected between requests
+        self._channel_warmer: asyncio.Task | None = None
+        self._last_request = time.monotonic()
+        # Time of the last real request when the last warm-up was sent
+        self._warmed_after: float | None = None
+        
+        # Route short commands to a low-latency model, long dictation to the long one
+        self._router = SttModelRouter(
+            options.get(CONF_STT_SHORT_MODEL, DEFAULT_STT_SHORT_MODEL),
+            options.get(CONF_STT_MODEL, DEFAULT_STT_MODEL),
+            float(options.get(CONF_STT_SHORT_THRESHOLD, DEFAULT_STT_SHORT_THRESHOLD)),
+        )
+        
+        # Bytes recorded before and after optional FLAC compression
+        self._uploads = UploadStats()
+
+    async def async_added_to_hass(self) -> None:
+        """Start creating the Speech client when the entity is added."""
+        await super().async_added_to_hass()
+        if self._backend == STT_BACKEND_CLOUD:
+            self._async_start_client_setup()
+        self._async_restart_channel_warmer()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop the channel warmer and close the client when the entity is removed."""
+        if self._channel_warmer:
+            self._channel_warmer.cancel()
+            self._channel_warmer = None
+        self._async_close_client()
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def async_update_options(self, options: dict[str, Any]) -> None:
+        """Apply updated options in place, keeping the client when possible."""
+        old_options = self._options
+        self._options = options
+        self._router.configure(
+            options.get(CONF_STT_SHORT_MODEL, DEFAULT_STT_SHORT_MODEL),
+            options.get(CONF_STT_MODEL, DEFAULT_STT_MODEL),
+            float(options.get(CONF_STT_SHORT_THRESHOLD, DEFAULT_STT_SHORT_THRESHOLD)),
+        )
+        
+        keepalive_changed = options.get(
+            CONF_STT_KEEPALIVE, DEFAULT_STT_KEEPALIVE
+        ) != old_options.get(CONF_STT_KEEPALIVE, DEFAULT_STT_KEEPALIVE)
+        warmup_changed = options.get(
+            CONF_STT_WARMUP, DEFAULT_STT_WARMUP
+        ) != old_options.get(CONF_STT_WARMUP, DEFAULT_STT_WARMUP)
+        backend_changed = options.get(CONF_STT_BACKEND) != old_options.get(
+            CONF_STT_BACKEND
+        )
+        
+        if keepalive_changed and self._backend == STT_BACKEND_CLOUD:
+            # Keepalive is a channel setting, so a new client is needed;
+            # requests in flight finish on the old one
+            self._async_close_client()
+            self._async_start_client_setup()
+        if keepalive_changed or warmup_changed or backend_changed:
+            self._async_restart_channel_warmer()
 
-    def _setup_client(self) -> None:
-        """Set up Google Cloud Speech client."""
+    @property
+    def _backend(self) -> str:
+        """Return the recognition backend; Gemini if Cloud Speech is not set up."""
+        if not self._config_data.get(CONF_STT_PROJECT_ID) or not self._config_data.get(
+            CONF_STT_CREDENTIALS_JSON
+        ):
+            return STT_BACKEND_GEMINI
+        return self._options.get(CONF_STT_BACKEND, STT_BACKEND_CLOUD)
+
+    @callback
+    def _async_restart_channel_warmer(self) -> None:
+        """Start or stop the channel warmer according to the options."""
+        if self._channel_warmer:
+            self._channel_warmer.cancel()
+            self._channel_warmer = None
+            
+        if self._backend == STT_BACKEND_CLOUD and self._options.get(
+            CONF_STT_KEEPALIVE, DEFAULT_STT_KEEPALIVE
+        ):
+            self._channel_warmer = self._hass.async_create_background_task(
+                self._async_keep_channel_warm(),
+                f"{DOMAIN} stt channel warmer",
+            )
+
+    def _async_start_client_setup(
+        self,
+    ) -> asyncio.Future[speech.SpeechAsyncClient | None]:
+        """Start creating the Speech client and return its readiness future."""
+        if self._client_ready is None:
+            self._client_ready = self._hass.async_create_task(
+                self._async_setup_client()
+            )
+        return self._client_ready
+
+    async def _async_get_client(self) -> speech.SpeechAsyncClient | None:
+        """Return the Speech client, waiting until it is ready."""
+        return await asyncio.shield(self._async_start_client_setup())
+
+    @callback
+    def _async_close_client(self) -> None:
+        """Forget the client and close its channel once requests in flight finish."""
+        if (ready := self._client_ready) is None:
+            return
+        self._client_ready = None
+
+        async def close() -> None:
+            if client := await ready:
+                await client.transport.grpc_channel.close(grace=API_TIMEOUT)
+
+        self._hass.async_create_background_task(close(), f"{DOMAIN} stt client close")
+
+    async def _async_setup_client(self) -> speech.SpeechAsyncClient | None:
+        """Set up the Google Cloud Speech client on the event loop."""
+        credentials = await self._hass.async_add_executor_job(self._load_credentials)
+        if credentials is None:
+            return None
+            
+        try:
+            # Create client, with a keepalive channel if enabled
+            if self._options.get(CONF_STT_KEEPALIVE, DEFAULT_STT_KEEPALIVE):
+                transport_class = speech.SpeechAsyncClient.get_transport_class(
+                    "grpc_asyncio"
+                )
+                channel = transport_class.create_channel(
+                    credentials=credentials,
+                    options=[
+                        ("grpc.max_send_message_length", -1),
+                        ("grpc.max_receive_message_length", -1),
+                        ("grpc.keepalive_time_ms", STT_KEEPALIVE_INTERVAL * 1000),
+                        ("grpc.keepalive_timeout_ms", STT_KEEPALIVE_TIMEOUT * 1000),
+                        ("grpc.keepalive_permit_without_calls", 1),
+                        ("grpc.http2.max_pings_without_data", 0),
+                    ],
+                )
+                client = speech.SpeechAsyncClient(
+                    transport=transport_class(channel=channel)
+                )
+            else:
+                client = speech.SpeechAsyncClient(credentials=credentials)
+            _LOGGER.info("Google Cloud Speech client initialized successfully")
+            return client
+            
+        except Exception as err:
+            _LOGGER.error("Failed to setup Google Cloud Speech client: %s", err)
+            return None
+
+    def _load_credentials(self) -> service_account.Credentials | None:
+        """Parse the service account credentials (blocking)."""
         try:
             project_id = self._config_data.get(CONF_STT_PROJECT_ID)
             credentials_json = self._config_data.get(CONF_STT_CREDENTIALS_JSON)
             
             if not project_id or not credentials_json:
                 _LOGGER.error("STT configuration missing project ID or credentials")
-                return
+                return None
                 
             # Parse credentials JSON
             try:
                 credentials_dict = json.loads(credentials_json)
             except json.JSONDecodeError as err:
                 _LOGGER.error("Invalid credentials JSON: %s", err)
-                return
+                return None
                 
-            # Create credentials object
-            credentials = service_account.Credentials.from_service_account_info(
+            return service_account.Credentials.from_service_account_info(
                 credentials_dict
             )
             
-            # Create client
-            self._client = speech.SpeechClient(credentials=credentials)
-            _LOGGER.info("Google Cloud Speech client initialized successfully")
+        except Exception as err:
+            _LOGGER.error("Failed to load Google Cloud Speech credentials: %s", err)
+            return None
+
+    async def _async_keep_channel_warm(self) -> None:
+        """Keep the gRPC channel connected and warm it up once per idle period."""
+        client = await self._async_get_client()
+        if not client:
+            return
+            
+        channel = client.transport.grpc_channel
+        warmup = self._options.get(CONF_STT_WARMUP, DEFAULT_STT_WARMUP)
+        
+        while True:
+            # Reconnect proactively if the channel went idle or failed
+            await self._async_ensure_channel_ready(channel)
             
+            if (
+                warmup
+                and self._warmed_after != self._last_request
+                and time.monotonic() - self._last_request >= STT_WARMUP_IDLE_TIMEOUT
+            ):
+                # Only real traffic re-arms the warm-up, so an idle entity
+                # doesn't pay for a request every few minutes
+                self._warmed_after = self._last_request
+                await self._async_send_warmup_request(client)
+                
+            await asyncio.sleep(STT_CHANNEL_CHECK_INTERVAL)
+
+    @staticmethod
+    async def _async_ensure_channel_ready(channel: grpc.aio.Channel) -> None:
+        """Wait until the channel is connected."""
+        try:
+            async with asyncio.timeout(STT_CHANNEL_CONNECT_TIMEOUT):
+                await channel.channel_ready()
+        except TimeoutError:
+            _LOGGER.debug("Google Cloud Speech channel not ready, will retry")
+
+    async def _async_send_warmup_request(self, client: speech.SpeechAsyncClient) -> None:
+        """Send a tiny recognition request so the next real one is fast."""
+        config = speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=16000,
+            language_code=self._options.get(CONF_STT_LANGUAGE, DEFAULT_STT_LANGUAGE),
+        )
+        # 100 ms of silence
+        audio = speech.RecognitionAudio(content=bytes(3200))
+        
+        try:
+            await client.recognize(config=config, audio=audio, timeout=API_TIMEOUT)
+            _LOGGER.debug("Sent Google Cloud Speech warm-up request")
         except Exception as err:
-            _LOGGER.error("Failed to setup Google Cloud Speech client: %s", err)
-            self._client = None
+            _LOGGER.debug("Google Cloud Speech warm-up request failed: %s", err)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return per-model latency and upload statistics."""
+        return {
+            "model_latency": self._router.as_dict(),
+            "uploads": self._uploads.as_dict(),
+        }
 
     @property
     def supported_languages(self) -> list[str]:
@@ -198,7 +496,25 @@ class GeminiSTTEntity(SpeechToTextEntity):
         self, metadata: SpeechMetadata, stream: AsyncGenerator[bytes, None]
     ) -> SpeechResult:
         """Process an audio stream to STT."""
-        if not self._client:
+        with self._tracer.stage("stt", language=metadata.language):
+            return await self._async_process_audio_stream(metadata, stream)
+
+    async def _async_process_audio_stream(
+        self, metadata: SpeechMetadata, stream: AsyncGenerator[bytes, None]
+    ) -> SpeechResult:
+        """Transcribe an audio stream, streaming or buffered per the options."""
+        if (
+            self._live.enabled
+            and metadata.codec == AudioCodecs.PCM
+            and metadata.channel == AudioChannels.CHANNEL_MONO
+        ):
+            return await self._async_process_live(metadata, stream)
+        if self._backend == STT_BACKEND_GEMINI:
+            return await self._async_process_gemini(metadata, stream)
+        
+        with self._tracer.span("stt.client"):
+            client = await self._async_get_client()
+        if not client:
             _LOGGER.error("Google Cloud Speech client not initialized")
             return SpeechResult(
                 text="",
@@ -206,10 +522,36 @@ class GeminiSTTEntity(SpeechToTextEntity):
             )
 
         try:
-            # Collect audio data from stream
-            audio_data = b""
-            async for chunk in stream:
-                audio_data += chunk
+            # Stream audio as it arrives and publish interim hypotheses
+            if self._options.get(CONF_STT_INTERIM_RESULTS, DEFAULT_STT_INTERIM_RESULTS):
+                text = await self._streaming_transcribe_audio(stream, metadata)
+                return SpeechResult(
+                    text=text,
+                    result=SpeechResultState.SUCCESS if text else SpeechResultState.ERROR,
+                )
+                
+            encoding, sample_rate, channels = self._audio_params(metadata)
+            is_pcm = encoding == speech.RecognitionConfig.AudioEncoding.LINEAR16
+            inline_limit = min(
+                STT_MAX_INLINE_SECONDS * sample_rate * channels * 2,
+                STT_MAX_INLINE_BYTES,
+            )
+            
+            # Collect audio data from stream until it no longer fits one request
+            audio_data = bytearray()
+            with self._tracer.span("stt.upload") as upload:
+                async for chunk in stream:
+                    audio_data += chunk
+                    if is_pcm and len(audio_data) > inline_limit:
+                        break
+                    if len(audio_data) > STT_MAX_INLINE_BYTES:
+                        # Ogg/Opus can't be cut at arbitrary bytes, and a
+                        # truncated transcript would pass for a complete one
+                        raise HomeAssistantError(
+                            f"Compressed audio exceeds the {STT_MAX_INLINE_BYTES} "
+                            "bytes Cloud Speech accepts in one request"
+                        )
+                upload.set(bytes=len(audio_data))
 
             if not audio_data:
                 return SpeechResult(
@@ -218,7 +560,10 @@ class GeminiSTTEntity(SpeechToTextEntity):
                 )
 
             # Process with Google Cloud Speech-to-Text
-            text = await self._transcribe_audio(audio_data, metadata)
+            if is_pcm and len(audio_data) > inline_limit:
+                text = await self._transcribe_long_audio(audio_data, stream, metadata)
+            else:
+                text = await self._transcribe_audio(bytes(audio_data), metadata)
             
             if text:
                 return SpeechResult(
@@ -238,12 +583,253 @@ class GeminiSTTEntity(SpeechToTextEntity):
                 result=SpeechResultState.ERROR,
             )
 
+    async def _async_process_live(
+        self, metadata: SpeechMetadata, stream: AsyncGenerator[bytes, None]
+    ) -> SpeechResult:
+        """Stream the turn to Gemini Live, which starts answering right away.
+
+        The transcript is what Gemini heard; its reply is picked up by the
+        conversation and TTS entities instead of making new requests.
+        """
+        with self._tracer.span("stt.live", sample_rate=metadata.sample_rate) as span:
+            try:
+                reply = await self._live.async_turn(stream, metadata.sample_rate)
+            except HomeAssistantError as err:
+                _LOGGER.error("Error processing audio with Gemini Live: %s", err)
+                return SpeechResult(
+                    text="",
+                    result=SpeechResultState.ERROR,
+                )
+            span.set(sessions=self._live.sessions)
+        
+        text = reply.transcript.strip()
+        return SpeechResult(
+            text=text,
+            result=SpeechResultState.SUCCESS if text else SpeechResultState.ERROR,
+        )
+
+    async def _async_process_gemini(
+        self, metadata: SpeechMetadata, stream: AsyncGenerator[bytes, None]
+    ) -> SpeechResult:
+        """Transcribe the recording with Gemini audio understanding."""
+        audio_data = bytearray()
+        with self._tracer.span("stt.upload") as upload:
+            async for chunk in stream:
+                audio_data += chunk
+                if len(audio_data) > STT_GEMINI_MAX_BYTES:
+                    break
+            upload.set(bytes=len(audio_data))
+
+        if len(audio_data) > STT_GEMINI_MAX_BYTES:
+            # A transcript of the start would pass for the whole recording
+            _LOGGER.error(
+                "Audio exceeds the %d bytes Gemini accepts in one request",
+                STT_GEMINI_MAX_BYTES,
+            )
+            return SpeechResult(
+                text="",
+                result=SpeechResultState.ERROR,
+            )
+
+        if not audio_data:
+            return SpeechResult(
+                text="",
+                result=SpeechResultState.ERROR,
+            )
+
+        try:
+            # Raw PCM is compressed to FLAC or gets a WAV header; Ogg/Opus is sent as is
+            if metadata.codec == AudioCodecs.PCM and self._options.get(
+                CONF_STT_FLAC, DEFAULT_STT_FLAC
+            ):
+                data = await self._async_encode_flac(
+                    bytes(audio_data), metadata.sample_rate.value, metadata.channel.value
+                )
+                mime_type = "audio/flac"
+            elif metadata.codec == AudioCodecs.PCM:
+                self._record_upload(len(audio_data), len(audio_data))
+                output = io.BytesIO()
+                with wave.open(output, "wb") as wav_file:
+                    wav_file.setnchannels(metadata.channel.value)
+                    wav_file.setsampwidth(2)
+                    wav_file.setframerate(metadata.sample_rate.value)
+                    wav_file.writeframes(audio_data)
+                data, mime_type = output.getvalue(), "audio/wav"
+            else:
+                self._record_upload(len(audio_data), len(audio_data))
+                data, mime_type = bytes(audio_data), "audio/ogg"
+
+            text = await self._transcribe_with_gemini(data, mime_type)
+        except Exception as err:
+            _LOGGER.error("Error transcribing audio with Gemini: %s", err)
+            return SpeechResult(
+                text="",
+                result=SpeechResultState.ERROR,
+            )
+        return SpeechResult(
+            text=text,
+            result=SpeechResultState.SUCCESS if text else SpeechResultState.ERROR,
+        )
+
+    async def _transcribe_with_gemini(self, data: bytes, mime_type: str) -> str:
+        """Send inline audio to a Gemini model and return its transcript."""
+        language = self._options.get(CONF_STT_LANGUAGE, DEFAULT_STT_LANGUAGE)
+        model = self._options.get(CONF_STT_GEMINI_MODEL, DEFAULT_STT_GEMINI_MODEL)
+        config = types.GenerateContentConfig(
+            temperature=0,
+            max_output_tokens=STT_GEMINI_MAX_TOKENS,
+        )
+        if model.startswith("gemini-2.5"):
+            # Transcription gains nothing from thinking, only latency
+            config.thinking_config = types.ThinkingConfig(thinking_budget=0)
+        prompt = (
+            "Transcribe the speech in this recording verbatim. The speaker most "
+            f"likely uses the language {language}. Reply with the transcript only, "
+            "or with nothing if there is no speech."
+        )
+
+        self._last_request = time.monotonic()
+        response = await self._keys.async_call(
+            lambda client: self._tracer.async_executor_job(
+                "stt.recognize",
+                lambda: client.models.generate_content(
+                    model=model,
+                    contents=[types.Part.from_bytes(data=data, mime_type=mime_type), prompt],
+                    config=config,
+                ),
+                model=model,
+                bytes=len(data),
+            )
+        )
+        transcript = (response.text or "").strip()
+        _LOGGER.debug("Gemini transcription result: %s", transcript)
+        return transcript
+
+    async def _async_encode_flac(
+        self, pcm: bytes, sample_rate: int, channels: int
+    ) -> bytes:
+        """Compress PCM to FLAC in the executor, recording the bytes saved."""
+        start = time.monotonic()
+        data = await self._tracer.async_executor_job(
+            "stt.encode", encode_flac, pcm, sample_rate, channels, bytes=len(pcm)
+        )
+        self._record_upload(len(pcm), len(data), time.monotonic() - start)
+        return data
+
+    def _record_upload(
+        self, audio_bytes: int, upload_bytes: int, encode_time: float = 0.0
+    ) -> None:
+        """Count an upload and its size before and after compression."""
+        self._uploads.requests += 1
+        self._uploads.audio_bytes += audio_bytes
+        self._uploads.upload_bytes += upload_bytes
+        self._uploads.encode_time += encode_time
+
+    @staticmethod
+    def _audio_params(
+        metadata: SpeechMetadata,
+    ) -> tuple[speech.RecognitionConfig.AudioEncoding, int, int]:
+        """Return the encoding, sample rate and channel count for the metadata."""
+        encoding = speech.RecognitionConfig.AudioEncoding.LINEAR16
+        
+        # Determine sample rate from metadata
+        sample_rate = 16000  # Default
+        if metadata.sample_rate:
+            if metadata.sample_rate == AudioSampleRates.SAMPLERATE_8000:
+                sample_rate = 8000
+            elif metadata.sample_rate == AudioSampleRates.SAMPLERATE_16000:
+                sample_rate = 16000
+            elif metadata.sample_rate == AudioSampleRates.SAMPLERATE_22050:
+                sample_rate = 22050
+            elif metadata.sample_rate == AudioSampleRates.SAMPLERATE_24000:
+                sample_rate = 24000
+            elif metadata.sample_rate == AudioSampleRates.SAMPLERATE_44100:
+                sample_rate = 44100
+            elif metadata.sample_rate == AudioSampleRates.SAMPLERATE_48000:
+                sample_rate = 48000
+                
+        # Determine channel count
+        audio_channel_count = 1
+        if metadata.channel == AudioChannels.CHANNEL_STEREO:
+            audio_channel_count = 2
+            
+        # Handle different audio formats
+        if metadata.format == AudioFormats.OGG:
+            encoding = speech.RecognitionConfig.AudioEncoding.OGG_OPUS
+        elif metadata.format == AudioFormats.WAV:
+            encoding = speech.RecognitionConfig.AudioEncoding.LINEAR16
+            
+        return encoding, sample_rate, audio_channel_count
+
+    async def _transcribe_long_audio(
+        self,
+        audio_data: bytearray,
+        stream: AsyncGenerator[bytes, None],
+        metadata: SpeechMetadata,
+    ) -> str:
+        """Transcribe PCM audio longer than a single recognize request allows.
+
+        The audio is cut at the quietest point near each chunk boundary and the
+        chunks are recognized concurrently. Reading from the stream pauses while
+        all workers are busy, so only a few chunks are ever held in memory.
+        """
+        _, sample_rate, channels = self._audio_params(metadata)
+        frame_size = channels * 2
+        chunk_bytes = min(
+            STT_CHUNK_SECONDS * sample_rate * frame_size, STT_MAX_INLINE_BYTES
+        ) // frame_size * frame_size
+        
+        semaphore = asyncio.Semaphore(STT_LONG_AUDIO_PARALLELISM)
+        tasks: list[asyncio.Task[str]] = []
+
+        async def recognize_chunk(chunk: bytes) -> str:
+            try:
+                return await self._transcribe_audio(chunk, metadata)
+            finally:
+                semaphore.release()
+
+        async def dispatch(chunk: bytes) -> None:
+            await semaphore.acquire()
+            tasks.append(self._hass.async_create_task(recognize_chunk(chunk)))
+
+        try:
+            while True:
+                while len(audio_data) >= chunk_bytes:
+                    cut = await self._tracer.async_executor_job(
+                        "stt.split",
+                        _find_split_point,
+                        bytes(audio_data[:chunk_bytes]),
+                        frame_size,
+                        sample_rate,
+                    )
+                    await dispatch(bytes(audio_data[:cut]))
+                    del audio_data[:cut]
+                    
+                chunk = await anext(stream, None)
+                if chunk is None:
+                    break
+                audio_data += chunk
+                
+            if audio_data:
+                await dispatch(bytes(audio_data))
+                audio_data.clear()
+                
+            transcripts = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+            
+        _LOGGER.debug("Transcribed long audio in %d chunks", len(tasks))
+        return " ".join(text for text in transcripts if text)
+
     async def _transcribe_audio(
         self, audio_data: bytes, metadata: SpeechMetadata
     ) -> str:
         """Transcribe audio using Google Cloud Speech-to-Text API."""
         try:
-            if not self._client:
+            client = await self._async_get_client()
+            if not client:
                 raise Exception("Google Cloud Speech client not available")
                 
             # Get language from options or use default
@@ -251,37 +837,23 @@ class GeminiSTTEntity(SpeechToTextEntity):
             model = self._options.get(CONF_STT_MODEL, DEFAULT_STT_MODEL)
             
             # Prepare audio format configuration
-            encoding = speech.RecognitionConfig.AudioEncoding.LINEAR16
+            encoding, sample_rate, audio_channel_count = self._audio_params(metadata)
             
-            # Determine sample rate from metadata
-            sample_rate = 16000  # Default
-            if metadata.sample_rate:
-                if metadata.sample_rate == AudioSampleRates.SAMPLERATE_8000:
-                    sample_rate = 8000
-                elif metadata.sample_rate == AudioSampleRates.SAMPLERATE_16000:
-                    sample_rate = 16000
-                elif metadata.sample_rate == AudioSampleRates.SAMPLERATE_22050:
-                    sample_rate = 22050
-                elif metadata.sample_rate == AudioSampleRates.SAMPLERATE_24000:
-                    sample_rate = 24000
-                elif metadata.sample_rate == AudioSampleRates.SAMPLERATE_44100:
-                    sample_rate = 44100
-                elif metadata.sample_rate == AudioSampleRates.SAMPLERATE_48000:
-                    sample_rate = 48000
-                    
-            # Determine channel count
-            audio_channel_count = 1
-            if metadata.channel == AudioChannels.CHANNEL_STEREO:
-                audio_channel_count = 2
+            # Pick the model from the audio duration (raw PCM only)
+            duration = None
+            if encoding == speech.RecognitionConfig.AudioEncoding.LINEAR16:
+                duration = len(audio_data) / (sample_rate * audio_channel_count * 2)
+            if self._options.get(CONF_STT_ROUTING, DEFAULT_STT_ROUTING):
+                model = self._router.select(duration)
                 
-            # Handle different audio formats
-            if metadata.format == AudioFormats.OGG:
-                if metadata.codec == AudioCodecs.OPUS:
-                    encoding = speech.RecognitionConfig.AudioEncoding.OGG_OPUS
-                else:
-                    encoding = speech.RecognitionConfig.AudioEncoding.OGG_OPUS
-            elif metadata.format == AudioFormats.WAV:
-                encoding = speech.RecognitionConfig.AudioEncoding.LINEAR16
+            # PCM shrinks to about half as FLAC; Opus is already compressed
+            if duration is not None and self._options.get(CONF_STT_FLAC, DEFAULT_STT_FLAC):
+                audio_data = await self._async_encode_flac(
+                    audio_data, sample_rate, audio_channel_count
+                )
+                encoding = speech.RecognitionConfig.AudioEncoding.FLAC
+            else:
+                self._record_upload(len(audio_data), len(audio_data))
             
             # Create recognition config
             config = speech.RecognitionConfig(
@@ -298,15 +870,37 @@ class GeminiSTTEntity(SpeechToTextEntity):
             # Create audio object
             audio = speech.RecognitionAudio(content=audio_data)
             
-            # Perform transcription
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self._client.recognize(config=config, audio=audio),
+            # Long Opus recordings need the long-running API
+            long_running = (
+                encoding == speech.RecognitionConfig.AudioEncoding.OGG_OPUS
+                and len(audio_data) > STT_OPUS_LONG_AUDIO_BYTES
             )
             
-            # Extract transcription
+            # Perform transcription
+            try:
+                response = await self._async_recognize(
+                    client, config, audio, duration, long_running
+                )
+            except Exception as err:
+                long_model = self._options.get(CONF_STT_MODEL, DEFAULT_STT_MODEL)
+                if model == long_model:
+                    raise
+                # The short model may not support this language; fall back
+                _LOGGER.warning(
+                    "STT model %s failed (%s), retrying with %s", model, err, long_model
+                )
+                config.model = long_model
+                response = await self._async_recognize(
+                    client, config, audio, duration, long_running
+                )
+            
+            # Extract transcription; each result covers a consecutive portion
             if response.results:
-                transcript = response.results[0].alternatives[0].transcript
+                transcript = " ".join(
+                    result.alternatives[0].transcript.strip()
+                    for result in response.results
+                    if result.alternatives
+                )
                 _LOGGER.debug("Transcription result: %s", transcript)
                 return transcript.strip()
             else:
@@ -317,10 +911,159 @@ class GeminiSTTEntity(SpeechToTextEntity):
             _LOGGER.error("Error transcribing audio: %s", err)
             raise
 
+    async def _async_recognize(
+        self,
+        client: speech.SpeechAsyncClient,
+        config: speech.RecognitionConfig,
+        audio: speech.RecognitionAudio,
+        duration: float | None,
+        long_running: bool = False,
+    ) -> speech.RecognizeResponse | speech.LongRunningRecognizeResponse:
+        """Run a recognize request and record its latency for model routing."""
+        self._last_request = start = time.monotonic()
+        try:
+            with self._tracer.span(
+                "stt.recognize",
+                model=config.model,
+                bytes=len(audio.content),
+                long_running=long_running,
+            ):
+                if long_running:
+                    operation = await client.long_running_recognize(
+                        config=config, audio=audio
+                    )
+                    response = await operation.result(timeout=STT_LONG_RUNNING_TIMEOUT)
+                else:
+                    response = await client.recognize(config=config, audio=audio)
+        except Exception:
+            self._router.record_error(config.model, duration)
+            raise
+        self._router.record(config.model, time.monotonic() - start, duration)
+        return response
+
     async def _streaming_transcribe_audio(
         self, audio_stream: AsyncGenerator[bytes, None], metadata: SpeechMetadata
     ) -> str:
-        """Transcribe audio using streaming recognition (for future enhancement)."""
-        # This method can be implemented for real-time streaming transcription
-        # For now, we use the batch recognition method
-        pass
+        """Transcribe audio using streaming recognition.
+
+        Every interim and final hypothesis is fired as an EVENT_STT_RESULT event
+        with its word timings, so listeners can act on a confident command
+        prefix before the final transcript is ready.
+        """
+        client = await self._async_get_client()
+        if not client:
+            raise Exception("Google Cloud Speech client not available")
+            
+        encoding, sample_rate, audio_channel_count = self._audio_params(metadata)
+        model = self._options.get(CONF_STT_MODEL, DEFAULT_STT_MODEL)
+        config = speech.StreamingRecognitionConfig(
+            config=speech.RecognitionConfig(
+                encoding=encoding,
+                sample_rate_hertz=sample_rate,
+                language_code=self._options.get(CONF_STT_LANGUAGE, DEFAULT_STT_LANGUAGE),
+                audio_channel_count=audio_channel_count,
+                enable_automatic_punctuation=True,
+                enable_word_time_offsets=True,
+                model=model,
+                use_enhanced=True,
+            ),
+            interim_results=True,
+        )
+        
+        audio_bytes = 0
+        audio_sent = asyncio.Event()
+
+        async def requests() -> AsyncGenerator[speech.StreamingRecognizeRequest, None]:
+            nonlocal audio_bytes
+            # The first request carries the config, the rest carry audio
+            yield speech.StreamingRecognizeRequest(streaming_config=config)
+            try:
+                async for chunk in audio_stream:
+                    for offset in range(0, len(chunk), STT_STREAMING_CHUNK_BYTES):
+                        yield speech.StreamingRecognizeRequest(
+                            audio_content=chunk[offset:offset + STT_STREAMING_CHUNK_BYTES]
+                        )
+                    audio_bytes += len(chunk)
+            finally:
+                audio_sent.set()
+
+        async def recognize() -> str:
+            final_transcripts = []
+            responses = await client.streaming_recognize(requests=requests())
+            async for response in responses:
+                for result in response.results:
+                    if not result.alternatives:
+                        continue
+                    alternative = result.alternatives[0]
+                    self._hass.bus.async_fire(
+                        EVENT_STT_RESULT,
+                        {
+                            "entity_id": self.entity_id,
+                            "transcript": alternative.transcript.strip(),
+                            "is_final": result.is_final,
+                            "stability": result.stability,
+                            "confidence": alternative.confidence,
+                            "words": [
+                                {
+                                    "word": word.word,
+                                    "start": word.start_time.total_seconds(),
+                                    "end": word.end_time.total_seconds(),
+                                }
+                                for word in alternative.words
+                            ],
+                        },
+                    )
+                    if result.is_final:
+                        final_transcripts.append(alternative.transcript.strip())
+            return " ".join(final_transcripts)
+
+        self._last_request = time.monotonic()
+        recognition = self._hass.async_create_task(recognize())
+        sent = self._hass.async_create_task(audio_sent.wait())
+        try:
+            # Until the audio ends, or the server closes the stream early
+            with self._tracer.span("stt.stream", model=model) as upload:
+                await asyncio.wait(
+                    (recognition, sent), return_when=asyncio.FIRST_COMPLETED
+                )
+                upload.set(bytes=audio_bytes)
+            self._record_upload(audio_bytes, audio_bytes)
+                
+            start = time.monotonic()
+            # Time from the end of speech until the final transcript
+            with self._tracer.span("stt.finalize", model=model):
+                transcript = await recognition
+        except asyncio.CancelledError:
+            # The pipeline timed out; cancelling the task cancels the RPC
+            recognition.cancel()
+            raise
+        except Exception:
+            self._router.record_error(model, None, streaming=True)
+            raise
+        finally:
+            sent.cancel()
+            
+        duration = None
+        if encoding == speech.RecognitionConfig.AudioEncoding.LINEAR16:
+            duration = audio_bytes / (sample_rate * audio_channel_count * 2)
+        self._router.record(
+            model, time.monotonic() - start, duration, streaming=True
+        )
+        
+        _LOGGER.debug("Streaming transcription result: %s", transcript)
+        return transcript
+
+def _find_split_point(data: bytes, frame_size: int, sample_rate: int) -> int:
+    """Return the byte offset of the quietest point near the end of PCM data."""
+    window = sample_rate * STT_SPLIT_WINDOW_MS // 1000 * frame_size
+    search = min(len(data), STT_SPLIT_SEARCH_SECONDS * sample_rate * frame_size)
+    start = (len(data) - search) // frame_size * frame_size
+    
+    count = (len(data) - start) // window
+    if not count:
+        return len(data) // frame_size * frame_size
+        
+    # Sum of absolute sample values per window, all windows at once
+    samples = np.frombuffer(data, dtype="<i2", count=count * window // 2, offset=start)
+    energy = np.abs(samples.astype(np.int32)).reshape(count, -1).sum(axis=1)
+    return start + int(energy.argmin()) * window + window // 2 // frame_size * frame_size
@@ -0,0 +1,120 @@
+"""Cloud Speech model routing by utterance length and observed latency."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from .const import STT_ROUTING_EWMA_ALPHA, STT_ROUTING_EXPLORE_EVERY
+
+# Duration classes statistics are kept for
+SHORT = "short"
+LONG = "long"
+UNKNOWN = "unknown"
+STREAMING = "streaming"
+
+
+@dataclass
+class ModelLatency:
+    """Latency statistics for one Cloud Speech model and duration class."""
+
+    requests: int = 0
+    errors: int = 0
+    average: float = 0.0
+    audio_seconds: float = 0.0
+
+    def record(self, elapsed: float, duration: float | None) -> None:
+        """Fold one request latency into the moving average."""
+        if self.requests == 0:
+            self.average = elapsed
+        else:
+            self.average += STT_ROUTING_EWMA_ALPHA * (elapsed - self.average)
+        self.requests += 1
+        if duration:
+            self.audio_seconds += duration
+
+
+class SttModelRouter:
+    """Pick a Cloud Speech model for each request.
+
+    Long or unknown-length audio always goes to the long-form model. Short
+    commands go to whichever candidate has the lowest observed latency on
+    short commands, with an occasional request sent to the other candidate
+    so its statistics stay current. Statistics are kept per model and
+    duration class, so dictation never skews the short-command ranking.
+    """
+
+    def __init__(self, short_model: str, long_model: str, short_threshold: float) -> None:
+        """Initialize the router."""
+        self._short_model = short_model
+        self._long_model = long_model
+        self._short_threshold = short_threshold
+        self._short_requests = 0
+        self._stats: dict[tuple[str, str], ModelLatency] = {}
+
+    def configure(self, short_model: str, long_model: str, short_threshold: float) -> None:
+        """Update the routing settings, keeping collected statistics."""
+        self._short_model = short_model
+        self._long_model = long_model
+        self._short_threshold = short_threshold
+
+    def select(self, duration: float | None) -> str:
+        """Return the model to use for audio of the given duration in seconds."""
+        if duration is None or duration > self._short_threshold:
+            return self._long_model
+
+        candidates = list(dict.fromkeys((self._short_model, self._long_model)))
+        for model in candidates:
+            if (model, SHORT) not in self._stats:
+                return model
+
+        ranked = sorted(candidates, key=self._rank)
+        self._short_requests += 1
+        if len(ranked) > 1 and self._short_requests % STT_ROUTING_EXPLORE_EVERY == 0:
+            return ranked[1]
+        return ranked[0]
+
+    def _rank(self, model: str) -> float:
+        """Return the sort key of a model; models that only failed rank last."""
+        stats = self._stats[model, SHORT]
+        return stats.average if stats.requests else float("inf")
+
+    def duration_class(self, duration: float | None) -> str:
+        """Return the duration class of audio of the given length in seconds."""
+        if duration is None:
+            return UNKNOWN
+        return SHORT if duration <= self._short_threshold else LONG
+
+    def record(
+        self,
+        model: str,
+        elapsed: float,
+        duration: float | None,
+        *,
+        streaming: bool = False,
+    ) -> None:
+        """Record the latency of a successful request.
+
+        Streaming latency only covers finalizing the transcript, so it is
+        kept apart and never used for routing.
+        """
+        key = (model, STREAMING if streaming else self.duration_class(duration))
+        self._stats.setdefault(key, ModelLatency()).record(elapsed, duration)
+
+    def record_error(
+        self, model: str, duration: float | None, *, streaming: bool = False
+    ) -> None:
+        """Record a failed request."""
+        key = (model, STREAMING if streaming else self.duration_class(duration))
+        self._stats.setdefault(key, ModelLatency()).errors += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return statistics per model and duration class for state attributes."""
+        result: dict[str, Any] = {}
+        for (model, duration_class), stats in self._stats.items():
+            result.setdefault(model, {})[duration_class] = {
+                "requests": stats.requests,
+                "errors": stats.errors,
+                "average_latency": round(stats.average, 3),
+                "audio_seconds": round(stats.audio_seconds, 1),
+            }
+        return result
@@ -0,0 +1,65 @@
+"""Compiled speaking-style directives for Gemini TTS prompts."""
+from __future__ import annotations
+
+import itertools
+import logging
+
+from .const import EMOTION_DIRECTIVES, PACE_DIRECTIVES, STYLE_DIRECTIVES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_custom_styles(text: str) -> dict[str, str]:
+    """Parse custom style directives given as "name: directive" lines."""
+    styles: dict[str, str] = {}
+    for line in text.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        name, sep, directive = line.partition(":")
+        name, directive = name.strip().lower(), directive.strip()
+        if not sep or not name:
+            _LOGGER.warning("Ignoring invalid custom style line: %s", line)
+            continue
+        styles[name] = directive
+    return styles
+
+
+def _build_prefix(*directives: str) -> str:
+    """Join directives into a canonical prompt prefix."""
+    # Drop empty and repeated directives so equal-sounding combinations
+    # produce the same prefix
+    unique = list(dict.fromkeys(directive for directive in directives if directive))
+    if not unique:
+        return ""
+    return f"Say {', '.join(unique)}: "
+
+
+class StyleDirectives:
+    """Prompt prefixes for every (style, emotion, pace) combination.
+
+    The table is built once, so a request only needs a dictionary lookup. The
+    prefix is canonical and doubles as part of the TTS cache key.
+    """
+
+    def __init__(self, custom_styles: str = "") -> None:
+        """Compile the directive table."""
+        self._styles = {**STYLE_DIRECTIVES, **parse_custom_styles(custom_styles)}
+        self._table = {
+            (style, emotion, pace): _build_prefix(
+                self._styles[style], EMOTION_DIRECTIVES[emotion], PACE_DIRECTIVES[pace]
+            )
+            for style, emotion, pace in itertools.product(
+                self._styles, EMOTION_DIRECTIVES, PACE_DIRECTIVES
+            )
+        }
+
+    def prefix(self, style: str, emotion: str, pace: str) -> str:
+        """Return the prompt prefix for a combination."""
+        if (prefix := self._table.get((style, emotion, pace))) is not None:
+            return prefix
+        # Values outside the table are phrased generically, not memoized
+        return _build_prefix(
+            self._styles.get(style, f"in a {style} way"),
+            EMOTION_DIRECTIVES.get(emotion, f"with {emotion}"),
+            PACE_DIRECTIVES.get(pace, ""),
+        )
@@ -0,0 +1,113 @@
+"""Gemini function calling backed by Home Assistant's LLM tools."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import voluptuous as vol
+from google.genai import types
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import llm
+from voluptuous_openapi import convert
+
+from .const import TOOL_CALL_TIMEOUT
+from .tracing import Tracer
+
+_LOGGER = logging.getLogger(__name__)
+
+# OpenAPI schema keys understood by Gemini function declarations
+_SUPPORTED_SCHEMA_KEYS = {
+    "type",
+    "format",
+    "description",
+    "nullable",
+    "enum",
+    "items",
+    "properties",
+    "required",
+    "minItems",
+    "maxItems",
+}
+
+
+def _format_schema(schema: dict[str, Any]) -> dict[str, Any]:
+    """Reduce an OpenAPI schema to what Gemini accepts."""
+    if "anyOf" in schema:
+        # Gemini needs a single type; the first alternative is the primary one
+        return _format_schema({**schema["anyOf"][0], **{
+            key: value for key, value in schema.items() if key != "anyOf"
+        }})
+
+    result: dict[str, Any] = {}
+    for key, value in schema.items():
+        if key not in _SUPPORTED_SCHEMA_KEYS:
+            continue
+        if key == "type":
+            value = value.upper()
+        elif key == "format" and value not in ("enum", "date-time"):
+            continue
+        elif key == "items":
+            value = _format_schema(value)
+        elif key == "properties":
+            value = {name: _format_schema(item) for name, item in value.items()}
+        result[key] = value
+
+    if result.get("enum") and result.get("type") != "STRING":
+        # Gemini only supports enums of strings
+        result["type"] = "STRING"
+        result["enum"] = [str(item) for item in result["enum"]]
+    if result.get("type") == "OBJECT" and not result.get("properties"):
+        # Gemini rejects objects without properties
+        result["properties"] = {"json": {"type": "STRING"}}
+        result["required"] = []
+    return result
+
+
+def function_declarations(api: llm.APIInstance) -> list[types.FunctionDeclaration]:
+    """Return Gemini function declarations for the tools of an LLM API."""
+    declarations = []
+    for tool in api.tools:
+        parameters = _format_schema(
+            convert(tool.parameters, custom_serializer=api.custom_serializer)
+        )
+        declarations.append(
+            types.FunctionDeclaration(
+                name=tool.name,
+                description=tool.description,
+                parameters=parameters if parameters.get("properties") else None,
+            )
+        )
+    return declarations
+
+
+async def async_call_tools(
+    api: llm.APIInstance,
+    calls: list[types.FunctionCall],
+    tracer: Tracer,
+) -> list[types.Part]:
+    """Run function calls concurrently and return their responses.
+
+    Each call has its own timeout; a call that fails or times out reports its
+    error to the model instead of failing the whole turn.
+    """
+
+    async def call_tool(call: types.FunctionCall) -> types.Part:
+        with tracer.span("conversation.tool", tool=call.name) as span:
+            try:
+                async with asyncio.timeout(TOOL_CALL_TIMEOUT):
+                    result = await api.async_call_tool(
+                        llm.ToolInput(tool_name=call.name, tool_args=dict(call.args or {}))
+                    )
+            except TimeoutError:
+                span.set(error="timeout")
+                result = {"error": f"{call.name} timed out after {TOOL_CALL_TIMEOUT}s"}
+            except (HomeAssistantError, vol.Invalid) as err:
+                span.set(error=str(err))
+                result = {"error": type(err).__name__, "error_text": str(err)}
+        _LOGGER.debug("Tool %s(%s) returned %s", call.name, call.args, result)
+        if not isinstance(result, dict):
+            result = {"result": result}
+        return types.Part.from_function_response(name=call.name, response=result)
+
+    return list(await asyncio.gather(*(call_tool(call) for call in calls)))
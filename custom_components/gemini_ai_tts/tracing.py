@@ -0,0 +1,338 @@
+"""Lightweight latency tracing across the STT, conversation and TTS stages."""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import secrets
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    CONF_OTLP_ENDPOINT,
+    CONF_TRACING,
+    DEFAULT_OTLP_ENDPOINT,
+    DEFAULT_TRACING,
+    DOMAIN,
+    TRACE_BUFFER_SIZE,
+    TRACE_EXPORT_TIMEOUT,
+    TRACE_LINK_WINDOW,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class Span:
+    """A timed stage of a trace."""
+
+    name: str
+    span_id: str
+    parent_id: str | None
+    start: int
+    end: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        """Add attributes to the span."""
+        self.attributes.update(attributes)
+
+
+class _NoopSpan(Span):
+    """Span handed out while tracing is disabled."""
+
+    def set(self, **attributes: Any) -> None:
+        """Ignore attributes."""
+
+
+_NOOP_SPAN = _NoopSpan("noop", "", None, 0)
+
+
+@dataclass
+class Trace:
+    """Spans of one voice turn, from speech recognition to synthesized reply."""
+
+    trace_id: str
+    conversation_id: str | None = None
+    spans: list[Span] = field(default_factory=list)
+    last_activity: float = field(default_factory=time.monotonic)
+
+    @property
+    def stages(self) -> set[str]:
+        """Return the names of the root spans."""
+        return {span.name for span in self.spans if span.parent_id is None}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace with span times relative to its start, in ms."""
+        start = min((span.start for span in self.spans), default=0)
+        end = max((span.end or span.start for span in self.spans), default=0)
+        return {
+            "trace_id": self.trace_id,
+            "conversation_id": self.conversation_id,
+            "start": start / 1e9,
+            "duration_ms": round((end - start) / 1e6, 1),
+            "spans": [
+                {
+                    "name": span.name,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "offset_ms": round((span.start - start) / 1e6, 1),
+                    "duration_ms": (
+                        round((span.end - span.start) / 1e6, 1) if span.end else None
+                    ),
+                    "attributes": span.attributes,
+                    "error": span.error,
+                }
+                for span in self.spans
+            ],
+        }
+
+
+class Tracer:
+    """Record spans per voice turn and keep the most recent traces.
+
+    Each platform wraps its work in a stage (a root span). The trace travels
+    through the pipeline in a context variable, and is tied to the pipeline's
+    conversation_id once the conversation stage sees it. A TTS request that
+    runs outside the pipeline task joins the latest trace that has a reply but
+    no speech yet. Finished stages are optionally exported as OTLP/HTTP JSON.
+    """
+
+    def __init__(self, hass: HomeAssistant, options: dict[str, Any]) -> None:
+        """Initialize the tracer."""
+        self._hass = hass
+        self._traces: deque[Trace] = deque(maxlen=TRACE_BUFFER_SIZE)
+        self._current_trace: contextvars.ContextVar[Trace | None] = (
+            contextvars.ContextVar(f"{DOMAIN}_trace", default=None)
+        )
+        self._current_span: contextvars.ContextVar[Span | None] = (
+            contextvars.ContextVar(f"{DOMAIN}_span", default=None)
+        )
+        self._exported = 0
+        self._export_errors = 0
+        self.configure(options)
+
+    def configure(self, options: dict[str, Any]) -> None:
+        """Apply tracing options."""
+        self._enabled = options.get(CONF_TRACING, DEFAULT_TRACING)
+        endpoint = options.get(CONF_OTLP_ENDPOINT, DEFAULT_OTLP_ENDPOINT).strip()
+        if endpoint and not endpoint.endswith("/v1/traces"):
+            endpoint = f"{endpoint.rstrip('/')}/v1/traces"
+        self._endpoint = endpoint
+
+    @contextmanager
+    def stage(
+        self, name: str, conversation_id: str | None = None, **attributes: Any
+    ) -> Iterator[Span]:
+        """Time a pipeline stage as the root span of the current turn's trace."""
+        if not self._enabled:
+            yield _NOOP_SPAN
+            return
+
+        trace = self._trace_for(name, conversation_id)
+        if conversation_id and trace.conversation_id is None:
+            trace.conversation_id = conversation_id
+        self._current_trace.set(trace)
+        if trace not in self._traces:
+            self._traces.append(trace)
+
+        span = _NOOP_SPAN
+        try:
+            with self._record(trace, name, None, attributes) as span:
+                yield span
+        finally:
+            trace.last_activity = time.monotonic()
+            if self._endpoint and span is not _NOOP_SPAN:
+                self._hass.async_create_background_task(
+                    self._async_export(trace, span),
+                    f"{DOMAIN} trace export",
+                )
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Time a step inside the current stage."""
+        trace = self._current_trace.get()
+        parent = self._current_span.get()
+        if not self._enabled or trace is None or parent is None:
+            yield _NOOP_SPAN
+            return
+        with self._record(trace, name, parent.span_id, attributes) as span:
+            yield span
+
+    async def async_executor_job(
+        self, name: str, target: Callable[..., _T], *args: Any, **attributes: Any
+    ) -> _T:
+        """Run target in the executor, timing its queueing and its execution."""
+        submitted = time.time_ns()
+        started: int | None = None
+
+        def run() -> _T:
+            nonlocal started
+            started = time.time_ns()
+            return target(*args)
+
+        with self.span(name, **attributes) as span:
+            try:
+                return await self._hass.async_add_executor_job(run)
+            finally:
+                trace = self._current_trace.get()
+                if started is not None and trace and span is not _NOOP_SPAN:
+                    trace.spans.append(
+                        Span(
+                            "executor.queue",
+                            secrets.token_hex(8),
+                            span.span_id,
+                            submitted,
+                            started,
+                        )
+                    )
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the buffered traces, newest first."""
+        return [trace.as_dict() for trace in reversed(self._traces)]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return tracer settings and counters."""
+        return {
+            "enabled": self._enabled,
+            "otlp_endpoint": self._endpoint or None,
+            "buffered_traces": len(self._traces),
+            "exported_stages": self._exported,
+            "export_errors": self._export_errors,
+        }
+
+    def _trace_for(self, stage: str, conversation_id: str | None) -> Trace:
+        """Return the trace a new stage belongs to."""
+        cutoff = time.monotonic() - TRACE_LINK_WINDOW
+        trace = self._current_trace.get()
+        if trace and stage not in trace.stages and trace.last_activity >= cutoff:
+            return trace
+
+        for trace in reversed(self._traces):
+            if trace.last_activity < cutoff:
+                break
+            if stage in trace.stages:
+                continue
+            if (conversation_id and trace.conversation_id == conversation_id) or (
+                stage == "tts" and "conversation" in trace.stages
+            ):
+                return trace
+
+        return Trace(secrets.token_hex(16), conversation_id)
+
+    @contextmanager
+    def _record(
+        self,
+        trace: Trace,
+        name: str,
+        parent_id: str | None,
+        attributes: dict[str, Any],
+    ) -> Iterator[Span]:
+        """Add a span to the trace and time the enclosed block."""
+        span = Span(name, secrets.token_hex(8), parent_id, time.time_ns())
+        span.set(**attributes)
+        trace.spans.append(span)
+        token = self._current_span.set(span)
+        try:
+            yield span
+        except BaseException as err:
+            span.error = str(err) or type(err).__name__
+            raise
+        finally:
+            span.end = time.time_ns()
+            self._current_span.reset(token)
+
+    async def _async_export(self, trace: Trace, stage: Span) -> None:
+        """Send the spans of a finished stage to the OTLP collector."""
+        spans = [stage]
+        children = {stage.span_id}
+        for span in trace.spans:
+            if span.parent_id in children:
+                spans.append(span)
+                children.add(span.span_id)
+
+        session = async_get_clientsession(self._hass)
+        try:
+            async with asyncio.timeout(TRACE_EXPORT_TIMEOUT):
+                async with session.post(
+                    self._endpoint, json=otlp_payload(trace, spans)
+                ) as response:
+                    response.raise_for_status()
+        except (aiohttp.ClientError, TimeoutError) as err:
+            self._export_errors += 1
+            _LOGGER.debug("Exporting trace %s failed: %s", trace.trace_id, err)
+            return
+        self._exported += 1
+
+
+def otlp_payload(trace: Trace, spans: list[Span]) -> dict[str, Any]:
+    """Return spans as an OTLP/HTTP JSON ExportTraceServiceRequest."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [_otlp_attribute("service.name", DOMAIN)]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": DOMAIN},
+                        "spans": [
+                            {
+                                "traceId": trace.trace_id,
+                                "spanId": span.span_id,
+                                **(
+                                    {"parentSpanId": span.parent_id}
+                                    if span.parent_id
+                                    else {}
+                                ),
+                                "name": span.name,
+                                "kind": 1,
+                                "startTimeUnixNano": str(span.start),
+                                "endTimeUnixNano": str(span.end or span.start),
+                                "attributes": [
+                                    _otlp_attribute(key, value)
+                                    for key, value in {
+                                        **span.attributes,
+                                        **(
+                                            {"conversation.id": trace.conversation_id}
+                                            if trace.conversation_id
+                                            and span.parent_id is None
+                                            else {}
+                                        ),
+                                    }.items()
+                                ],
+                                "status": (
+                                    {"code": 2, "message": span.error}
+                                    if span.error
+                                    else {"code": 1}
+                                ),
+                            }
+                            for span in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def _otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    """Return an OTLP key/value attribute."""
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
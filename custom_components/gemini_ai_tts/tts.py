@@ -1,22 +1,40 @@
 """Text-to-Speech platform for Gemini AI TTS."""
 from __future__ import annotations
 
-import asyncio
 import io
 import logging
+import time
 import wave
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
 from typing import Any
 
 from google import genai
 from google.genai import types
 from homeassistant.components.tts import ATTR_VOICE, CONF_LANG, TextToSpeechEntity
+
+try:
+    # Streamed TTS responses (newer Home Assistant versions)
+    from homeassistant.components.tts import TTSAudioRequest, TTSAudioResponse
+except ImportError:
+    TTSAudioRequest = TTSAudioResponse = None
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 
 from .const import (
     DOMAIN,
-    CONF_API_KEY,
+    SIGNAL_OPTIONS_UPDATED,
+    DATA_UTTERANCES,
+    DATA_TTS_ENTITY,
+    DATA_TRACER,
+    DATA_LIVE,
+    DATA_KEYS,
+    CONF_BATCH_URL,
     CONF_MODEL,
     CONF_VOICE,
     CONF_STYLE,
@@ -24,17 +42,40 @@ from .const import (
     CONF_PACE,
     CONF_LANGUAGE,
     CONF_STREAMING,
+    CONF_TTS_PRESYNTHESIS_COUNT,
+    CONF_CUSTOM_STYLES,
+    CONF_MODEL_FALLBACK,
+    CONF_TTS_LATENCY_SLO,
+    CONF_TTS_POSTPROCESS,
+    CONF_TTS_TARGET_LOUDNESS,
     DEFAULT_MODEL_TTS,
+    DEFAULT_MODEL_FALLBACK,
+    DEFAULT_TTS_LATENCY_SLO,
     DEFAULT_VOICE,
     DEFAULT_STYLE,
     DEFAULT_LANGUAGE,
+    DEFAULT_TTS_PRESYNTHESIS_COUNT,
+    DEFAULT_TTS_POSTPROCESS,
+    DEFAULT_TTS_TARGET_LOUDNESS,
     VOICES,
+    TTS_MODELS,
     AUDIO_SAMPLE_RATE,
     AUDIO_CHANNELS,
     AUDIO_SAMPLE_WIDTH,
     API_TIMEOUT,
     MAX_TEXT_LENGTH,
+    TTS_CACHE_SIZE,
+    TTS_PRESYNTHESIS_INTERVAL,
+    TTS_PRESYNTHESIS_IDLE_TIME,
 )
+from .audio import postprocess_pcm
+from .batch import async_run_batch
+from .fallback import ModelAttempt, ModelFallbackChain, fallback_models
+from .keys import ApiKeyPool
+from .live import LivePool, LiveReply
+from .styles import StyleDirectives
+from .tracing import Tracer
+from .utterances import LikelyUtterances
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,11 +86,22 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Gemini AI TTS platform via config entry."""
-    api_key = config_entry.data[CONF_API_KEY]
+    keys = hass.data[DOMAIN][config_entry.entry_id][DATA_KEYS]
     options = config_entry.options
+    utterances = hass.data[DOMAIN][config_entry.entry_id][DATA_UTTERANCES]
+    tracer = hass.data[DOMAIN][config_entry.entry_id][DATA_TRACER]
+    live = hass.data[DOMAIN][config_entry.entry_id][DATA_LIVE]
 
-    tts_entity = GeminiTTSEntity(hass, api_key, options)
+    tts_entity = GeminiTTSEntity(hass, keys, options, utterances, tracer, live)
+    hass.data[DOMAIN][config_entry.entry_id][DATA_TTS_ENTITY] = tts_entity
     async_add_entities([tts_entity])
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_OPTIONS_UPDATED.format(config_entry.entry_id),
+            tts_entity.async_update_options,
+        )
+    )
 
 
 class GeminiTTSEntity(TextToSpeechEntity):
@@ -58,20 +110,111 @@ class GeminiTTSEntity(TextToSpeechEntity):
     def __init__(
         self, 
         hass: HomeAssistant, 
-        api_key: str, 
-        options: dict[str, Any]
+        keys: ApiKeyPool,
+        options: dict[str, Any],
+        utterances: LikelyUtterances,
+        tracer: Tracer,
+        live: LivePool,
     ) -> None:
         """Initialize the TTS entity."""
         self._hass = hass
-        self._api_key = api_key
         self._options = options
+        self._utterances = utterances
+        self._tracer = tracer
+        
+        # Audio of replies Gemini Live already spoke
+        self._live = live
+        
+        # Requests are spread over the configured API keys
+        self._keys = keys
+        
+        # Client for Batch API jobs when they go to another endpoint
+        self._batch_client: tuple[str, genai.Client] | None = None
+        
+        # Synthesized audio, including replies pre-rendered while idle
+        self._audio_cache: OrderedDict[str, bytes] = OrderedDict()
+        self._last_request = 0.0
+        self._presynthesizing = False
+        self._unsub_presynthesis: CALLBACK_TYPE | None = None
         
-        # Initialize the Gemini client for TTS
-        self._client = genai.Client(api_key=api_key)
+        # Prompt prefixes for every style/emotion/pace combination
+        self._styles = StyleDirectives(options.get(CONF_CUSTOM_STYLES, ""))
+        
+        # Falls back to other TTS models when the configured one is slow or failing
+        self._model_chain = ModelFallbackChain("TTS", *self._model_chain_settings())
         
         self._attr_name = "Gemini AI TTS"
         self._attr_unique_id = f"{DOMAIN}_tts"
 
+    async def async_added_to_hass(self) -> None:
+        """Start pre-synthesis when the entity is added."""
+        await super().async_added_to_hass()
+        self._async_schedule_presynthesis()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop pre-synthesis when the entity is removed."""
+        if self._unsub_presynthesis:
+            self._unsub_presynthesis()
+            self._unsub_presynthesis = None
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def async_update_options(self, options: dict[str, Any]) -> None:
+        """Apply updated options in place, keeping the client and audio cache."""
+        if options.get(CONF_CUSTOM_STYLES, "") != self._options.get(CONF_CUSTOM_STYLES, ""):
+            self._styles = StyleDirectives(options.get(CONF_CUSTOM_STYLES, ""))
+        self._options = options
+        self._model_chain.configure(*self._model_chain_settings())
+        self._async_schedule_presynthesis()
+
+    def _model_chain_settings(self) -> tuple[list[str], float]:
+        """Return the model fallback order and latency SLO from the options."""
+        return (
+            fallback_models(
+                self._options.get("tts_model", DEFAULT_MODEL_TTS),
+                TTS_MODELS,
+                self._options.get(CONF_MODEL_FALLBACK, DEFAULT_MODEL_FALLBACK),
+            ),
+            float(self._options.get(CONF_TTS_LATENCY_SLO, DEFAULT_TTS_LATENCY_SLO)),
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return model fallback and API key metrics."""
+        return {
+            "model_fallback": self._model_chain.as_dict(),
+            "api_keys": self._keys.as_dict(),
+        }
+
+    @callback
+    def _async_schedule_presynthesis(self) -> None:
+        """Start or stop periodic pre-synthesis according to the options."""
+        if self._unsub_presynthesis:
+            self._unsub_presynthesis()
+            self._unsub_presynthesis = None
+            
+        if self._options.get(CONF_TTS_PRESYNTHESIS_COUNT, DEFAULT_TTS_PRESYNTHESIS_COUNT):
+            self._unsub_presynthesis = async_track_time_interval(
+                self._hass,
+                self._async_presynthesize,
+                timedelta(seconds=TTS_PRESYNTHESIS_INTERVAL),
+            )
+
+    async def _async_get_batch_client(self) -> genai.Client:
+        """Return the client for Batch API jobs."""
+        if not (url := self._options.get(CONF_BATCH_URL)):
+            return await self._keys.async_client()
+        if self._batch_client is None or self._batch_client[0] != url:
+            api_key = self._keys.least_loaded()
+            client = await self._hass.async_add_executor_job(
+                lambda: genai.Client(
+                    api_key=api_key,
+                    http_options=types.HttpOptions(base_url=url),
+                )
+            )
+            self._batch_client = (url, client)
+        return self._batch_client[1]
+
     @property
     def default_language(self) -> str:
         """Return the default language."""
@@ -118,122 +261,310 @@ class GeminiTTSEntity(TextToSpeechEntity):
             )
             message = message[:MAX_TEXT_LENGTH]
 
+        request_key, enhanced_message, voice = self._prepare_request(message, options)
+        
+        with self._tracer.stage("tts", voice=voice, characters=len(message)) as stage:
+            if (reply := self._live.pop_audio(message)) is not None:
+                stage.set(cache="live")
+                pcm = b"".join([chunk async for chunk in reply.async_audio()])
+                if reply.interrupted:
+                    # A new turn barged in; the rest of this reply must not play
+                    raise HomeAssistantError("Gemini Live reply was interrupted")
+                return "wav", self._ensure_wav_format(pcm)
+            
+            self._last_request = time.monotonic()
+            try:
+                # Home Assistant converts to a satellite's preferred format
+                # and caches the result per option set
+                cache_key = self._cache_key(request_key)
+                if (audio_data := self._audio_cache.get(cache_key)) is not None:
+                    self._audio_cache.move_to_end(cache_key)
+                    stage.set(cache="hit")
+                    _LOGGER.debug("Serving cached TTS audio for: %s", message)
+                else:
+                    stage.set(cache="miss")
+                    audio_data, model = await self._generate_speech(
+                        enhanced_message, voice, options
+                    )
+                    self._cache_audio(self._cache_key(request_key, model), audio_data)
+                return "wav", audio_data
+            except Exception as err:
+                _LOGGER.error("Error generating TTS audio: %s", err)
+                raise
+
+    async def async_stream_tts_audio(
+        self, request: TTSAudioRequest
+    ) -> TTSAudioResponse:
+        """Stream TTS audio, passing on Gemini Live audio as it arrives.
+
+        Only called by Home Assistant versions that stream TTS responses.
+        """
+        message = "".join([chunk async for chunk in request.message_gen])
+        if (reply := self._live.pop_audio(message)) is not None:
+            voice = request.options.get(ATTR_VOICE, self.default_options[ATTR_VOICE])
+            return TTSAudioResponse("wav", self._async_live_wav(reply, voice))
+        
+        extension, data = await self.async_get_tts_audio(
+            message, request.language, request.options
+        )
+        
+        async def data_gen() -> AsyncIterator[bytes]:
+            yield data
+        
+        return TTSAudioResponse(extension, data_gen())
+
+    async def _async_live_wav(
+        self, reply: LiveReply, voice: str
+    ) -> AsyncIterator[bytes]:
+        """Yield a Gemini Live reply as WAV while its audio arrives."""
+        with self._tracer.stage("tts", voice=voice, characters=len(reply.text)) as stage:
+            stage.set(cache="live")
+            # A header without a data length; the audio runs to the end
+            yield self._ensure_wav_format(b"")
+            async for chunk in reply.async_audio():
+                yield chunk
+            stage.set(interrupted=reply.interrupted)
+
+    def _prepare_request(
+        self, message: str, options: dict[str, Any]
+    ) -> tuple[str, str, str]:
+        """Resolve request options into a request key, styled message and voice.
+
+        The request key identifies the audio independently of the model that
+        renders it; _cache_key adds the model.
+        """
         voice = options.get(ATTR_VOICE, self.default_options[ATTR_VOICE])
         style = options.get(CONF_STYLE, self.default_options[CONF_STYLE])
         emotion = options.get(CONF_EMOTION, self.default_options[CONF_EMOTION])
         pace = options.get(CONF_PACE, self.default_options[CONF_PACE])
         
-        # Enhance the message with style instructions
-        enhanced_message = self._enhance_message_with_style(message, style, emotion, pace)
+        # Enhance the message with style instructions; the canonical prefix
+        # makes equal-sounding requests share a cache entry
+        prefix = self._styles.prefix(style, emotion, pace)
+        enhanced_message = prefix + message
+        request_key = "|".join(
+            (voice, self._postprocess_tag(), prefix, " ".join(message.split()))
+        )
         
-        try:
-            audio_data = await self._generate_speech(enhanced_message, voice, options)
-            return "wav", audio_data
-        except Exception as err:
-            _LOGGER.error("Error generating TTS audio: %s", err)
-            raise
+        return request_key, enhanced_message, voice
 
-    def _enhance_message_with_style(
-        self, message: str, style: str, emotion: str, pace: str
-    ) -> str:
-        """Enhance message with style, emotion, and pace instructions."""
-        if style == "natural" and emotion == "neutral" and pace == "normal":
-            return message
-            
-        instructions = []
-        
-        # Add style instruction
-        if style != "natural":
-            if style == "whisper":
-                instructions.append("in a whisper")
-            elif style == "dramatic":
-                instructions.append("dramatically")
-            elif style == "professional":
-                instructions.append("in a professional tone")
-            elif style == "friendly":
-                instructions.append("in a friendly manner")
-            elif style == "mysterious":
-                instructions.append("mysteriously")
-            elif style == "confident":
-                instructions.append("confidently")
+    def _cache_key(self, request_key: str, model: str | None = None) -> str:
+        """Return the cache key of a request's audio as rendered by a model.
+
+        Lookups use the configured model and audio is stored under the model
+        that answered, so fallback audio is never served in place of the
+        configured model's once that model is healthy again.
+        """
+        model = model or self._options.get("tts_model", DEFAULT_MODEL_TTS)
+        return f"{model}|{request_key}"
+
+    def synthesis_key(self, message: str, options: dict[str, Any]) -> str:
+        """Return a key of everything that determines a message's audio.
+
+        Options left out of a request resolve to the entity's current
+        defaults, so the key changes when those settings do.
+        """
+        request_key, _, _ = self._prepare_request(message, options)
+        return self._cache_key(request_key)
+
+    async def async_synthesize(self, message: str, options: dict[str, Any]) -> bytes:
+        """Return WAV audio for a message without going through the audio cache.
+
+        Used by bulk exports, which would otherwise evict every cached reply.
+        """
+        _, enhanced_message, voice = self._prepare_request(message, options)
+        self._last_request = time.monotonic()
+        audio_data, _ = await self._generate_speech(enhanced_message, voice, options)
+        return audio_data
+
+    async def async_synthesize_batch(
+        self, requests: list[tuple[str, dict[str, Any]]], *, cache: bool = True
+    ) -> list[bytes | str]:
+        """Synthesize many messages through Gemini Batch API jobs.
+
+        Returns WAV audio or an error message per (message, options) request,
+        in order. With cache, audio that is already cached is reused and new
+        audio is stored under the keys interactive requests look up, so a
+        later announcement of the same message needs no Gemini request.
+        Batch jobs are billed at batch rates outside the interactive quota,
+        but may take hours to finish.
+        """
+        results: list[bytes | str] = [""] * len(requests)
+        pending: dict[str, list[int]] = {}
+        inlined: list[types.InlinedRequest] = []
+        for index, (message, options) in enumerate(requests):
+            request_key, enhanced_message, voice = self._prepare_request(message, options)
+            cache_key = self._cache_key(request_key)
+            if cache and (audio_data := self._audio_cache.get(cache_key)) is not None:
+                results[index] = audio_data
+            elif cache_key in pending:
+                # Equal requests share one synthesis
+                pending[cache_key].append(index)
             else:
-                instructions.append(f"in a {style} way")
-        
-        # Add emotion instruction
-        if emotion != "neutral":
-            if emotion == "happy":
-                instructions.append("cheerfully")
-            elif emotion == "excited":
-                instructions.append("with excitement")
-            elif emotion == "calm":
-                instructions.append("calmly")
-            elif emotion == "serious":
-                instructions.append("seriously")
+                pending[cache_key] = [index]
+                inlined.append(
+                    types.InlinedRequest(
+                        contents=enhanced_message, config=self._speech_config(voice)
+                    )
+                )
+        if not inlined:
+            return results
+
+        responses = await async_run_batch(
+            self._hass,
+            await self._async_get_batch_client(),
+            self._options.get("tts_model", DEFAULT_MODEL_TTS),
+            inlined,
+            f"{DOMAIN} tts",
+        )
+        for (cache_key, indexes), response in zip(pending.items(), responses):
+            result: bytes | str
+            if isinstance(response, str):
+                result = response
             else:
-                instructions.append(f"with {emotion}")
-        
-        # Add pace instruction
-        if pace != "normal":
-            if pace == "very_slow":
-                instructions.append("very slowly")
-            elif pace == "slow":
-                instructions.append("slowly")
-            elif pace == "fast":
-                instructions.append("quickly")
-            elif pace == "very_fast":
-                instructions.append("very quickly")
-        
-        if instructions:
-            instruction_text = ", ".join(instructions)
-            return f"Say {instruction_text}: {message}"
+                try:
+                    result = await self._async_response_audio(response)
+                except HomeAssistantError as err:
+                    result = str(err)
+                else:
+                    if cache:
+                        self._cache_audio(cache_key, result)
+            for index in indexes:
+                results[index] = result
+        return results
+
+    def _postprocess_tag(self) -> str:
+        """Return the post-processing part of the cache key."""
+        if not self._options.get(CONF_TTS_POSTPROCESS, DEFAULT_TTS_POSTPROCESS):
+            return "raw"
+        return f"lufs{self._target_loudness():g}"
+
+    def _target_loudness(self) -> float:
+        """Return the configured loudness target in LUFS."""
+        return float(
+            self._options.get(CONF_TTS_TARGET_LOUDNESS, DEFAULT_TTS_TARGET_LOUDNESS)
+        )
+
+    def _cache_audio(self, cache_key: str, audio_data: bytes) -> None:
+        """Store audio in the cache, evicting the least recently used entry."""
+        self._audio_cache[cache_key] = audio_data
+        self._audio_cache.move_to_end(cache_key)
+        while len(self._audio_cache) > TTS_CACHE_SIZE:
+            self._audio_cache.popitem(last=False)
+
+    async def _async_presynthesize(self, _now: datetime | None = None) -> None:
+        """Pre-render the most likely replies into the audio cache while idle."""
+        if self._presynthesizing:
+            return
+            
+        count = min(
+            int(self._options.get(CONF_TTS_PRESYNTHESIS_COUNT, DEFAULT_TTS_PRESYNTHESIS_COUNT)),
+            TTS_CACHE_SIZE,
+        )
         
-        return message
+        self._presynthesizing = True
+        try:
+            for message in self._utterances.top(count):
+                # Yield to real traffic as soon as it shows up
+                if time.monotonic() - self._last_request < TTS_PRESYNTHESIS_IDLE_TIME:
+                    return
+                    
+                request_key, enhanced_message, voice = self._prepare_request(message, {})
+                cache_key = self._cache_key(request_key)
+                if cache_key in self._audio_cache:
+                    continue
+                    
+                audio_data, model = await self._generate_speech(enhanced_message, voice, {})
+                if self._cache_key(request_key, model) != cache_key:
+                    # The configured model is failing; fallback audio would
+                    # never be looked up
+                    return
+                self._cache_audio(cache_key, audio_data)
+                _LOGGER.debug("Pre-synthesized likely reply: %s", message)
+        except Exception as err:
+            _LOGGER.debug("Pre-synthesis of likely replies stopped: %s", err)
+        finally:
+            self._presynthesizing = False
 
     async def _generate_speech(
         self, message: str, voice: str, options: dict[str, Any]
-    ) -> bytes:
-        """Generate speech using Gemini TTS API."""
-        # Validate voice
-        if voice not in VOICES:
-            _LOGGER.warning("Invalid voice '%s', using default '%s'", voice, DEFAULT_VOICE)
-            voice = DEFAULT_VOICE
-            
+    ) -> tuple[bytes, str]:
+        """Generate speech using Gemini TTS API.
+
+        Returns WAV audio and the TTS model that produced it.
+        """
         try:
-            # Get model from options or use default
-            model = self._options.get("tts_model", DEFAULT_MODEL_TTS)
+            config = self._speech_config(voice)
             
-            # Generate speech using the real Gemini TTS API
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self._client.models.generate_content(
-                    model=model,
-                    contents=message,
-                    config=types.GenerateContentConfig(
-                        response_modalities=["AUDIO"],
-                        speech_config=types.SpeechConfig(
-                            voice_config=types.VoiceConfig(
-                                prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                                    voice_name=voice,
-                                )
-                            )
-                        ),
-                    )
-                ),
+            # Generate speech using the real Gemini TTS API, falling back to
+            # another TTS model if the configured one is slow or failing and
+            # to another API key if one is rate limited
+            response, model = await self._model_chain.async_call(
+                lambda attempt: self._keys.async_call(
+                    lambda client: self._async_generate(client, attempt, message, config)
+                )
             )
-            
-            # Extract audio data from response
-            if response.candidates and response.candidates[0].content.parts:
-                audio_data = response.candidates[0].content.parts[0].inline_data.data
-                
-                # Convert to WAV format if needed
-                return self._ensure_wav_format(audio_data)
-            else:
-                raise Exception("No audio data received from Gemini TTS API")
+            return await self._async_response_audio(response), model
             
         except Exception as err:
             _LOGGER.error("Error generating speech with Gemini TTS: %s", err)
             raise
 
+    async def _async_generate(
+        self,
+        client: genai.Client,
+        attempt: ModelAttempt,
+        message: str,
+        config: types.GenerateContentConfig,
+    ) -> types.GenerateContentResponse:
+        """Send one TTS request, cancelling it if the model misses its SLO."""
+        with self._tracer.span("tts.generate", model=attempt.model):
+            async with attempt.timed():
+                return await client.aio.models.generate_content(
+                    model=attempt.model, contents=message, config=config
+                )
+
+    @staticmethod
+    def _speech_config(voice: str) -> types.GenerateContentConfig:
+        """Return the generation config that speaks with a voice."""
+        if voice not in VOICES:
+            _LOGGER.warning("Invalid voice '%s', using default '%s'", voice, DEFAULT_VOICE)
+            voice = DEFAULT_VOICE
+        return types.GenerateContentConfig(
+            response_modalities=["AUDIO"],
+            speech_config=types.SpeechConfig(
+                voice_config=types.VoiceConfig(
+                    prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                        voice_name=voice,
+                    )
+                )
+            ),
+        )
+
+    async def _async_response_audio(
+        self, response: types.GenerateContentResponse
+    ) -> bytes:
+        """Return the audio of a Gemini TTS response as WAV."""
+        content = response.candidates[0].content if response.candidates else None
+        if not (content and content.parts and content.parts[0].inline_data):
+            raise HomeAssistantError("No audio data received from Gemini TTS API")
+        audio_data = content.parts[0].inline_data.data
+        
+        # Trim, normalize and limit off the event loop; the result
+        # is what gets cached
+        if self._options.get(CONF_TTS_POSTPROCESS, DEFAULT_TTS_POSTPROCESS):
+            audio_data = await self._tracer.async_executor_job(
+                "tts.postprocess",
+                postprocess_pcm,
+                audio_data,
+                AUDIO_SAMPLE_RATE,
+                self._target_loudness(),
+            )
+        
+        # Convert to WAV format if needed
+        with self._tracer.span("tts.wav", bytes=len(audio_data)):
+            return self._ensure_wav_format(audio_data)
+
     def _ensure_wav_format(self, audio_data: bytes) -> bytes:
         """Ensure audio data is in WAV format."""
         try:
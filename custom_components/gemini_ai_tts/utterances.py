@@ -0,0 +1,43 @@
+"""Registry of likely utterances shared by the conversation and TTS entities."""
+from __future__ import annotations
+
+import heapq
+
+from .const import UTTERANCE_MAX_LENGTH, UTTERANCE_SKETCH_SIZE
+
+
+class LikelyUtterances:
+    """Frequency-ranked sketch of texts the integration speaks.
+
+    Uses the Space-Saving algorithm so memory stays bounded no matter how many
+    distinct texts are observed: when the sketch is full, the least frequent
+    entry is replaced and the newcomer inherits its count.
+    """
+
+    def __init__(self, capacity: int = UTTERANCE_SKETCH_SIZE) -> None:
+        """Initialize the sketch."""
+        self._capacity = capacity
+        self._counts: dict[str, int] = {}
+
+    def record(self, text: str) -> None:
+        """Record one occurrence of a text."""
+        text = text.strip()
+        if not text or len(text) > UTTERANCE_MAX_LENGTH:
+            return
+
+        if text in self._counts:
+            self._counts[text] += 1
+        elif len(self._counts) < self._capacity:
+            self._counts[text] = 1
+        else:
+            evicted = min(self._counts, key=self._counts.__getitem__)
+            self._counts[text] = self._counts.pop(evicted) + 1
+
+    def top(self, count: int, min_count: int = 2) -> list[str]:
+        """Return the most frequent texts seen at least min_count times."""
+        ranked = heapq.nlargest(count, self._counts.items(), key=lambda item: item[1])
+        return [text for text, seen in ranked if seen >= min_count]
+
+    def clear(self) -> None:
+        """Forget all recorded texts."""
+        self._counts.clear()
@@ -0,0 +1 @@
+"""Tests for the Gemini AI TTS/STT integration."""
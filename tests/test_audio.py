@@ -0,0 +1,30 @@
+"""Tests for the audio post-processing."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from custom_components.gemini_ai_tts.audio import integrated_loudness, postprocess_pcm
+
+
+@pytest.mark.parametrize("sample_rate", [16000, 24000, 44100, 48000])
+def test_reference_tone_loudness(sample_rate: int) -> None:
+    """A 997 Hz sine at -20 dBFS measures -23.0 LUFS (ITU-R BS.1770)."""
+    time = np.arange(5 * sample_rate) / sample_rate
+    tone = 0.1 * np.sin(2 * np.pi * 997 * time)
+
+    assert integrated_loudness(tone, sample_rate) == pytest.approx(-23.0, abs=0.05)
+
+
+def test_postprocess_reaches_target_loudness() -> None:
+    """Normalized speech-level audio lands on the target loudness."""
+    sample_rate = 24000
+    time = np.arange(5 * sample_rate) / sample_rate
+    tone = 0.05 * np.sin(2 * np.pi * 997 * time)
+    pcm = (tone * 32768).astype("<i2").tobytes()
+
+    output = np.frombuffer(postprocess_pcm(pcm, sample_rate, -16.0), dtype="<i2")
+
+    assert integrated_loudness(output / 32768.0, sample_rate) == pytest.approx(
+        -16.0, abs=0.05
+    )
@@ -0,0 +1,80 @@
+"""Tests for the model fallback chain."""
+from __future__ import annotations
+
+import asyncio
+
+from google.genai import errors
+import pytest
+
+from custom_components.gemini_ai_tts.fallback import ModelAttempt, ModelFallbackChain
+
+MODELS = ["primary", "fallback"]
+
+
+def _error(code: int) -> errors.APIError:
+    """Return the API error the SDK raises for an HTTP status."""
+    error = errors.ServerError if code >= 500 else errors.ClientError
+    return error(code, {"error": {"code": code, "message": "test"}})
+
+
+def test_key_wait_does_not_count_against_slo() -> None:
+    """Time spent before the model call starts is outside the SLO."""
+    chain = ModelFallbackChain("Test", MODELS, 0.05)
+
+    async def request(attempt: ModelAttempt) -> str:
+        await asyncio.sleep(0.1)  # waiting for a rate limited key
+        async with attempt.timed():
+            return attempt.model
+
+    assert asyncio.run(chain.async_call(request)) == ("primary", "primary")
+    assert chain.as_dict()["fallbacks"] == 0
+
+
+def test_slow_model_falls_back() -> None:
+    """A model call that misses the SLO is cut off and the next model answers."""
+    chain = ModelFallbackChain("Test", MODELS, 0.05)
+
+    async def request(attempt: ModelAttempt) -> str:
+        async with attempt.timed():
+            if attempt.model == "primary":
+                await asyncio.sleep(1)
+            return attempt.model
+
+    assert asyncio.run(chain.async_call(request)) == ("fallback", "fallback")
+    assert chain.as_dict()["models"]["primary"]["failures"] == 1
+
+
+@pytest.mark.parametrize(("code", "trips"), [(500, True), (503, True), (404, False)])
+def test_breaker_counts_only_model_failures(code: int, trips: bool) -> None:
+    """Only server errors and timeouts open a model's breaker."""
+    chain = ModelFallbackChain("Test", MODELS, 1)
+
+    async def request(attempt: ModelAttempt) -> str:
+        async with attempt.timed():
+            if attempt.model == "primary":
+                raise _error(code)
+            return attempt.model
+
+    for _ in range(3):
+        assert asyncio.run(chain.async_call(request)) == ("fallback", "fallback")
+
+    breaker = chain.as_dict()["models"]["primary"]["breaker"]
+    assert breaker == ("open" if trips else "closed")
+
+
+def test_rejected_request_is_not_retried() -> None:
+    """A request the API rejects fails without trying other models."""
+    chain = ModelFallbackChain("Test", MODELS, 1)
+    models: list[str] = []
+
+    async def request(attempt: ModelAttempt) -> str:
+        models.append(attempt.model)
+        async with attempt.timed():
+            raise _error(400)
+
+    for _ in range(3):
+        with pytest.raises(errors.ClientError):
+            asyncio.run(chain.async_call(request))
+
+    assert models == ["primary"] * 3
+    assert chain.as_dict()["models"]["primary"]["breaker"] == "closed"
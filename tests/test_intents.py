@@ -0,0 +1,71 @@
+"""Tests for the local intent fast path."""
+from __future__ import annotations
+
+from homeassistant.components import conversation
+from homeassistant.const import ATTR_FRIENDLY_NAME
+from homeassistant.core import Context, HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+    intent,
+)
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_mock_service,
+)
+
+from custom_components.gemini_ai_tts.intents import async_match_local_intent
+
+
+async def test_area_command_from_satellite_is_handled_locally(
+    hass: HomeAssistant,
+) -> None:
+    """"Turn on the lights" from a satellite targets the satellite's area."""
+    assert await async_setup_component(hass, "homeassistant", {})
+    assert await async_setup_component(hass, "conversation", {})
+    assert await async_setup_component(hass, "intent", {})
+
+    area_registry = ar.async_get(hass)
+    kitchen = area_registry.async_create("Kitchen")
+    bedroom = area_registry.async_create("Bedroom")
+
+    config_entry = MockConfigEntry(domain="test")
+    config_entry.add_to_hass(hass)
+    device_registry = dr.async_get(hass)
+    satellite = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id, identifiers={("test", "satellite")}
+    )
+    device_registry.async_update_device(satellite.id, area_id=kitchen.id)
+
+    entity_registry = er.async_get(hass)
+    for area, name in ((kitchen, "Kitchen light"), (bedroom, "Bedroom light")):
+        entry = entity_registry.async_get_or_create("light", "test", name)
+        entity_registry.async_update_entity(entry.entity_id, area_id=area.id)
+        hass.states.async_set(entry.entity_id, "off", {ATTR_FRIENDLY_NAME: name})
+        if area is kitchen:
+            kitchen_light = entry.entity_id
+    calls = async_mock_service(hass, "light", "turn_on")
+
+    def user_input(device_id: str | None) -> conversation.ConversationInput:
+        return conversation.ConversationInput(
+            text="turn on the lights",
+            context=Context(),
+            conversation_id=None,
+            device_id=device_id,
+            language=hass.config.language,
+        )
+
+    # Without the satellite there is no area to resolve "the lights" in
+    assert await async_match_local_intent(hass, user_input(None), "test") is None
+    assert not calls
+
+    result = await async_match_local_intent(hass, user_input(satellite.id), "test")
+
+    assert result is not None
+    assert result.response.response_type == intent.IntentResponseType.ACTION_DONE
+    assert [
+        entity_id for call in calls for entity_id in cv.ensure_list(call.data["entity_id"])
+    ] == [kitchen_light]
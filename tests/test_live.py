@@ -0,0 +1,204 @@
+"""Tests for Gemini Live sessions against a local websocket stand-in."""
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+from unittest.mock import Mock, patch
+
+import aiohttp
+from aiohttp import web
+
+from custom_components.gemini_ai_tts.const import CONF_LIVE_MODE, CONF_LIVE_URL
+from custom_components.gemini_ai_tts.live import LivePool
+
+
+class LiveStandIn:
+    """A Live endpoint that records client messages and sends scripted ones."""
+
+    def __init__(self) -> None:
+        """Initialize the stand-in."""
+        self.connections: list[web.WebSocketResponse] = []
+        self.received: list[dict[str, Any]] = []
+        self._activity_ended = asyncio.Event()
+
+    async def handle(self, request: web.Request) -> web.WebSocketResponse:
+        """Answer the setup, then record realtime input."""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections.append(ws)
+        async for message in ws:
+            data = message.json()
+            self.received.append(data)
+            if "setup" in data:
+                await ws.send_json({"setupComplete": {}})
+            elif "activityEnd" in data.get("realtimeInput", {}):
+                self._activity_ended.set()
+        return ws
+
+    async def async_wait_activity_end(self) -> None:
+        """Wait until the client ended a turn."""
+        await self._activity_ended.wait()
+        self._activity_ended.clear()
+
+    async def async_send(self, **content: Any) -> None:
+        """Send server content on the latest connection."""
+        await self.connections[-1].send_json({"serverContent": content})
+
+    async def async_answer(self, heard: str, text: str, audio: bytes) -> None:
+        """Send the transcript of a turn and the start of its reply."""
+        await self.async_send(inputTranscription={"text": heard})
+        await self.async_send(
+            modelTurn={
+                "parts": [
+                    {
+                        "inlineData": {
+                            "mimeType": "audio/pcm;rate=24000",
+                            "data": base64.b64encode(audio).decode(),
+                        }
+                    }
+                ]
+            },
+            outputTranscription={"text": text},
+        )
+
+    async def async_audio(self, audio: bytes) -> None:
+        """Send more reply audio."""
+        await self.async_send(
+            modelTurn={
+                "parts": [
+                    {
+                        "inlineData": {
+                            "mimeType": "audio/pcm;rate=24000",
+                            "data": base64.b64encode(audio).decode(),
+                        }
+                    }
+                ]
+            }
+        )
+
+
+async def _microphone(*chunks: bytes) -> AsyncIterator[bytes]:
+    """Yield microphone audio."""
+    for chunk in chunks:
+        yield chunk
+
+
+async def _async_with_stand_in(
+    scenario: Callable[[LivePool, LiveStandIn], Awaitable[None]]
+) -> None:
+    """Run a scenario with a pool connected to a local stand-in."""
+    stand_in = LiveStandIn()
+    app = web.Application()
+    app.router.add_get("/live", stand_in.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    hass = Mock()
+    hass.async_create_background_task = lambda target, name: asyncio.ensure_future(
+        target
+    )
+    keys = Mock()
+    keys.least_loaded.return_value = "test-key"
+    pool = LivePool(
+        hass,
+        keys,
+        {CONF_LIVE_MODE: True, CONF_LIVE_URL: f"ws://127.0.0.1:{port}/live"},
+    )
+    try:
+        async with aiohttp.ClientSession() as session:
+            with patch(
+                "custom_components.gemini_ai_tts.live.async_get_clientsession",
+                return_value=session,
+            ):
+                await scenario(pool, stand_in)
+            await pool.async_close()
+    finally:
+        await runner.cleanup()
+
+
+def test_turn_is_framed_and_handed_over(socket_enabled: None) -> None:
+    """A turn is framed by activity messages and its reply streams to TTS."""
+
+    async def scenario(pool: LivePool, stand_in: LiveStandIn) -> None:
+        turn = asyncio.create_task(pool.async_turn(_microphone(b"\x01\x02", b"\x03"), 16000))
+        await stand_in.async_wait_activity_end()
+        await stand_in.async_answer("What time is it?", "It is noon.", b"ab")
+        reply = await turn
+
+        setup, start, first, second, end = stand_in.received
+        assert setup["setup"]["realtimeInputConfig"] == {
+            "automaticActivityDetection": {"disabled": True}
+        }
+        assert start == {"realtimeInput": {"activityStart": {}}}
+        assert first == {
+            "realtimeInput": {
+                "audio": {"data": "AQI=", "mimeType": "audio/pcm;rate=16000"}
+            }
+        }
+        assert second["realtimeInput"]["audio"]["data"] == "Aw=="
+        assert end == {"realtimeInput": {"activityEnd": {}}}
+
+        # STT hands the reply to the conversation agent by its transcript
+        assert reply.transcript == "What time is it?"
+        assert pool.pop_heard("what time is it?") is reply
+        assert pool.pop_heard("what time is it?") is None
+
+        audio = reply.async_audio()
+        assert await anext(audio) == b"ab"
+        await stand_in.async_audio(b"cd")
+        assert await anext(audio) == b"cd"
+
+        # The text is handed to TTS once generated, before turnComplete
+        await stand_in.async_send(generationComplete=True)
+        assert await pool.async_reply_text(reply) == "It is noon."
+        assert not reply.done.is_set()
+        assert [chunk async for chunk in audio] == []
+        assert pool.pop_audio("It is noon.") is reply
+
+    asyncio.run(_async_with_stand_in(scenario))
+
+
+def test_new_turn_barges_in_on_playing_reply(socket_enabled: None) -> None:
+    """A turn that starts while a reply plays interrupts it on its session."""
+
+    async def scenario(pool: LivePool, stand_in: LiveStandIn) -> None:
+        turn = asyncio.create_task(pool.async_turn(_microphone(b"\x01"), 16000))
+        await stand_in.async_wait_activity_end()
+        await stand_in.async_answer("Tell me a story", "Once upon a time", b"old")
+        old = await turn
+        audio = old.async_audio()
+        assert await anext(audio) == b"old"
+
+        turn = asyncio.create_task(pool.async_turn(_microphone(b"\x02"), 16000))
+        await stand_in.async_wait_activity_end()
+        # The old reply is cut off as soon as the new turn starts
+        assert old.interrupted
+        assert [chunk async for chunk in audio] == []
+
+        # The rest of the old reply is dropped up to the server's interrupted
+        await stand_in.async_audio(b"stale")
+        await stand_in.async_send(interrupted=True)
+        await stand_in.async_answer("Stop", "Okay.", b"new")
+        await stand_in.async_send(generationComplete=True)
+        await stand_in.async_send(turnComplete=True)
+        new = await turn
+
+        assert len(stand_in.connections) == 1
+        assert [
+            next(iter(message["realtimeInput"]))
+            for message in stand_in.received
+            if "realtimeInput" in message
+        ] == ["activityStart", "audio", "activityEnd"] * 2
+        assert new.transcript == "Stop"
+        assert bytes(new.audio) == b"new"
+        assert not new.interrupted
+        assert await pool.async_reply_text(old) == ""
+        assert pool.pop_audio("Once upon a time") is None
+        assert await pool.async_reply_text(new) == "Okay."
+
+    asyncio.run(_async_with_stand_in(scenario))
@@ -0,0 +1,29 @@
+"""Tests for the Cloud Speech model router."""
+from __future__ import annotations
+
+from custom_components.gemini_ai_tts.stt_router import SttModelRouter
+
+
+def test_long_audio_does_not_skew_short_ranking() -> None:
+    """Slow dictation on the long model leaves its short-command ranking alone."""
+    router = SttModelRouter("short", "long", 5.0)
+    router.record("short", 0.8, 2.0)
+    router.record("long", 0.5, 2.0)
+    for _ in range(10):
+        router.record("long", 6.0, 60.0)
+
+    assert router.select(2.0) == "long"
+    assert router.as_dict()["long"]["short"]["average_latency"] == 0.5
+    assert router.as_dict()["long"]["long"]["requests"] == 10
+
+
+def test_streaming_latency_is_not_used_for_routing() -> None:
+    """Finalize-only streaming latency is kept apart from request latency."""
+    router = SttModelRouter("short", "long", 5.0)
+    router.record("short", 0.8, 2.0)
+    router.record("long", 0.5, 2.0)
+    for _ in range(10):
+        router.record("short", 0.1, 2.0, streaming=True)
+
+    assert router.select(2.0) == "long"
+    assert router.as_dict()["short"]["streaming"]["requests"] == 10
@@ -0,0 +1,103 @@
+"""Tests for the latency tracer's OTLP export."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import Mock, patch
+
+import aiohttp
+from aiohttp import web
+
+from custom_components.gemini_ai_tts.const import (
+    CONF_OTLP_ENDPOINT,
+    CONF_TRACING,
+    DOMAIN,
+)
+from custom_components.gemini_ai_tts.tracing import Tracer
+
+
+async def _async_export_stage() -> tuple[list[dict[str, Any]], dict[str, Any], int]:
+    """Export one traced stage to a local collector.
+
+    Returns the posted payloads, the tracer counters and the number of
+    connections the export left checked out of the client session.
+    """
+    received: list[dict[str, Any]] = []
+
+    async def handle(request: web.Request) -> web.StreamResponse:
+        received.append(await request.json())
+        # Send the body slowly, so it is still unread when the export returns
+        response = web.StreamResponse()
+        response.content_type = "application/json"
+        await response.prepare(request)
+        await response.write(b"{")
+        await asyncio.sleep(0.1)
+        await response.write(b"}")
+        return response
+
+    app = web.Application()
+    app.router.add_post("/v1/traces", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    tasks: list[asyncio.Task] = []
+    hass = Mock()
+    hass.async_create_background_task = lambda target, name: tasks.append(
+        asyncio.ensure_future(target)
+    )
+    tracer = Tracer(
+        hass, {CONF_TRACING: True, CONF_OTLP_ENDPOINT: f"http://127.0.0.1:{port}"}
+    )
+    try:
+        async with aiohttp.ClientSession() as session:
+            with patch(
+                "custom_components.gemini_ai_tts.tracing.async_get_clientsession",
+                return_value=session,
+            ):
+                with tracer.stage("tts", voice="Kore", characters=12):
+                    with tracer.span(
+                        "tts.generate", model="gemini-2.5-flash-preview-tts"
+                    ):
+                        pass
+                await asyncio.gather(*tasks)
+            acquired = len(session.connector._acquired)  # pylint: disable=protected-access
+    finally:
+        await runner.cleanup()
+    return received, tracer.as_dict(), acquired
+
+
+def test_stage_is_exported_as_otlp_json(socket_enabled: None) -> None:
+    """A finished stage is posted to the collector as OTLP/HTTP JSON."""
+    received, stats, acquired = asyncio.run(_async_export_stage())
+
+    assert len(received) == 1
+    resource_spans = received[0]["resourceSpans"]
+    assert resource_spans[0]["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": DOMAIN}}
+    ]
+    scope_spans = resource_spans[0]["scopeSpans"]
+    assert scope_spans[0]["scope"] == {"name": DOMAIN}
+
+    stage, generate = scope_spans[0]["spans"]
+    assert stage["name"] == "tts"
+    assert "parentSpanId" not in stage
+    assert len(stage["traceId"]) == 32
+    assert stage["status"] == {"code": 1}
+    assert {"key": "voice", "value": {"stringValue": "Kore"}} in stage["attributes"]
+    assert {"key": "characters", "value": {"intValue": "12"}} in stage["attributes"]
+    assert int(stage["endTimeUnixNano"]) >= int(stage["startTimeUnixNano"])
+
+    assert generate["name"] == "tts.generate"
+    assert generate["traceId"] == stage["traceId"]
+    assert generate["parentSpanId"] == stage["spanId"]
+    assert generate["attributes"] == [
+        {"key": "model", "value": {"stringValue": "gemini-2.5-flash-preview-tts"}}
+    ]
+
+    assert stats["exported_stages"] == 1
+    assert stats["export_errors"] == 0
+    # The response was released, so HA's shared session keeps no connection
+    assert acquired == 0